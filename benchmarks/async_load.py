@@ -0,0 +1,121 @@
+"""
+Throughput of the sync and the DATABASE_ASYNC endpoints under concurrent
+load: requests per second and latency percentiles of the public listing at
+increasing numbers of clients in flight.
+
+SQLite answers in microseconds, so every statement is given a simulated
+network round trip of --latency milliseconds: a blocking sleep for the sync
+engine, an awaited one for the async engine, as the real drivers would wait.
+Sync endpoints then hold a threadpool worker (40 by default) for the whole
+round trip, while async ones free the event loop for other requests.
+
+The response and total caches are disabled, so that every request queries
+the database instead of being answered from memory after its first run.
+
+    python benchmarks/async_load.py [rows] [--latency MS] [--requests N]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from common import make_database
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.util import await_only
+
+from configs.database import async_database_url, get_async_db, get_async_read_db, get_db, get_read_db
+from components.cars import caches
+from components.cars.endpoints.list_public import router as cars_public_router
+from utils.async_routes import async_router
+
+POOL = {"pool_size": 100, "max_overflow": 0}
+
+
+def sync_app(url: str, latency: float) -> FastAPI:
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **POOL)
+    event.listen(engine, "before_cursor_execute", lambda *args: time.sleep(latency))
+    Session = sessionmaker(autoflush=False, bind=engine)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cars_public_router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return app
+
+
+def async_app(url: str, latency: float) -> FastAPI:
+    engine = create_async_engine(async_database_url(url), **POOL)
+    # Runs inside SQLAlchemy's greenlet, so awaiting suspends only this request
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: await_only(asyncio.sleep(latency)))
+    Session = async_sessionmaker(autoflush=False, bind=engine)
+
+    async def override_get_async_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_router(cars_public_router))
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    return app
+
+
+async def load(app: FastAPI, concurrency: int, requests: int) -> dict:
+    latencies = []
+    pending = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for i in pending:
+            started = time.perf_counter()
+            response = await client.get(f"/v1/cars/public?limit=20&offset={i % 10 * 20}")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="?", type=int, default=20_000)
+    parser.add_argument("--latency", type=float, default=20, help="simulated round trip per statement, in ms")
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+    caches.public_lists.maxsize = caches.totals.maxsize = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'cars.db')}"
+        make_database(args.rows, url)
+        apps = {"sync": sync_app(url, args.latency / 1000), "async": async_app(url, args.latency / 1000)}
+
+        print(f"GET /v1/cars/public over {args.rows} cars, {args.latency:g} ms per statement, {args.requests} requests")
+        print(f"{'clients':>8}{'mode':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for concurrency in (10, 50, 200):
+            for mode, app in apps.items():
+                result = asyncio.run(load(app, concurrency, args.requests))
+                print(f"{concurrency:>8}{mode:>8}{result['rps']:>10.0f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Creating cars one request at a time (POST /v1/cars: an INSERT, a commit
+and a refresh per car) vs in batches (POST /v1/cars/bulk: one executemany
+and one commit per chunk), against an SQLite file so every commit is
+written to disk.
+
+    python benchmarks/bulk_insert.py [cars] [--batch N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from common import car_values
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from configs.database import Base, get_db
+from components.cars.endpoints.bulk_create import router as cars_bulk_create_router
+from components.cars.endpoints.create import router as cars_create_router
+from components.cars.models import Car
+from components.users.models import User
+from utils.auth import get_current_user
+
+
+def make_client(path: str) -> tuple[TestClient, sessionmaker]:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(autoflush=False, bind=engine)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cars_create_router)
+    app.include_router(cars_bulk_create_router)
+    app.dependency_overrides[get_db] = override_get_db
+    # Authentication costs the same per request on both paths; leave it out
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="benchmark@example.com")
+    return TestClient(app), Session
+
+
+def payloads(count: int) -> list[dict]:
+    rng = random.Random(42)
+    cars = []
+    for i in range(count):
+        values = car_values(i, rng)
+        values["price"] = None if values["price"] is None else str(values["price"])
+        cars.append(values)
+    return cars
+
+
+def run(name: str, count: int, send) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        client, Session = make_client(os.path.join(directory, "cars.db"))
+        started = time.perf_counter()
+        send(client)
+        elapsed = time.perf_counter() - started
+        with Session() as db:
+            assert db.scalar(select(func.count()).select_from(Car)) == count
+    print(f"{name:<32}{elapsed:>10.2f} s{count / elapsed:>12.0f} cars/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("cars", nargs="?", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1_000, help="cars per bulk request")
+    args = parser.parse_args()
+    cars = payloads(args.cars)
+
+    def single(client: TestClient) -> None:
+        for car in cars:
+            client.post("/v1/cars", json=car).raise_for_status()
+
+    def bulk(client: TestClient) -> None:
+        for start in range(0, len(cars), args.batch):
+            response = client.post("/v1/cars/bulk", json={"items": cars[start:start + args.batch]})
+            response.raise_for_status()
+            assert response.json()["failed"] == 0
+
+    print(f"Creating {args.cars} cars")
+    print(f"{'path':<32}{'wall time':>12}{'throughput':>16}")
+    before = run("POST /v1/cars (before)", args.cars, single)
+    after = run(f"POST /v1/cars/bulk x{args.batch} (after)", args.cars, bulk)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
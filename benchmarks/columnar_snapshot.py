@@ -0,0 +1,77 @@
+"""
+Database vs in-memory columnar snapshot (PUBLIC_LIST_ENGINE=memory) for one
+20-item page of the public listing with its exact total, over a few filter
+and sort combinations, served from a memory-mapped snapshot file.
+
+    python benchmarks/columnar_snapshot.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+from common import make_database, measure, report
+
+from sqlalchemy import func, select
+
+from components.cars.fieldsets import select_columns
+from components.cars.filters import CarFilters
+from components.cars.pagination import get_sort_order, paginate
+from components.cars.schemas import CarPublicResponse, dump_trusted
+from components.cars.snapshot import Columns, _select
+
+PAGE_SIZE = 20
+
+QUERIES = {
+    "unfiltered, by price": (CarFilters(), "price"),
+    "brand + fuel, by year": (CarFilters(brand=("Volvo", "Tesla"), fuel_type=("Electric",)), "registered_year_desc"),
+    "price range, deep page": (CarFilters(min_price=Decimal(20_000), max_price=Decimal(40_000)), "price_desc"),
+}
+
+
+def main(rows: int = 100_000, repeat: int = 50) -> None:
+    Session = make_database(rows)
+    db = Session()
+
+    started = time.perf_counter()
+    columns = Columns.from_rows(db.execute(_select()).all())
+    print(f"snapshot of {rows} cars loaded from the database in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    # What a starting worker does with SNAPSHOT_FILE set
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cars.snapshot")
+        columns.save(path, version=0)
+        started = time.perf_counter()
+        columns, _ = Columns.open(path)
+        columns.order("price")
+        print(f"snapshot file of {os.path.getsize(path) // 1024} KiB mapped and sorted in "
+              f"{(time.perf_counter() - started) * 1000:.1f} ms\n")
+        compare(db, columns, rows, repeat)
+
+
+def compare(db, columns: Columns, rows: int, repeat: int) -> None:
+    for title, (filters, order_by) in QUERIES.items():
+        offset = 2_000 if "deep" in title else 0
+        sort_column = get_sort_order(order_by).column
+        stmt = filters.apply(select(*select_columns(CarPublicResponse, "id", sort_column.key)))
+
+        def database():
+            total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+            page, _ = paginate(db, stmt, order_by, PAGE_SIZE, offset=offset)
+            return [dump_trusted(CarPublicResponse, row) for row in page], total
+
+        def snapshot():
+            page, _, total = columns.query(filters, order_by, PAGE_SIZE, offset=offset)
+            return page, total
+
+        assert database() == snapshot()
+        report(
+            f"{PAGE_SIZE}-item page with total over {rows} cars: {title}",
+            {"database (before)": measure(database, repeat), "columnar snapshot (after)": measure(snapshot, repeat)},
+        )
+        print()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
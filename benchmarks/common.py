@@ -0,0 +1,99 @@
+"""
+Shared setup for the benchmark scripts in this directory.
+
+Each script builds a throwaway SQLite database filled with generated cars,
+so results compare code paths rather than database servers.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+# Keep the application's engine off any real database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from configs.database import Base
+from components.cars.models import Car
+
+BRANDS = ["Tesla", "Volvo", "BMW", "Toyota", "Volkswagen", "Kia", "Audi", "Ford"]
+FUEL_TYPES = ["Petrol", "Diesel", "Electric", "Hybrid", "Plug-in Hybrid"]
+COLORS = ["White", "Black", "Gray", "Silver", "Red", "Blue"]
+WHEEL_DRIVES = ["FWD", "RWD", "AWD", "4WD", None]
+
+
+def car_values(i: int, rng: random.Random) -> dict:
+    """Column values of the i-th generated car."""
+    year = rng.randint(2012, 2025)
+    brand = rng.choice(BRANDS)
+    return {
+        "name": f"{brand} Model {i % 50}",
+        "brand": brand,
+        "model": f"Model {i % 50}",
+        "make": brand,
+        "fuel_type": rng.choice(FUEL_TYPES),
+        "color": rng.choice(COLORS),
+        "year": year,
+        "price": Decimal(rng.randint(5_000, 90_000)) if rng.random() > 0.05 else None,
+        "registered_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "registered_year": year,
+        "mileage": rng.randint(0, 250_000),
+        "wheel_drive": rng.choice(WHEEL_DRIVES),
+        "registration_number": f"BEN-{i:07d}",
+        "variant": f"Long description of variant {i} " * 3,
+        "source": "benchmark",
+        "external_link": f"https://example.com/cars/{i}",
+        "display_image_url": f"https://example.com/cars/{i}.jpg",
+    }
+
+
+def make_database(rows: int, url: str = "sqlite://", seed: int = 42):
+    """Create a database with `rows` generated cars and return a session factory."""
+    if url == "sqlite://":
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    with engine.begin() as connection:
+        for start in range(0, rows, 5_000):
+            batch = [car_values(i, rng) for i in range(start, min(start + 5_000, rows))]
+            connection.execute(insert(Car), batch)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def measure(fn, repeat: int) -> dict:
+    """Run `fn` `repeat` times; report CPU time and allocations per call."""
+    fn()  # warm up caches and compiled statements
+
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    cpu = (time.process_time() - start) / repeat
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    allocations = sum(max(stat.count_diff, 0) for stat in stats)
+
+    return {"cpu_ms": cpu * 1000, "peak_kib": peak / 1024, "allocations": allocations}
+
+
+def report(title: str, results: dict) -> None:
+    print(title)
+    print(f"{'path':<28}{'CPU ms/call':>14}{'peak KiB':>12}{'live allocs':>14}")
+    for name, result in results.items():
+        print(f"{name:<28}{result['cpu_ms']:>14.3f}{result['peak_kib']:>12.1f}{result['allocations']:>14}")
@@ -0,0 +1,44 @@
+"""
+ORM entities vs column-projected rows for one 100-item page of the public
+listing, from query to serialized JSON.
+
+    python benchmarks/public_list_projection.py [rows]
+"""
+import sys
+
+from common import make_database, measure, report
+
+from sqlalchemy import select
+
+from components.cars.fieldsets import select_columns
+from components.cars.models import Car
+from components.cars.pagination import get_sort_order
+from components.cars.schemas import CarPublicResponse, PaginatedPublicResponse
+
+PAGE_SIZE = 100
+
+
+def main(rows: int = 20_000, repeat: int = 200) -> None:
+    Session = make_database(rows)
+    db = Session()
+    order = get_sort_order("price").order_by()
+
+    def orm_entities():
+        db.expunge_all()  # a request starts with an empty identity map
+        cars = db.query(Car).order_by(*order).offset(500).limit(PAGE_SIZE).all()
+        return PaginatedPublicResponse(items=cars, total=rows, limit=PAGE_SIZE, offset=500).model_dump_json()
+
+    def core_rows():
+        result = db.execute(select(*select_columns(CarPublicResponse)).order_by(*order).offset(500).limit(PAGE_SIZE)).all()
+        items = [row._asdict() for row in result]
+        return PaginatedPublicResponse(items=items, total=rows, limit=PAGE_SIZE, offset=500).model_dump_json()
+
+    assert orm_entities() == core_rows()
+    report(
+        f"{PAGE_SIZE}-item public page over {rows} cars",
+        {"ORM entities (before)": measure(orm_entities, repeat), "Core projection (after)": measure(core_rows, repeat)},
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,50 @@
+"""
+Full items vs a sparse fieldset (the mobile list view's fields) for one
+100-item page of the public listing: response bytes, database time (execute
+and fetch) and total CPU per page.
+
+    python benchmarks/sparse_fieldsets.py [rows]
+"""
+import sys
+import time
+
+from common import make_database, measure
+
+from sqlalchemy import select
+
+from components.cars.fieldsets import fieldset_model, parse_fields, select_columns
+from components.cars.models import Car
+from components.cars.schemas import CarPublicResponse, dump_trusted
+from utils.responses import dumps
+
+PAGE_SIZE = 100
+MOBILE_FIELDS = "id,name,price,mileage,display_image_url"
+
+
+def main(rows: int = 20_000, repeat: int = 300) -> None:
+    Session = make_database(rows)
+    db = Session()
+
+    def page(item_model):
+        stmt = select(*select_columns(item_model, "id", "price")).order_by(Car.price, Car.id).offset(500).limit(PAGE_SIZE)
+        started = time.perf_counter()
+        result = db.execute(stmt).all()
+        db_seconds = time.perf_counter() - started
+        body = dumps({"items": [dump_trusted(item_model, row) for row in result]})
+        return body, db_seconds
+
+    variants = {
+        "all fields (before)": CarPublicResponse,
+        "fields=" + MOBILE_FIELDS: fieldset_model(CarPublicResponse, parse_fields(MOBILE_FIELDS, CarPublicResponse)),
+    }
+    print(f"{PAGE_SIZE}-item public page over {rows} cars")
+    print(f"{'path':<54}{'bytes/page':>12}{'DB ms/page':>12}{'CPU ms/page':>13}")
+    for name, item_model in variants.items():
+        body, _ = page(item_model)
+        db_ms = sum(page(item_model)[1] for _ in range(repeat)) / repeat * 1000
+        cpu_ms = measure(lambda: page(item_model), repeat)["cpu_ms"]
+        print(f"{name:<54}{len(body):>12}{db_ms:>12.3f}{cpu_ms:>13.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,74 @@
+"""add public listing indexes to cars
+
+Revision ID: 20261017090000
+Revises: 20250106080004
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017090000'
+down_revision: Union[str, Sequence[str], None] = '20250106080004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, PostgreSQL key columns, PostgreSQL INCLUDE columns)
+#
+# The sort indexes match GET /v1/cars/public's ORDER BY <key> NULLS LAST, id
+# exactly, so a page (offset or keyset) is a bounded index scan. DESC needs its
+# own index: scanning an ASC NULLS LAST index backwards yields NULLS FIRST.
+# They also cover count(*) under a max_price bound. The year index serves the
+# year filter combined with a price bound or price ordering, and its INCLUDE
+# column lets a year + registered_year count stay index-only.
+INDEXES = [
+    ('ix_cars_price_id', ['price ASC NULLS LAST', 'id ASC'], []),
+    ('ix_cars_price_desc_id', ['price DESC NULLS LAST', 'id DESC'], []),
+    ('ix_cars_registered_year_id', ['registered_year ASC NULLS LAST', 'id ASC'], []),
+    ('ix_cars_registered_year_desc_id', ['registered_year DESC NULLS LAST', 'id DESC'], []),
+    ('ix_cars_year_price_id', ['year', 'price ASC NULLS LAST', 'id ASC'], ['registered_year']),
+]
+
+
+def _strip_nulls_order(column: str) -> str:
+    return column.replace(' NULLS LAST', '')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY does not lock out writes but cannot run
+        # inside a transaction block.
+        with op.get_context().autocommit_block():
+            for name, columns, include in INDEXES:
+                op.create_index(
+                    name,
+                    'cars',
+                    [sa.text(column) for column in columns],
+                    postgresql_include=include,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+    else:
+        for name, columns, _ in INDEXES:
+            op.create_index(
+                name,
+                'cars',
+                [sa.text(_strip_nulls_order(column)) for column in columns],
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='cars', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='cars', if_exists=True)
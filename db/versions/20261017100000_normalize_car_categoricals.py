@@ -0,0 +1,173 @@
+"""normalize car categoricals
+
+Revision ID: 20261017100000
+Revises: 20261017090000
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017100000'
+down_revision: Union[str, Sequence[str], None] = '20261017090000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Snapshot of the normalizers in components/cars/normalization.py at the time
+# of this revision: canonical value -> other spellings, compared by _key.
+WHEEL_DRIVE_ALIASES = {
+    'FWD': ['front wheel drive', 'front wheel', 'framhjulsdrift'],
+    'RWD': ['rear wheel drive', 'rear wheel', 'bakhjulsdrift'],
+    'AWD': ['all wheel drive', 'allhjulsdrift'],
+    '4WD': ['four wheel drive', '4x4', 'fyrhjulsdrift'],
+}
+
+FUEL_TYPE_ALIASES = {
+    'Petrol': ['gasoline', 'bensin'],
+    'Diesel': [],
+    'Electric': ['elektrisk', 'el', 'ev', 'bev'],
+    'Hybrid': ['elhybrid', 'hev'],
+    'Plug-in Hybrid': ['plugin hybrid', 'laddhybrid', 'phev'],
+}
+
+COLOR_ALIASES = {
+    'White': ['vit'],
+    'Black': ['svart'],
+    'Gray': ['grey', 'grå'],
+    'Silver': [],
+    'Red': ['röd'],
+    'Blue': ['blå'],
+    'Green': ['grön'],
+    'Yellow': ['gul'],
+    'Brown': ['brun'],
+    'Orange': [],
+    'Beige': [],
+    'Purple': ['lila'],
+}
+
+BRANDS = [
+    'Acura', 'Audi', 'BMW', 'BYD', 'Chevrolet', 'Cupra', 'Dodge', 'Ford', 'Genesis', 'Honda',
+    'Hyundai', 'Jeep', 'Kia', 'Lexus', 'Mazda', 'Mercedes-Benz', 'MG', 'Nissan', 'Polestar',
+    'Subaru', 'Tesla', 'Toyota', 'Volkswagen', 'Volvo',
+]
+BRAND_ALIASES = {brand: [] for brand in BRANDS}
+BRAND_ALIASES['Mercedes-Benz'] = ['mercedes', 'mercedes benz']
+BRAND_ALIASES['Volkswagen'] = ['vw']
+
+
+def _key(value):
+    return ' '.join(value.replace('-', ' ').split()).casefold()
+
+
+def _lookup(aliases):
+    return {_key(name): canonical for canonical, names in aliases.items() for name in [canonical, *names]}
+
+
+def _capitalize_words(value):
+    return ' '.join(word[:1].upper() + word[1:] for word in value.split())
+
+
+# column -> (spelling key -> canonical value, fallback for unknown values)
+NORMALIZERS = {
+    'wheel_drive': (_lookup(WHEEL_DRIVE_ALIASES), str.upper),
+    'fuel_type': (_lookup(FUEL_TYPE_ALIASES), _capitalize_words),
+    'color': (_lookup(COLOR_ALIASES), _capitalize_words),
+    'brand': (_lookup(BRAND_ALIASES), _capitalize_words),
+}
+
+
+def _normalize(name, value):
+    if value is None:
+        return None
+    value = ' '.join(value.split())
+    if not value:
+        return value
+    table, fallback = NORMALIZERS[name]
+    return table.get(_key(value)) or fallback(value)
+
+# (name, PostgreSQL key columns)
+INDEXES = [
+    ('ix_cars_wheel_drive_price_id', ['wheel_drive', 'price ASC NULLS LAST', 'id ASC']),
+    ('ix_cars_fuel_type', ['fuel_type']),
+    ('ix_cars_brand', ['brand']),
+]
+
+
+def _backfill() -> None:
+    # Walk the table by primary key, as in 20261017130000, rewriting only the
+    # cars with a value that changes. Run in autocommit mode, each batch's
+    # UPDATE commits on its own, so the backfill holds no long locks.
+    bind = op.get_bind()
+    cars = sa.table('cars', sa.column('id', sa.Integer), *(sa.column(name, sa.String) for name in NORMALIZERS))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(cars.c.id, *(cars.c[name] for name in NORMALIZERS))
+            .where(cars.c.id > last_id)
+            .order_by(cars.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        # One executemany per set of changed columns
+        changes = {}
+        for row in rows:
+            values = {name: _normalize(name, row._mapping[name]) for name in NORMALIZERS}
+            values = {name: value for name, value in values.items() if value != row._mapping[name]}
+            if values:
+                changes.setdefault(tuple(sorted(values)), []).append({'car_id': row.id, **values})
+        for names, parameters in changes.items():
+            bind.execute(
+                cars.update()
+                .where(cars.c.id == sa.bindparam('car_id'))
+                .values({name: sa.bindparam(name) for name in names}),
+                parameters,
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if context.is_offline_mode():
+        # Normalizing free-form strings needs Python; run this revision online to backfill
+        op.execute("-- brand, fuel_type, color and wheel_drive are normalized when migrating online")
+    else:
+        with op.get_context().autocommit_block():
+            _backfill()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(
+                    name,
+                    'cars',
+                    [sa.text(column) for column in columns],
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+    else:
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                'cars',
+                [sa.text(column.replace(' NULLS LAST', '')) for column in columns],
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Normalized values are kept: the original spellings are not recoverable.
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='cars', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='cars', if_exists=True)
@@ -0,0 +1,75 @@
+"""add full-text search over car name and variant
+
+Revision ID: 20261017120000
+Revises: 20261017110000
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017120000'
+down_revision: Union[str, Sequence[str], None] = '20261017110000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SEARCH_DDL in components/cars/models.py
+SEARCH_VECTOR = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(variant, ''))"
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cars_fts USING fts5("
+    "name, variant, content='cars', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER cars_fts_insert AFTER INSERT ON cars BEGIN "
+    "INSERT INTO cars_fts (rowid, name, variant) VALUES (new.id, new.name, new.variant); END",
+    "CREATE TRIGGER cars_fts_delete AFTER DELETE ON cars BEGIN "
+    "INSERT INTO cars_fts (cars_fts, rowid, name, variant) VALUES ('delete', old.id, old.name, old.variant); END",
+    "CREATE TRIGGER cars_fts_update AFTER UPDATE OF name, variant ON cars BEGIN "
+    "INSERT INTO cars_fts (cars_fts, rowid, name, variant) VALUES ('delete', old.id, old.name, old.variant); "
+    "INSERT INTO cars_fts (rowid, name, variant) VALUES (new.id, new.name, new.variant); END",
+    # Index the existing cars
+    "INSERT INTO cars_fts (cars_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # Adding a stored generated column rewrites the table once
+        op.add_column('cars', sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+        ))
+        # pg_trgm backs the optional fuzzy name matching (SEARCH_TRIGRAM)
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_cars_search_vector', 'cars', ['search_vector'],
+                postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.create_index(
+                'ix_cars_name_trgm', 'cars', ['name'],
+                postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+    else:
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_cars_name_trgm', table_name='cars', postgresql_concurrently=True, if_exists=True)
+            op.drop_index('ix_cars_search_vector', table_name='cars', postgresql_concurrently=True, if_exists=True)
+        op.drop_column('cars', 'search_vector')
+    else:
+        for trigger in ('cars_fts_update', 'cars_fts_delete', 'cars_fts_insert'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS cars_fts')
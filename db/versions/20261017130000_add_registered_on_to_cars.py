@@ -0,0 +1,107 @@
+"""add registered_on date column to cars
+
+Revision ID: 20261017130000
+Revises: 20261017120000
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+import re
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017130000'
+down_revision: Union[str, Sequence[str], None] = '20261017120000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Snapshot of parse_registered_date in components/cars/normalization.py at
+# the time of this revision.
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%Y.%m.%d', '%Y%m%d', '%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m', '%m/%Y']
+
+INDEXES = [
+    ('ix_cars_mileage', ['mileage']),
+    ('ix_cars_registered_on', ['registered_on']),
+]
+
+
+def _parse(value):
+    if not value:
+        return None
+    text = re.split(r'[T\s]', value.strip(), maxsplit=1)[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _backfill() -> None:
+    # Walk the table by primary key. Run in autocommit mode, each batch's
+    # UPDATE commits on its own, so the backfill holds no long locks.
+    bind = op.get_bind()
+    cars = sa.table(
+        'cars',
+        sa.column('id', sa.Integer),
+        sa.column('registered_date', sa.String),
+        sa.column('registered_on', sa.Date),
+    )
+    update = (
+        cars.update()
+        .where(cars.c.id == sa.bindparam('car_id'))
+        .values(registered_on=sa.bindparam('parsed'))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(cars.c.id, cars.c.registered_date)
+            .where(cars.c.id > last_id, cars.c.registered_date.is_not(None))
+            .order_by(cars.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        parsed = [{'car_id': row.id, 'parsed': _parse(row.registered_date)} for row in rows]
+        parsed = [values for values in parsed if values['parsed'] is not None]
+        if parsed:
+            bind.execute(update, parsed)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cars', sa.Column('registered_on', sa.Date(), nullable=True))
+
+    if context.is_offline_mode():
+        # Parsing free-form strings needs Python; run this revision online to backfill
+        op.execute("-- registered_on is backfilled from registered_date when migrating online")
+    else:
+        with op.get_context().autocommit_block():
+            _backfill()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, 'cars', columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, 'cars', columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='cars', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='cars', if_exists=True)
+    op.drop_column('cars', 'registered_on')
@@ -0,0 +1,43 @@
+"""add inventory_version column to cars
+
+Revision ID: 20261017140000
+Revises: 20261017130000
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017140000'
+down_revision: Union[str, Sequence[str], None] = '20261017130000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing cars keep NULL: they predate every snapshot, which reads them in full.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cars', sa.Column('inventory_version', sa.BigInteger(), nullable=True))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_cars_inventory_version', 'cars', ['inventory_version'],
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index('ix_cars_inventory_version', 'cars', ['inventory_version'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_cars_inventory_version', table_name='cars',
+                          postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index('ix_cars_inventory_version', table_name='cars', if_exists=True)
+    op.drop_column('cars', 'inventory_version')
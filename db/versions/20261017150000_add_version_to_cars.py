@@ -0,0 +1,31 @@
+"""add version column to cars
+
+Revision ID: 20261017150000
+Revises: 20261017140000
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017150000'
+down_revision: Union[str, Sequence[str], None] = '20261017140000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing cars start at version 1. A constant default is stored in the
+# catalog on PostgreSQL 11+, so the table is not rewritten.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cars', sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('1')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cars', 'version')
@@ -12,7 +12,9 @@ sys.path.append(str(Path(__file__).parent / "src"))
 from sqlalchemy.orm import Session
 from configs.database import SessionLocal, engine, Base
 from components.users.models import User
+from components.cars import inventory  # noqa: F401 - its commit hooks bump cars_version and stamp the seeded cars
 from components.cars.models import Car
+from components.cars.normalization import normalize_car_fields
 from utils.auth import get_password_hash
 
 
@@ -385,7 +387,7 @@ def seed_cars(db: Session):
         existing = db.query(Car).filter(Car.registration_number == car_info["registration_number"]).first()
         if not existing:
             car_info["source"] = "seed"  # Set source for seed data
-            car = Car(**car_info)
+            car = Car(**normalize_car_fields(car_info))
             db.add(car)
             created_count += 1
 
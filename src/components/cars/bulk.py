@@ -0,0 +1,258 @@
+"""
+Car writes through Core statements: inserts for POST /v1/cars/bulk, updates
+for PUT /v1/cars/{car_id}, and upserts by registration number for
+PUT /v1/cars/by-registration/{registration_number} and
+PUT /v1/cars/by-registration.
+
+Cars are inserted in chunks of CAR_BULK_CHUNK_SIZE, each chunk with one
+executemany `INSERT ... RETURNING id` (batched by SQLAlchemy into multi-row
+statements) and committed on its own. A failing car does not abort the
+batch:
+
+- a registration_number already in the database, or earlier in the batch,
+  is reported for that car, which is skipped;
+- if a chunk's insert still fails, e.g. on a registration_number inserted
+  concurrently, the chunk is retried car by car, each in a savepoint, and
+  only the failing cars are reported.
+
+Updates are a single `UPDATE ... RETURNING`, and upserts a single
+`INSERT ... ON CONFLICT (registration_number) DO UPDATE ... RETURNING id` per
+car, or per chunk of CAR_BULK_CHUNK_SIZE cars. Upserts are atomic, so
+concurrent writers of one car cannot both insert it. PostgreSQL and SQLite
+share the syntax. Within a chunk, the last car with a given registration
+number wins.
+
+Both only write cars whose values change (`IS DISTINCT FROM`, so NULLs
+compare as values). Re-saving a car as it is costs no row version, WAL or
+inventory version, and leaves the caches alone; it is then read back to be
+returned. Writes bump the car's `version`, as the ORM does for its own; an
+update can be made conditional on it, for optimistic concurrency control.
+
+Core writes bypass the unit of work, so the written ids are passed to
+`inventory.mark_changed` before each commit.
+"""
+from typing import Optional
+
+from sqlalchemy import ColumnElement, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from configs.settings import settings
+from components.cars import inventory
+from components.cars.fieldsets import select_columns
+from components.cars.models import Car
+from components.cars.normalization import parse_registered_date
+from components.cars.schemas import CarCreate, CarResponse, CarUpdate
+
+
+def car_values(car: CarCreate) -> dict:
+    """The column values of a new car, as the ORM would write them."""
+    values = car.model_dump()
+    values["registered_on"] = parse_registered_date(car.registered_date)
+    return values
+
+
+def _differs(values: dict) -> ColumnElement[bool]:
+    """Whether a car's columns differ from `values`, by column name."""
+    return or_(*(getattr(Car, name).is_distinct_from(value) for name, value in values.items()))
+
+
+def _result(index: int, car_id: Optional[int] = None, error: Optional[str] = None) -> dict:
+    return {"index": index, "id": car_id, "error": error}
+
+
+def _taken_registration_numbers(db: Session, rows: list[dict]) -> set[str]:
+    numbers = {row["registration_number"] for row in rows if row["registration_number"] is not None}
+    if not numbers:
+        return set()
+    return set(db.scalars(select(Car.registration_number).where(Car.registration_number.in_(numbers))))
+
+
+def _insert_each(db: Session, rows: dict[int, dict]) -> dict[int, dict]:
+    results = {}
+    for index, row in rows.items():
+        try:
+            with db.begin_nested():
+                car_id = db.scalar(insert(Car).returning(Car.id), row)
+        except IntegrityError:
+            results[index] = _result(index, error="Conflicts with an existing car")
+        else:
+            results[index] = _result(index, car_id)
+    return results
+
+
+def _create_chunk(db: Session, rows: dict[int, dict]) -> list[dict]:
+    results = {}
+    taken = _taken_registration_numbers(db, list(rows.values()))
+    pending = {}
+    for index, row in rows.items():
+        number = row["registration_number"]
+        if number is not None and number in taken:
+            results[index] = _result(index, error=f"registration_number {number!r} already exists")
+            continue
+        if number is not None:
+            taken.add(number)
+        pending[index] = row
+
+    if pending:
+        try:
+            car_ids = db.scalars(
+                insert(Car).returning(Car.id, sort_by_parameter_order=True), list(pending.values())
+            ).all()
+            results.update((index, _result(index, car_id)) for index, car_id in zip(pending, car_ids))
+        except IntegrityError:
+            db.rollback()
+            results.update(_insert_each(db, pending))
+
+        car_ids = [result["id"] for result in results.values() if result["id"] is not None]
+        if car_ids:
+            inventory.mark_changed(db, car_ids)
+        db.commit()
+    return [results[index] for index in rows]
+
+
+def create_cars(db: Session, cars: list[CarCreate]) -> list[dict]:
+    """
+    Insert `cars`; return for each, in order, its index in `cars` and either
+    the new car's id or why it was not created.
+    """
+    rows = {index: car_values(car) for index, car in enumerate(cars)}
+    indexes = list(rows)
+    results = []
+    for start in range(0, len(indexes), settings.CAR_BULK_CHUNK_SIZE):
+        chunk = indexes[start:start + settings.CAR_BULK_CHUNK_SIZE]
+        results += _create_chunk(db, {index: rows[index] for index in chunk})
+    return results
+
+
+class VersionMismatch(Exception):
+    """The car is at none of the versions its writer expected."""
+
+
+def update_car(db: Session, car_id: int, car: CarUpdate, versions: Optional[set[int]] = None) -> Optional[dict]:
+    """
+    Apply the fields set in `car` to car `car_id`; return its `CarResponse`
+    fields, or None if there is no such car.
+
+    With `versions`, the car is only updated if its version is one of them,
+    in the same statement; `VersionMismatch` is raised otherwise.
+    """
+    values = car.model_dump(exclude_unset=True)
+    if "registered_date" in values:
+        values["registered_on"] = parse_registered_date(values["registered_date"])
+    columns = select_columns(CarResponse)
+    conditions = [Car.id == car_id]
+    if versions is not None:
+        conditions.append(Car.version.in_(versions))
+
+    if values:
+        saved = db.execute(
+            update(Car)
+            .where(*conditions, _differs(values))
+            .values({**values, "version": Car.version + 1})
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if saved is not None:
+            inventory.mark_changed(db, [car_id])
+            db.commit()
+            return saved._asdict()
+
+    # No such car, a stale version, or nothing to change
+    found = db.execute(select(*columns).where(Car.id == car_id)).one_or_none()
+    if found is None:
+        return None
+    if versions is not None and found.version not in versions:
+        raise VersionMismatch(car_id)
+    return found._asdict()
+
+
+# The dialects with INSERT ... ON CONFLICT, and the columns an upsert overwrites
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_UPSERT_COLUMNS = sorted((set(CarCreate.model_fields) | {"registered_on"}) - {"registration_number"})
+
+
+def _upsert(db: Session):
+    """
+    INSERT a car, or on a taken registration_number, UPDATE that car with every
+    other value unless they are all unchanged. Unchanged cars are not RETURNed.
+    """
+    stmt = _UPSERT_INSERTS[db.get_bind().dialect.name](Car)
+    excluded = {name: stmt.excluded[name] for name in _UPSERT_COLUMNS}
+    return stmt.on_conflict_do_update(
+        index_elements=[Car.registration_number],
+        set_={**excluded, "version": Car.version + 1},
+        where=_differs(excluded),
+    )
+
+
+def upsert_car(db: Session, registration_number: str, car: CarCreate) -> dict:
+    """Create or update the car with `registration_number`; return its `CarResponse` fields."""
+    row = car_values(car)
+    row["registration_number"] = registration_number
+    columns = select_columns(CarResponse)
+    saved = db.execute(_upsert(db).values(row).returning(*columns)).one_or_none()
+    if saved is None:
+        return db.execute(select(*columns).where(Car.registration_number == registration_number)).one()._asdict()
+    inventory.mark_changed(db, [saved.id])
+    db.commit()
+    return saved._asdict()
+
+
+def _upsert_chunk(db: Session, rows: dict[int, dict]) -> list[dict]:
+    # One statement cannot write a car twice: the last of several rows for it wins
+    last = {row["registration_number"]: index for index, row in rows.items()}
+    failed = {}
+    try:
+        saved = db.execute(
+            _upsert(db).returning(Car.id, Car.registration_number), [rows[index] for index in last.values()]
+        ).all()
+        car_ids = {row.registration_number: row.id for row in saved}
+    except IntegrityError:
+        db.rollback()
+        car_ids = {}
+        for number, index in last.items():
+            try:
+                with db.begin_nested():
+                    car_id = db.scalar(_upsert(db).values(rows[index]).returning(Car.id))
+            except IntegrityError:
+                failed[number] = "Conflicts with an existing car"
+            else:
+                if car_id is not None:
+                    car_ids[number] = car_id
+
+    changed = sorted(car_ids.values())
+    unchanged = set(last) - set(car_ids) - set(failed)
+    if unchanged:
+        car_ids.update(db.execute(
+            select(Car.registration_number, Car.id).where(Car.registration_number.in_(unchanged))
+        ).tuples().all())
+
+    if changed:
+        inventory.mark_changed(db, changed)
+    db.commit()
+    return [
+        _result(index, car_ids.get(row["registration_number"]), failed.get(row["registration_number"]))
+        for index, row in rows.items()
+    ]
+
+
+def upsert_cars(db: Session, cars: list[CarCreate]) -> list[dict]:
+    """
+    Create or update `cars` by registration number; return for each, in
+    order, its index in `cars` and either the car's id or why it was not saved.
+    """
+    results = {}
+    rows = {}
+    for index, car in enumerate(cars):
+        if car.registration_number is None:
+            results[index] = _result(index, error="registration_number is required")
+        else:
+            rows[index] = car_values(car)
+
+    indexes = list(rows)
+    for start in range(0, len(indexes), settings.CAR_BULK_CHUNK_SIZE):
+        chunk = indexes[start:start + settings.CAR_BULK_CHUNK_SIZE]
+        results.update((result["index"], result) for result in _upsert_chunk(db, {index: rows[index] for index in chunk}))
+    return [results[index] for index in range(len(cars))]
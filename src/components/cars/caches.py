@@ -0,0 +1,38 @@
+"""
+Process-local caches of car reads.
+
+Entries are keyed on an inventory version (see `components.cars.inventory`),
+so a committed car write makes every older entry unreachable; the LRU bound
+and TTL evict them.
+"""
+from configs.settings import settings
+from utils.cache import LRUCache
+
+# (filter combination, inventory version, engine) -> (total, total_type); the public
+# listing keys them on the shared version, the authenticated one on the process-local one
+totals = LRUCache(maxsize=settings.TOTAL_CACHE_SIZE, ttl=settings.TOTAL_CACHE_TTL_SECONDS)
+
+# (normalized query parameters, shared version) -> serialized JSON body of GET /v1/cars/public
+public_lists = LRUCache(maxsize=settings.PUBLIC_CACHE_SIZE, ttl=settings.PUBLIC_CACHE_TTL_SECONDS)
+
+# (normalized filters, shared version) -> serialized JSON body of GET /v1/cars/public/facets
+facets = LRUCache(maxsize=settings.FACETS_CACHE_SIZE, ttl=settings.PUBLIC_CACHE_TTL_SECONDS)
+
+# car id -> CarResponse fields of the car, evicted when the car is updated or deleted
+cars = LRUCache(maxsize=settings.CAR_CACHE_SIZE, ttl=settings.CAR_CACHE_TTL_SECONDS)
+
+CACHES = {
+    "totals": totals,
+    "public_lists": public_lists,
+    "facets": facets,
+    "cars": cars,
+}
+
+
+def stats() -> dict:
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+
+def clear() -> None:
+    for cache in CACHES.values():
+        cache.clear()
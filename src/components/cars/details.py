@@ -0,0 +1,60 @@
+"""
+Cars looked up by id, through the per-car cache.
+
+Cached values are the `CarResponse` fields of a car as read from the
+database; the public endpoints serve the `CarPublicResponse` subset of them.
+Cache misses are resolved together with a single `id IN (...)` query.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from components.cars import caches, inventory
+from components.cars.fieldsets import select_columns
+from components.cars.models import Car
+from components.cars.schemas import CarPublicResponse, CarResponse, dump_trusted
+
+
+def get_cars_by_id(db: Session, car_ids: Iterable[int]) -> dict[int, dict]:
+    """Return the cars with the given ids, by id. Unknown ids are left out."""
+    found = {}
+    missing = []
+    for car_id in car_ids:
+        values = caches.cars.get(car_id)
+        if values is None:
+            missing.append(car_id)
+        else:
+            found[car_id] = values
+
+    if missing:
+        # A commit in this worker while we read may have evicted what we are
+        # about to store; only cache rows read with no commit in between.
+        version = inventory.current_version()
+        rows = db.execute(select(*select_columns(CarResponse)).where(Car.id.in_(missing))).all()
+        cacheable = inventory.current_version() == version
+        for row in rows:
+            values = dump_trusted(CarResponse, row)
+            found[row.id] = values
+            if cacheable:
+                caches.cars.set(row.id, values)
+    return found
+
+
+def get_current_car(db: Session, car_id: int) -> Optional[dict]:
+    """
+    Return car `car_id`, or None if there is no such car. A cached car is
+    only used if its version is still the database's: other workers' writes
+    do not evict it from this worker's cache.
+    """
+    values = caches.cars.get(car_id)
+    if values is not None:
+        if db.scalar(select(Car.version).where(Car.id == car_id)) == values["version"]:
+            return values
+        caches.cars.pop(car_id)
+    return get_cars_by_id(db, [car_id]).get(car_id)
+
+
+def public_fields(values: dict) -> dict:
+    """The `CarPublicResponse` subset of a car's cached fields."""
+    return {field: values[field] for field in CarPublicResponse.model_fields}
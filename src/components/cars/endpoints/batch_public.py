@@ -0,0 +1,56 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.settings import settings
+from components.cars.details import get_cars_by_id, public_fields
+from components.cars.schemas import CarBatchResponse
+from utils.etag import etag_matches, make_etag
+from utils.responses import dumps
+
+router = APIRouter(prefix="/v1")
+
+
+def _parse_ids(ids: str) -> list[int]:
+    try:
+        car_ids = [int(car_id) for car_id in ids.split(",") if car_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated integers",
+        )
+    if len(car_ids) > settings.CAR_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CAR_BATCH_MAX_IDS} ids can be requested at once",
+        )
+    # Drop duplicates, keeping the requested order
+    return list(dict.fromkeys(car_ids))
+
+
+@router.get("/cars/public/batch", status_code=200, response_model=CarBatchResponse)
+def get_cars_public_batch(
+    ids: str = Query(..., description="Comma-separated car IDs (e.g., ids=1,2,3)"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Get several cars by ID in one request. Public endpoint - no authentication required.
+
+    Items are returned in the requested order; IDs without a car are listed
+    in missing. Cars are served from the per-car cache, and all uncached IDs
+    are resolved with a single query. Responses carry an ETag.
+    """
+    car_ids = _parse_ids(ids)
+    cars = get_cars_by_id(db, car_ids)
+
+    body = dumps({
+        "items": [public_fields(cars[car_id]) for car_id in car_ids if car_id in cars],
+        "missing": [car_id for car_id in car_ids if car_id not in cars],
+    })
+    headers = {"ETag": make_etag("cars/public/batch", body), "Cache-Control": settings.PUBLIC_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.settings import settings
+from components.cars.bulk import create_cars
+from components.cars.schemas import CarBulkCreate, CarBulkCreateResponse
+from components.users.models import User
+from utils.auth import get_current_user
+from utils.responses import FastJSONResponse
+
+router = APIRouter(prefix="/v1")
+
+
+@router.post("/cars/bulk", response_model=CarBulkCreateResponse, status_code=status.HTTP_200_OK)
+def create_cars_bulk(
+    car_data: CarBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create many cars at once. Requires authentication.
+
+    Cars are inserted in chunks, each committed on its own. A car that cannot
+    be created, e.g. because its registration_number already exists, does not
+    stop the others: items lists, in request order, each car's index with
+    either its new id or an error.
+    """
+    if len(car_data.items) > settings.CAR_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CAR_BULK_MAX_ITEMS} cars can be created at once",
+        )
+
+    results = create_cars(db, car_data.items)
+    created = sum(1 for result in results if result["id"] is not None)
+    return FastJSONResponse({"created": created, "failed": len(results) - created, "items": results})
@@ -1,13 +1,20 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from configs.database import get_db
 from components.cars.models import Car
-from components.cars.schemas import CarCreate, CarResponse
+from components.cars.schemas import CarCreate, CarResponse, dump_trusted
+from components.idempotency import keys
+from components.idempotency.keys import IdempotentRoute, PendingKey, idempotency_key
 from components.users.models import User
 from utils.auth import get_current_user
+from utils.etag import version_etag
+from utils.responses import FastJSONResponse
 
-router = APIRouter(prefix="/v1")
+router = APIRouter(prefix="/v1", route_class=IdempotentRoute)
 
 
 @router.post("/cars", response_model=CarResponse, status_code=status.HTTP_201_CREATED)
@@ -15,9 +22,14 @@ def create_car(
     car_data: CarCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    idempotency: Optional[PendingKey] = Depends(idempotency_key),
 ):
     """
     Create a new car. Requires authentication.
+
+    With an Idempotency-Key header, the response is recorded in the same
+    transaction as the car, and retries with the key get it back instead of
+    creating the car again (see components.idempotency.keys).
     """
     car = Car(
         name=car_data.name,
@@ -38,8 +50,20 @@ def create_car(
         external_link=car_data.external_link,
         display_image_url=car_data.display_image_url,
     )
-    db.add(car)
-    db.commit()
-    db.refresh(car)
-    return car
-
+    try:
+        db.add(car)
+        db.flush()
+        db.refresh(car)
+        response = FastJSONResponse(
+            dump_trusted(CarResponse, car),
+            status_code=status.HTTP_201_CREATED,
+            headers={"ETag": version_etag(car.version)},
+        )
+        keys.save(db, idempotency, response)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # A concurrent request with the same key may have created the car first
+        keys.replay_if_saved(db, idempotency)
+        raise
+    return response
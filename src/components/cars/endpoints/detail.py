@@ -0,0 +1,44 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from components.cars.details import get_current_car
+from components.cars.schemas import CarResponse
+from components.users.models import User
+from utils.auth import get_current_user
+from utils.etag import etag_matches, version_etag
+from utils.responses import dumps
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get("/cars/{car_id:int}", status_code=200, response_model=CarResponse)
+def get_car(
+    car_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get a single car by ID, with all its fields. Requires authentication.
+
+    Cars are cached by ID until they are updated. A cached car is checked
+    against the car's version in the database, so writes by other workers
+    are seen at once. Responses carry the car's version as their ETag; a
+    matching If-None-Match is answered with 304 Not Modified, and it can be
+    sent as If-Match to PUT /v1/cars/{car_id}.
+    """
+    values = get_current_car(db, car_id)
+    if values is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Car with id {car_id} not found",
+        )
+
+    body = dumps(values)
+    headers = {"ETag": version_etag(values["version"]), "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.settings import settings
+from components.cars.details import get_cars_by_id, public_fields
+from components.cars.schemas import CarPublicResponse
+from utils.etag import etag_matches, make_etag
+from utils.responses import dumps
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get("/cars/public/{car_id:int}", status_code=200, response_model=CarPublicResponse)
+def get_car_public(
+    car_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a single car by ID. Public endpoint - no authentication required.
+
+    Cars are cached by ID until they are updated. Responses carry an ETag; a
+    matching If-None-Match is answered with 304 Not Modified, and a cached car
+    is then served without touching the database.
+    """
+    values = get_cars_by_id(db, [car_id]).get(car_id)
+    if values is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Car with id {car_id} not found",
+        )
+
+    body = dumps(public_fields(values))
+    headers = {"ETag": make_etag("cars/public", body), "Cache-Control": settings.PUBLIC_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,126 @@
+import csv
+import io
+from typing import AsyncIterator, Iterator, Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Engine, Select, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.settings import settings
+from components.cars.filters import CarFilters, car_filters
+from components.cars.models import Car
+from components.cars.schemas import CarResponse, dump_trusted
+from components.users.models import User
+from utils.async_routes import async_variant
+from utils.auth import get_current_user
+from utils.responses import dumps
+
+router = APIRouter(prefix="/v1")
+
+EXPORT_FIELDS = list(CarResponse.model_fields)
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _stream_rows(engine: Engine, stmt: Select) -> Iterator[list]:
+    """
+    Yield the rows of `stmt` in batches of EXPORT_BATCH_SIZE.
+
+    `yield_per` makes the driver use a server-side cursor where it has one
+    (a named cursor with psycopg2), so only one batch is held in memory
+    whatever the size of the table. The export uses its own connection: the
+    request's session may be closed before the response body is sent.
+    """
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=settings.EXPORT_BATCH_SIZE).execute(stmt)
+        for batch in result.partitions():
+            yield batch
+
+
+async def _stream_rows_async(engine: AsyncEngine, stmt: Select) -> AsyncIterator[list]:
+    """`_stream_rows` on the async engine."""
+    async with engine.connect() as connection:
+        result = await connection.stream(stmt, execution_options={"yield_per": settings.EXPORT_BATCH_SIZE})
+        async for batch in result.partitions():
+            yield batch
+
+
+def _ndjson(batch: list) -> bytes:
+    return b"".join(dumps(dump_trusted(CarResponse, row)) + b"\n" for row in batch)
+
+
+def _csv(batch: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(batch)
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+def _encode(batches: Iterator[list], export_format: str) -> Iterator:
+    if export_format == "csv":
+        yield _csv_header()
+    encode = _ndjson if export_format == "ndjson" else _csv
+    for batch in batches:
+        yield encode(batch)
+
+
+async def _encode_async(batches: AsyncIterator[list], export_format: str) -> AsyncIterator:
+    if export_format == "csv":
+        yield _csv_header()
+    encode = _ndjson if export_format == "ndjson" else _csv
+    async for batch in batches:
+        yield encode(batch)
+
+
+def _export_stmt(filters: CarFilters) -> Select:
+    columns = [getattr(Car, field) for field in EXPORT_FIELDS]
+    return filters.apply(select(*columns)).order_by(Car.id)
+
+
+def _response(content, export_format: str) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="cars.{export_format}"'},
+    )
+
+
+@router.get(
+    "/cars/export",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+)
+def export_cars(
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson",
+        alias="format",
+        description="Output format: 'ndjson' (one JSON car per line) or 'csv' (with a header row)"
+    ),
+    filters: CarFilters = Depends(car_filters),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream every car matching the filters, ordered by id. Requires authentication.
+
+    Takes the same filters as GET /v1/cars/public. Rows are read from a
+    server-side cursor and written as they arrive, so the whole inventory can
+    be pulled in one request without paging, counting, or buffering it all.
+    """
+    batches = _stream_rows(db.get_bind(), _export_stmt(filters))
+    return _response(_encode(batches, export_format), export_format)
+
+
+@async_variant(export_cars)
+async def export_cars_async(export_format: str, filters: CarFilters, db: AsyncSession, current_user: User):
+    # Stream from the async engine: run_sync would hand the sync generator a connection it cannot use off the loop
+    batches = _stream_rows_async(db.bind, _export_stmt(filters))
+    return _response(_encode_async(batches, export_format), export_format)
@@ -0,0 +1,48 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.settings import settings
+from components.cars import caches, inventory
+from components.cars.facets import count_facets
+from components.cars.filters import CarFilters, car_filters
+from components.cars.schemas import CarFacetsResponse
+from utils.etag import etag_matches, make_etag
+from utils.responses import dumps
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get("/cars/public/facets", status_code=200, response_model=CarFacetsResponse)
+def get_cars_public_facets(
+    filters: CarFilters = Depends(car_filters),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Count the cars matching the filters per brand, fuel_type, wheel_drive, year
+    and price bucket. Public endpoint - no authentication required.
+
+    Takes the same filters as GET /v1/cars/public; total is the number of
+    matching cars. Price buckets are labelled by their bounds, e.g.
+    "20000-30000" holds prices from 20000 up to, but excluding, 30000. Cars
+    without a value are counted under null.
+
+    Responses are cached until the next car write and carry an ETag, like
+    GET /v1/cars/public.
+    """
+    cache_key = (filters.key(), inventory.read_version(db))
+    headers = {"ETag": make_etag("cars/public/facets", *cache_key), "Cache-Control": settings.PUBLIC_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = caches.facets.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+
+    # One grouped aggregation over the filtered cars yields every facet
+    body = dumps(count_facets(db, filters))
+    caches.facets.set(cache_key, body)
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
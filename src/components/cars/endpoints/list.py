@@ -1,11 +1,17 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from configs.database import get_db
-from components.cars.models import Car
-from components.cars.schemas import PaginatedResponse
+from configs.database import get_read_db
+from components.cars.fieldsets import fieldset_model, parse_fields, select_columns
+from components.cars.pagination import paginate
+from components.cars.schemas import CarResponse, PaginatedResponse, dump_trusted
+from components.cars.totals import get_total
 from components.users.models import User
 from utils.auth import get_current_user
+from utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/v1")
 
@@ -14,21 +20,41 @@ router = APIRouter(prefix="/v1")
 def get_cars(
     limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page's next_cursor. When set, offset is ignored"
+    ),
+    include_total: bool = Query(True, description="Whether to compute total"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated item fields to return (e.g., fields=id,name,price). Defaults to all fields"
+    ),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Get a paginated list of cars from the database. Requires authentication.
+    Get a paginated list of cars from the database, ordered by id. Requires authentication.
+
+    Pass the returned next_cursor as cursor to fetch the following page at a
+    constant cost; offset is kept for backward compatibility. Pass
+    include_total=false to skip counting. Pass fields to read and return only
+    some item fields.
     """
-    # Query total count
-    total = db.query(Car).count()
+    item_model = fieldset_model(CarResponse, parse_fields(fields, CarResponse))
+    stmt = select(*select_columns(item_model, "id"))
+
+    # Query total count, cached until the next write
+    total, total_type = get_total(db, stmt, ("all",), include_total)
 
     # Query paginated cars
-    cars = db.query(Car).offset(offset).limit(limit).all()
-
-    return PaginatedResponse(
-        items=cars,
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
+    rows, next_cursor = paginate(db, stmt, None, limit, offset=offset, cursor=cursor)
+
+    # Rows come straight from the database: serialize them without re-validating
+    return FastJSONResponse({
+        "items": [dump_trusted(item_model, row) for row in rows],
+        "total": total,
+        "total_type": total_type,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    })
@@ -1,11 +1,19 @@
 from typing import Optional
-from decimal import Decimal
-from fastapi import APIRouter, Depends, Query
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from configs.database import get_db
-from components.cars.models import Car
-from components.cars.schemas import PaginatedPublicResponse
+from configs.database import get_read_db
+from configs.settings import settings
+from components.cars import caches, inventory, snapshot, totals
+from components.cars.fieldsets import fieldset_model, parse_fields, select_columns
+from components.cars.filters import CarFilters, car_filters
+from components.cars.pagination import SORT_ORDERS, get_sort_order, paginate, paginate_counted
+from components.cars.schemas import CarPublicResponse, PaginatedPublicResponse, dump_trusted
+from components.cars.search import RELEVANCE, apply_search, search_terms
+from utils.etag import etag_matches, make_etag
+from utils.responses import dumps
 
 router = APIRouter(prefix="/v1")
 
@@ -14,74 +22,142 @@ router = APIRouter(prefix="/v1")
 def get_cars_public(
     limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    order_by: Optional[str] = Query(
+    cursor: Optional[str] = Query(
         None,
-        description="Order by field: 'price', 'price_desc', 'registered_year', 'registered_year_desc'"
+        description="Opaque cursor from a previous page's next_cursor. When set, offset is ignored"
     ),
-    max_price: Optional[float] = Query(
+    order_by: Optional[str] = Query(
         None,
-        ge=0,
-        description="Maximum price filter - returns cars with price less than or equal to this value"
+        description="Order by field: 'price', 'price_desc', 'registered_year', 'registered_year_desc'. "
+                    "Searches default to relevance"
     ),
-    year: Optional[int] = Query(
+    filters: CarFilters = Depends(car_filters),
+    q: Optional[str] = Query(
         None,
-        description="Filter cars by year (e.g., year=2023 returns cars from 2023)"
+        description="Full-text search in car name and variant (e.g., q=tesla long range). Every word must match"
     ),
-    wheel_drive: Optional[str] = Query(
+    include_total: bool = Query(
+        True,
+        description="Whether to compute total. Pass false to skip counting the filtered cars"
+    ),
+    fields: Optional[str] = Query(
         None,
-        description="Filter cars by wheel drive type (e.g., wheel_drive=FWD, wheel_drive=AWD, wheel_drive=RWD, wheel_drive=4WD)"
+        description="Comma-separated item fields to return (e.g., fields=id,name,price). Defaults to all fields"
     ),
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get a paginated list of cars from the database. Public endpoint - no authentication required.
 
     Filtering:
-    - max_price: Filter cars by maximum price (e.g., max_price=50000 returns cars priced at or below $50,000)
+    - min_price / max_price: Filter cars by price range (e.g., max_price=50000 returns cars priced at or below $50,000)
+    - min_mileage / max_mileage: Filter cars by mileage range
     - year: Filter cars by year (e.g., year=2023 returns cars from 2023)
+    - year_from / year_to: Filter cars by a range of years, bounds included
+    - registered_from / registered_to: Filter cars by registration date range (YYYY-MM-DD), bounds included
+    - brand, fuel_type: Filter cars by one or more values (e.g., brand=Volvo,Tesla or brand=Volvo&brand=Tesla)
     - wheel_drive: Filter cars by wheel drive type (e.g., wheel_drive=FWD, wheel_drive=AWD, wheel_drive=RWD, wheel_drive=4WD)
 
+    Search:
+    - q: Match words in name and variant, each as a prefix (e.g., q=volvo rech finds "Volvo XC40 Recharge").
+      Without an order_by, results are ranked best match first.
+
     Ordering options:
     - price: Order by price ascending (lowest first)
     - price_desc: Order by price descending (highest first)
     - registered_year: Order by registered year ascending (oldest first)
     - registered_year_desc: Order by registered year descending (newest first)
+
+    Pagination:
+    - offset: Skip a number of items (cost grows with the offset)
+    - cursor: Continue after the last item of a previous page using its next_cursor
+      (constant cost per page). A cursor is only valid with the order_by it was issued for.
+    - include_total: Set to false to skip counting; total and total_type are then null.
+      total_type tells whether total is an exact count or a planner estimate.
+
+    Sparse fieldsets:
+    - fields: Return only these item fields, e.g. fields=id,name,price,mileage,display_image_url.
+      Only the requested columns are read from the database. Unknown fields are rejected with 400.
+
+    Caching:
+    - Responses carry a strong ETag derived from the inventory version and the
+      query. A matching If-None-Match is answered with 304 Not Modified.
+    - Responses are cached per normalized query until the next car write; the
+      X-Cache header tells whether a response was a cache HIT or MISS.
+    - With PUBLIC_LIST_ENGINE=memory, queries without q are answered from an
+      in-memory columnar snapshot of the cars once it is current.
     """
-    # Base query
-    query = db.query(Car)
-
-    # Apply price filter
-    if max_price is not None:
-        query = query.filter(Car.price <= Decimal(str(max_price)))
-
-    # Apply year filter
-    if year is not None:
-        query = query.filter(Car.year == year)
-
-    # Apply wheel_drive filter
-    if wheel_drive is not None:
-        query = query.filter(Car.wheel_drive.ilike(f"%{wheel_drive}%"))
-
-    # Apply ordering
-    if order_by == "price":
-        query = query.order_by(Car.price.asc().nulls_last())
-    elif order_by == "price_desc":
-        query = query.order_by(Car.price.desc().nulls_last())
-    elif order_by == "registered_year":
-        query = query.order_by(Car.registered_year.asc().nulls_last())
-    elif order_by == "registered_year_desc":
-        query = query.order_by(Car.registered_year.desc().nulls_last())
-
-    # Query total count
-    total = query.count()
-
-    # Query paginated cars
-    cars = query.offset(offset).limit(limit).all()
-
-    return PaginatedPublicResponse(
-        items=cars,
-        total=total,
-        limit=limit,
-        offset=offset,
+    # Normalize parameters so equivalent queries share a cache entry
+    item_model = fieldset_model(CarPublicResponse, parse_fields(fields, CarPublicResponse))
+    terms = search_terms(q) if q else []
+    if order_by not in SORT_ORDERS:
+        order_by = RELEVANCE if terms else None
+
+    # The shared version lets every worker agree on ETags and cached bodies
+    cache_key = (
+        (limit, offset, cursor, order_by, filters.key(), tuple(terms), include_total, tuple(item_model.model_fields)),
+        inventory.read_version(db),
     )
+    headers = {"ETag": make_etag("cars/public", *cache_key), "Cache-Control": settings.PUBLIC_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = caches.public_lists.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+
+    result = None
+    if settings.PUBLIC_LIST_ENGINE == "memory" and not terms:
+        # Answer from this worker's columnar snapshot, if it is at the version read above
+        result = snapshot.cars.query(db, cache_key[1], filters, order_by, limit, offset=offset, cursor=cursor)
+
+    if result is not None:
+        records, next_cursor, total = result
+        items = [{field: record[field] for field in item_model.model_fields} for record in records]
+        total, total_type = (total, totals.EXACT) if include_total else (None, None)
+    else:
+        # Base query, selecting the requested public columns plus the id and sort
+        # key pagination needs: rows are plain tuples, not ORM objects
+        sort_column = get_sort_order(order_by).column
+        extra = ["id"] + ([sort_column.key] if sort_column is not None else [])
+        stmt = filters.apply(select(*select_columns(item_model, *extra)))
+
+        # Apply full-text search through the name/variant text index, ranking matches
+        sort = None
+        if terms:
+            stmt, relevance = apply_search(stmt, terms, db.get_bind().dialect.name)
+            if order_by == RELEVANCE:
+                sort = relevance
+
+        # Totals are keyed on the version of the body they go into, like the body itself
+        total_key = ("public", filters.key(), tuple(terms))
+        version = cache_key[1]
+        if (
+            include_total and cursor is None and totals.use_window_count(db)
+            and not totals.is_cached(db, total_key, version)
+        ):
+            # Query paginated cars and their total count in a single statement
+            rows, next_cursor, total = paginate_counted(db, stmt, order_by, limit, offset=offset, sort=sort)
+            total, total_type = totals.store_total(db, total_key, total, version)
+        else:
+            # Query total count, cached per filter combination
+            total, total_type = totals.get_total(db, stmt, total_key, include_total, version)
+
+            # Query paginated cars, ordered with an id tie-breaker
+            rows, next_cursor = paginate(db, stmt, order_by, limit, offset=offset, cursor=cursor, sort=sort)
+
+        # Rows come straight from the database: serialize them without re-validating
+        items = [dump_trusted(item_model, row) for row in rows]
+
+    body = dumps({
+        "items": items,
+        "total": total,
+        "total_type": total_type,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    })
+    caches.public_lists.set(cache_key, body)
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
 
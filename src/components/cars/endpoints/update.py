@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
 from configs.database import get_db
-from components.cars.models import Car
+from components.cars import bulk
 from components.cars.schemas import CarResponse, CarUpdate
 from components.users.models import User
 from utils.auth import get_current_user
+from utils.etag import if_match_versions, version_etag
+from utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/v1")
 
@@ -14,26 +18,31 @@ router = APIRouter(prefix="/v1")
 def update_car(
     car_id: int,
     car_data: CarUpdate,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Update a car by ID. Requires authentication.
     Only provided fields will be updated.
+
+    A single UPDATE ... RETURNING statement, which skips the write when the
+    provided fields equal the stored values.
+
+    Car responses carry the car's version as their ETag. With If-Match, the
+    car is only updated if it is still at that version, and 412 Precondition
+    Failed is returned otherwise: fetch the car again and retry.
     """
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
+    try:
+        car = bulk.update_car(db, car_id, car_data, if_match_versions(if_match))
+    except bulk.VersionMismatch:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Car with id {car_id} has been modified since it was read",
+        )
+    if car is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Car with id {car_id} not found",
         )
-
-    # Update only provided fields
-    update_data = car_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(car, field, value)
-
-    db.commit()
-    db.refresh(car)
-    return car
-
+    return FastJSONResponse(car, headers={"ETag": version_etag(car["version"])})
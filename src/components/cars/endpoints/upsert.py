@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.settings import settings
+from components.cars.bulk import upsert_car, upsert_cars
+from components.cars.schemas import CarBulkCreate, CarBulkUpsertResponse, CarCreate, CarResponse
+from components.users.models import User
+from utils.auth import get_current_user
+from utils.etag import version_etag
+from utils.responses import FastJSONResponse
+
+# Include before the update router: /cars/{car_id} would also match these paths
+router = APIRouter(prefix="/v1")
+
+
+@router.put("/cars/by-registration/{registration_number}", response_model=CarResponse, status_code=status.HTTP_200_OK)
+def upsert_car_by_registration(
+    registration_number: str,
+    car_data: CarCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create the car with this registration number, or replace the existing one's
+    fields. Requires authentication.
+
+    A single atomic INSERT ... ON CONFLICT statement, so concurrent writers of
+    the same car cannot create it twice. The registration number in the path
+    takes precedence over one in the body.
+    """
+    car = upsert_car(db, registration_number, car_data)
+    return FastJSONResponse(car, headers={"ETag": version_etag(car["version"])})
+
+
+@router.put("/cars/by-registration", response_model=CarBulkUpsertResponse, status_code=status.HTTP_200_OK)
+def upsert_cars_by_registration(
+    car_data: CarBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create or replace many cars by registration number. Requires authentication.
+
+    Every car must have a registration_number. Cars are saved in chunks, one
+    INSERT ... ON CONFLICT statement and one commit per chunk; when a number
+    appears more than once, the last car wins. items lists, in request order,
+    each car's index with either its id or an error.
+    """
+    if len(car_data.items) > settings.CAR_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CAR_BULK_MAX_ITEMS} cars can be saved at once",
+        )
+
+    results = upsert_cars(db, car_data.items)
+    saved = sum(1 for result in results if result["id"] is not None)
+    return FastJSONResponse({"saved": saved, "failed": len(results) - saved, "items": results})
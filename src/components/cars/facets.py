@@ -0,0 +1,71 @@
+"""
+Counts of cars per facet value (brand, fuel type, wheel drive, year and
+price bucket) for a filter set.
+
+All facets come from one GROUP BY over every facet column at once: each
+result row is one distinct combination with its count, and the per-facet
+counts are summed from those rows. The number of combinations is bounded by
+the catalogue's variety, not its size, and the database reads the filtered
+cars once instead of once per facet.
+"""
+from collections import Counter
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from components.cars.filters import CarFilters
+from components.cars.models import Car
+
+# Lower bounds of the price buckets; each bucket runs up to the next bound
+PRICE_BUCKETS = [0, 10_000, 20_000, 30_000, 50_000, 75_000, 100_000]
+
+
+def _bucket_labels() -> dict[int, str]:
+    bounds = PRICE_BUCKETS + [None]
+    return {low: f"{low}-{high}" if high is not None else f"{low}+" for low, high in zip(bounds, bounds[1:])}
+
+
+# Lower bound -> label, e.g. 10000 -> "10000-20000" and 100000 -> "100000+"
+PRICE_BUCKET_LABELS = _bucket_labels()
+
+# The lower bound of a car's price bucket, NULL without a price
+price_bucket = case(
+    (Car.price.is_(None), None),
+    *[(Car.price < high, low) for low, high in zip(PRICE_BUCKETS, PRICE_BUCKETS[1:])],
+    else_=PRICE_BUCKETS[-1],
+)
+
+FACETS = {
+    "brand": Car.brand,
+    "fuel_type": Car.fuel_type,
+    "wheel_drive": Car.wheel_drive,
+    "year": Car.year,
+    "price": price_bucket,
+}
+
+
+def _sorted_counts(facet: str, counter: Counter) -> list[dict]:
+    if facet == "price":
+        # Buckets in price order, cars without a price last
+        buckets = sorted(counter.items(), key=lambda item: (item[0] is None, item[0] or 0))
+        return [{"value": PRICE_BUCKET_LABELS.get(low), "count": count} for low, count in buckets]
+    # Most common first; ties by value, with unknown (None) values last
+    values = sorted(counter.items(), key=lambda item: (-item[1], item[0] is None, str(item[0])))
+    return [{"value": value, "count": count} for value, count in values]
+
+
+def count_facets(db: Session, filters: CarFilters) -> dict:
+    """Count the cars matching the public filters per value of every facet."""
+    columns = [column.label(facet) for facet, column in FACETS.items()]
+    stmt = filters.apply(select(*columns, func.count().label("count"))).group_by(*columns)
+
+    counters = {facet: Counter() for facet in FACETS}
+    total = 0
+    for row in db.execute(stmt):
+        total += row.count
+        for facet, counter in counters.items():
+            counter[getattr(row, facet)] += row.count
+
+    return {
+        "total": total,
+        "facets": {facet: _sorted_counts(facet, counter) for facet, counter in counters.items()},
+    }
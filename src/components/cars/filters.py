@@ -0,0 +1,159 @@
+"""
+Filters of the public car listing, shared by every endpoint that accepts them.
+
+`car_filters` is a FastAPI dependency that reads the filter query parameters
+into a normalized, hashable `CarFilters`. `CarFilters.apply` is the one place
+that turns them into SQL: each filter becomes a sargable predicate on a bare
+indexed column (`price >= :min`, `brand IN (...)`, never an expression over
+the column), added in a fixed order whatever order the parameters came in.
+Equivalent requests therefore compile to the same statement, so they share
+SQLAlchemy's compiled cache, the database's plan cache, and our result caches.
+"""
+from dataclasses import astuple, dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select
+
+from components.cars.models import Car
+from components.cars.normalization import normalize_brand, normalize_fuel_type, normalize_wheel_drive
+
+
+@dataclass(frozen=True)
+class CarFilters:
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    min_mileage: Optional[int] = None
+    max_mileage: Optional[int] = None
+    year: Optional[int] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    registered_from: Optional[date] = None
+    registered_to: Optional[date] = None
+    brand: tuple[str, ...] = ()
+    fuel_type: tuple[str, ...] = ()
+    wheel_drive: Optional[str] = None
+
+    def key(self) -> tuple:
+        """The filter values as a tuple, for cache keys."""
+        return astuple(self)
+
+    def apply(self, stmt: Select) -> Select:
+        """Narrow `stmt` to the cars matching every filter."""
+        # Equality and IN filters on normalized categorical columns
+        if self.brand:
+            stmt = stmt.where(_one_of(Car.brand, self.brand))
+        if self.fuel_type:
+            stmt = stmt.where(_one_of(Car.fuel_type, self.fuel_type))
+        if self.wheel_drive is not None:
+            stmt = stmt.where(Car.wheel_drive == self.wheel_drive)
+
+        # Ranges, each bound a plain comparison with the indexed column
+        if self.year is not None:
+            stmt = stmt.where(Car.year == self.year)
+        if self.year_from is not None:
+            stmt = stmt.where(Car.year >= self.year_from)
+        if self.year_to is not None:
+            stmt = stmt.where(Car.year <= self.year_to)
+        if self.min_price is not None:
+            stmt = stmt.where(Car.price >= self.min_price)
+        if self.max_price is not None:
+            stmt = stmt.where(Car.price <= self.max_price)
+        if self.min_mileage is not None:
+            stmt = stmt.where(Car.mileage >= self.min_mileage)
+        if self.max_mileage is not None:
+            stmt = stmt.where(Car.mileage <= self.max_mileage)
+        if self.registered_from is not None:
+            stmt = stmt.where(Car.registered_on >= self.registered_from)
+        if self.registered_to is not None:
+            stmt = stmt.where(Car.registered_on <= self.registered_to)
+
+        return stmt
+
+
+def _one_of(column, values: tuple):
+    return column == values[0] if len(values) == 1 else column.in_(values)
+
+
+def _values(values: Optional[list[str]], normalize) -> tuple[str, ...]:
+    # Accept both ?brand=Volvo&brand=Kia and ?brand=Volvo,Kia; sort so the order does not matter
+    if not values:
+        return ()
+    names = (normalize(name) for value in values for name in value.split(","))
+    return tuple(sorted({name for name in names if name}))
+
+
+def _decimal(value: Optional[float]) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+
+def _check_range(name: str, low, high) -> None:
+    if low is not None and high is not None and low > high:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name} range: lower bound is greater than upper bound",
+        )
+
+
+def car_filters(
+    min_price: Optional[float] = Query(
+        None,
+        ge=0,
+        description="Minimum price filter - returns cars with price greater than or equal to this value"
+    ),
+    max_price: Optional[float] = Query(
+        None,
+        ge=0,
+        description="Maximum price filter - returns cars with price less than or equal to this value"
+    ),
+    min_mileage: Optional[int] = Query(None, ge=0, description="Minimum mileage filter"),
+    max_mileage: Optional[int] = Query(None, ge=0, description="Maximum mileage filter"),
+    year: Optional[int] = Query(
+        None,
+        description="Filter cars by year (e.g., year=2023 returns cars from 2023)"
+    ),
+    year_from: Optional[int] = Query(None, description="Filter cars from this year on (inclusive)"),
+    year_to: Optional[int] = Query(None, description="Filter cars up to this year (inclusive)"),
+    registered_from: Optional[date] = Query(
+        None,
+        description="Filter cars registered on or after this date (YYYY-MM-DD)"
+    ),
+    registered_to: Optional[date] = Query(
+        None,
+        description="Filter cars registered on or before this date (YYYY-MM-DD)"
+    ),
+    brand: Optional[list[str]] = Query(
+        None,
+        description="Filter cars by brand; repeat or comma-separate for several (e.g., brand=Volvo,Tesla)"
+    ),
+    fuel_type: Optional[list[str]] = Query(
+        None,
+        description="Filter cars by fuel type; repeat or comma-separate for several (e.g., fuel_type=Electric,Hybrid)"
+    ),
+    wheel_drive: Optional[str] = Query(
+        None,
+        description="Filter cars by wheel drive type (e.g., wheel_drive=FWD, wheel_drive=AWD, wheel_drive=RWD, wheel_drive=4WD)"
+    ),
+) -> CarFilters:
+    """Read the car filter query parameters, normalized so equivalent requests compare equal."""
+    _check_range("price", min_price, max_price)
+    _check_range("mileage", min_mileage, max_mileage)
+    _check_range("year", year_from, year_to)
+    _check_range("registration date", registered_from, registered_to)
+
+    return CarFilters(
+        min_price=_decimal(min_price),
+        max_price=_decimal(max_price),
+        min_mileage=min_mileage,
+        max_mileage=max_mileage,
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+        registered_from=registered_from,
+        registered_to=registered_to,
+        brand=_values(brand, normalize_brand),
+        fuel_type=_values(fuel_type, normalize_fuel_type),
+        wheel_drive=normalize_wheel_drive(wheel_drive),
+    )
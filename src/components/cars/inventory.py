@@ -0,0 +1,158 @@
+"""
+Version of the car inventory.
+
+Every committed session that inserted, updated or deleted a `Car` bumps two
+versions:
+
+- the `cars_version` counter row, in the same transaction as the write. It is
+  shared by all workers and is what ETags are derived from. The changed cars'
+  `inventory_version` is set to the new value, so the cars written after a
+  given version can be looked up.
+- a process-wide counter, after the commit. Caches that can tolerate writes
+  from other workers until their TTL expires key their entries on it, which
+  costs no query.
+
+Updated and deleted cars are also evicted from this worker's per-car cache
+after the commit; other workers' entries expire with their TTL. Callbacks
+registered with `on_commit()` are then given the ids of the cars the commit
+inserted, updated or deleted.
+
+Writes that bypass the ORM unit of work (Core `insert()`/`update()`
+statements) must call `mark_changed()` themselves, with the ids of the cars
+they changed.
+
+The single counter row serializes car writes: from the counter UPDATE until
+commit, no other transaction that wrote cars can commit. That is what
+stamps cars in commit order, so a reader that saw version N and asks for
+cars above it misses none. It holds the lock only for the end of each
+transaction, after the car writes were flushed. Each commit also rewrites
+its cars once more, to set `inventory_version`, in statements of
+_STAMP_BATCH_SIZE ids. Those rows are already locked by the transaction,
+but large bulk writes pay for the second row version. Core writes do not
+set `inventory_version` in their own INSERT/UPDATE, although it would save
+that rewrite: the version is only known once the counter row is locked, and
+locking it before the car rows would take the two locks in the opposite
+order to ORM writes, which lock their cars at flush, and could deadlock
+against them. A deployment with more car writers than one row's lock can
+serve should stamp from a sequence instead, at the cost of commit order.
+
+The row is inserted with the table, by its migration or by `create_all`.
+Should it be missing, the first writers insert it with `ON CONFLICT`, so
+that concurrent ones do not fail on its primary key.
+"""
+import threading
+from itertools import chain
+
+from typing import Callable, Iterable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from components.cars import caches
+from components.cars.models import Car, CarsVersion
+
+_CHANGED_KEY = "cars_inventory_changed"
+_CHANGED_IDS_KEY = "cars_inventory_changed_ids"
+_COUNTER_ID = 1
+_STAMP_BATCH_SIZE = 500
+# The dialects with INSERT ... ON CONFLICT
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_lock = threading.Lock()
+_version = 0
+_commit_listeners: list[Callable[[set[int]], None]] = []
+
+
+def current_version() -> int:
+    return _version
+
+
+def bump_version() -> int:
+    global _version
+    with _lock:
+        _version += 1
+        return _version
+
+
+def on_commit(listener: Callable[[set[int]], None]) -> None:
+    """Call `listener` with the changed car ids after every commit that changed cars."""
+    _commit_listeners.append(listener)
+
+
+def mark_changed(db: Session, car_ids: Iterable[int] = ()) -> None:
+    """
+    Flag the session so that its next commit bumps the inventory version and
+    evicts `car_ids` from the per-car cache.
+    """
+    db.info[_CHANGED_KEY] = True
+    db.info.setdefault(_CHANGED_IDS_KEY, set()).update(car_ids)
+
+
+def read_version(db: Session) -> int:
+    """Return the shared inventory version with a single primary key lookup."""
+    version = db.execute(select(CarsVersion.version).where(CarsVersion.id == _COUNTER_ID)).scalar()
+    return version or 0
+
+
+def _insert_counter(db: Session) -> int:
+    # The row is created with the table; a concurrent first writer may insert it too
+    stmt = _INSERTS[db.get_bind().dialect.name](CarsVersion).values(id=_COUNTER_ID, version=1)
+    return db.execute(
+        stmt.on_conflict_do_update(index_elements=[CarsVersion.id], set_={"version": CarsVersion.version + 1})
+        .returning(CarsVersion.version)
+    ).scalar()
+
+
+def _stamp_version(db: Session) -> None:
+    version = db.execute(
+        update(CarsVersion)
+        .where(CarsVersion.id == _COUNTER_ID)
+        .values(version=CarsVersion.version + 1)
+        .returning(CarsVersion.version)
+    ).scalar()
+    if version is None:
+        version = _insert_counter(db)
+
+    # The counter row stays locked until commit, so cars are stamped in commit order
+    car_ids = sorted(db.info.get(_CHANGED_IDS_KEY, ()))
+    for start in range(0, len(car_ids), _STAMP_BATCH_SIZE):
+        db.execute(
+            update(Car)
+            .where(Car.id.in_(car_ids[start:start + _STAMP_BATCH_SIZE]))
+            .values(inventory_version=version)
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _track_car_writes(session, flush_context):
+    changed = [obj.id for obj in chain(session.new, session.dirty, session.deleted) if isinstance(obj, Car)]
+    if changed:
+        mark_changed(session, changed)
+
+
+@event.listens_for(Session, "before_commit")
+def _stamp_before_commit(session):
+    # Commit flushes after this hook, so flush first to learn about car writes
+    session.flush()
+    if session.info.get(_CHANGED_KEY):
+        _stamp_version(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    changed = session.info.pop(_CHANGED_KEY, False)
+    if changed:
+        bump_version()
+    car_ids = session.info.pop(_CHANGED_IDS_KEY, set())
+    for car_id in car_ids:
+        caches.cars.pop(car_id)
+    if changed:
+        for listener in _commit_listeners:
+            listener(car_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_CHANGED_IDS_KEY, None)
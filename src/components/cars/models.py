@@ -1,6 +1,10 @@
-from sqlalchemy import Column, Integer, String, Numeric
+from sqlalchemy import DDL, BigInteger, Column, Date, Index, Integer, String, Numeric, event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import validates
+from sqlalchemy.schema import CreateIndex
 
 from configs.database import Base
+from components.cars.normalization import parse_registered_date
 
 
 class Car(Base):
@@ -16,6 +20,8 @@ class Car(Base):
     year = Column(Integer, nullable=False)
     price = Column(Numeric(10, 2), nullable=True)
     registered_date = Column(String, nullable=True)
+    # Parsed from registered_date on every ORM write, see _parse_registered_date
+    registered_on = Column(Date, nullable=True)
     registered_year = Column(Integer, nullable=True)
     mileage = Column(Integer, nullable=True)
     wheel_drive = Column(String, nullable=True)
@@ -24,4 +30,86 @@ class Car(Base):
     source = Column(String, nullable=True)
     external_link = Column(String, nullable=True)
     display_image_url = Column(String, nullable=True)
+    # Inventory version of the last write to this car, see components.cars.inventory
+    inventory_version = Column(BigInteger, nullable=True)
+    # Bumped on every change to the car, by the ORM (version_id_col) and by
+    # components.cars.bulk; clients send it back in If-Match, see utils.etag
+    version = Column(Integer, nullable=False, server_default=text("1"))
 
+    # Access paths of the public listing, see migration 20261017090000
+    __table_args__ = (
+        Index("ix_cars_price_id", price.asc().nulls_last(), id.asc()),
+        Index("ix_cars_price_desc_id", price.desc().nulls_last(), id.desc()),
+        Index("ix_cars_registered_year_id", registered_year.asc().nulls_last(), id.asc()),
+        Index("ix_cars_registered_year_desc_id", registered_year.desc().nulls_last(), id.desc()),
+        Index(
+            "ix_cars_year_price_id", year, price.asc().nulls_last(), id.asc(),
+            postgresql_include=["registered_year"],
+        ),
+        # Equality filters on normalized categorical columns, see migration 20261017100000
+        Index("ix_cars_wheel_drive_price_id", wheel_drive, price.asc().nulls_last(), id.asc()),
+        Index("ix_cars_fuel_type", fuel_type),
+        Index("ix_cars_brand", brand),
+        # Range filters, see migration 20261017130000
+        Index("ix_cars_mileage", mileage),
+        Index("ix_cars_registered_on", registered_on),
+        # Catching up on writes since a snapshot, see migration 20261017140000
+        Index("ix_cars_inventory_version", inventory_version),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+    @validates("registered_date")
+    def _parse_registered_date(self, key, value):
+        self.registered_on = parse_registered_date(value)
+        return value
+
+
+# Full-text search over name and variant, see components.cars.search and
+# migration 20261017120000. Neither structure is mapped: PostgreSQL gets a
+# generated tsvector column with a GIN index, SQLite an FTS5 table indexing
+# the cars table's own rows, kept in sync by triggers.
+SEARCH_CONFIG = "simple"
+SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE cars ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        f"(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '') || ' ' || coalesce(variant, ''))) STORED",
+        "CREATE INDEX ix_cars_search_vector ON cars USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS cars_fts USING fts5("
+        "name, variant, content='cars', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER cars_fts_insert AFTER INSERT ON cars BEGIN "
+        "INSERT INTO cars_fts (rowid, name, variant) VALUES (new.id, new.name, new.variant); END",
+        "CREATE TRIGGER cars_fts_delete AFTER DELETE ON cars BEGIN "
+        "INSERT INTO cars_fts (cars_fts, rowid, name, variant) VALUES ('delete', old.id, old.name, old.variant); END",
+        "CREATE TRIGGER cars_fts_update AFTER UPDATE OF name, variant ON cars BEGIN "
+        "INSERT INTO cars_fts (cars_fts, rowid, name, variant) VALUES ('delete', old.id, old.name, old.variant); "
+        "INSERT INTO cars_fts (rowid, name, variant) VALUES (new.id, new.name, new.variant); END",
+    ],
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Car.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(Car.__table__, "before_drop", DDL("DROP TABLE IF EXISTS cars_fts").execute_if(dialect="sqlite"))
+
+
+class CarsVersion(Base):
+    """Single-row counter bumped in every transaction that writes cars."""
+    __tablename__ = "cars_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# Seeded where the table is created, as migration 20261017110000 does, so that
+# writers only ever UPDATE the row
+event.listen(CarsVersion.__table__, "after_create", DDL("INSERT INTO cars_version (id, version) VALUES (1, 1)"))
+
+
+@compiles(CreateIndex, "sqlite")
+def _create_index_without_nulls_order(create, compiler, **kw):
+    # SQLite has no NULLS FIRST/LAST in index definitions; its ASC/DESC indexes
+    # still serve ORDER BY ... NULLS LAST.
+    ddl = compiler.visit_create_index(create, **kw)
+    return ddl.replace(" NULLS LAST", "").replace(" NULLS FIRST", "")
@@ -0,0 +1,160 @@
+"""
+Canonical values for the categorical car columns.
+
+Cars arrive from the API, the seed script and scrapers with free-form,
+sometimes Swedish, spellings ("FWD", "rear wheel drive", "bakhjulsdrift").
+Every write path stores the canonical spelling returned by these functions,
+so filters can compare with `==` and use an index instead of `ILIKE '%…%'`.
+Unknown values are kept, with consistent whitespace and capitalisation.
+
+`registered_date` stays the free-form string it was received as; its parsed
+value is stored alongside in the `registered_on` Date column.
+"""
+import re
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+
+
+class WheelDrive(str, Enum):
+    FWD = "FWD"
+    RWD = "RWD"
+    AWD = "AWD"
+    FOUR_WD = "4WD"
+
+
+class FuelType(str, Enum):
+    PETROL = "Petrol"
+    DIESEL = "Diesel"
+    ELECTRIC = "Electric"
+    HYBRID = "Hybrid"
+    PLUG_IN_HYBRID = "Plug-in Hybrid"
+
+
+WHEEL_DRIVE_ALIASES = {
+    WheelDrive.FWD: ["front wheel drive", "front wheel", "framhjulsdrift"],
+    WheelDrive.RWD: ["rear wheel drive", "rear wheel", "bakhjulsdrift"],
+    WheelDrive.AWD: ["all wheel drive", "allhjulsdrift"],
+    WheelDrive.FOUR_WD: ["four wheel drive", "4x4", "fyrhjulsdrift"],
+}
+
+FUEL_TYPE_ALIASES = {
+    FuelType.PETROL: ["gasoline", "bensin"],
+    FuelType.DIESEL: [],
+    FuelType.ELECTRIC: ["elektrisk", "el", "ev", "bev"],
+    FuelType.HYBRID: ["elhybrid", "hev"],
+    FuelType.PLUG_IN_HYBRID: ["plugin hybrid", "laddhybrid", "phev"],
+}
+
+COLOR_ALIASES = {
+    "White": ["vit"],
+    "Black": ["svart"],
+    "Gray": ["grey", "grå"],
+    "Silver": [],
+    "Red": ["röd"],
+    "Blue": ["blå"],
+    "Green": ["grön"],
+    "Yellow": ["gul"],
+    "Brown": ["brun"],
+    "Orange": [],
+    "Beige": [],
+    "Purple": ["lila"],
+}
+
+BRANDS = [
+    "Acura", "Audi", "BMW", "BYD", "Chevrolet", "Cupra", "Dodge", "Ford", "Genesis", "Honda",
+    "Hyundai", "Jeep", "Kia", "Lexus", "Mazda", "Mercedes-Benz", "MG", "Nissan", "Polestar",
+    "Subaru", "Tesla", "Toyota", "Volkswagen", "Volvo",
+]
+BRAND_ALIASES = {brand: [] for brand in BRANDS}
+BRAND_ALIASES["Mercedes-Benz"] = ["mercedes", "mercedes benz"]
+BRAND_ALIASES["Volkswagen"] = ["vw"]
+
+
+def _key(value: str) -> str:
+    return " ".join(value.replace("-", " ").split()).casefold()
+
+
+def _lookup(aliases: dict) -> dict:
+    table = {}
+    for canonical, names in aliases.items():
+        value = canonical.value if isinstance(canonical, Enum) else canonical
+        for name in [value, *names]:
+            table[_key(name)] = value
+    return table
+
+
+def _capitalize_words(value: str) -> str:
+    return " ".join(word[:1].upper() + word[1:] for word in value.split())
+
+
+_WHEEL_DRIVES = _lookup(WHEEL_DRIVE_ALIASES)
+_FUEL_TYPES = _lookup(FUEL_TYPE_ALIASES)
+_COLORS = _lookup(COLOR_ALIASES)
+_BRANDS = _lookup(BRAND_ALIASES)
+
+
+def _normalize(value: Optional[str], table: dict, fallback) -> Optional[str]:
+    if value is None:
+        return None
+    value = " ".join(value.split())
+    if not value:
+        return value
+    return table.get(_key(value)) or fallback(value)
+
+
+def normalize_wheel_drive(value: Optional[str]) -> Optional[str]:
+    return _normalize(value, _WHEEL_DRIVES, str.upper)
+
+
+def normalize_fuel_type(value: Optional[str]) -> Optional[str]:
+    return _normalize(value, _FUEL_TYPES, _capitalize_words)
+
+
+def normalize_color(value: Optional[str]) -> Optional[str]:
+    return _normalize(value, _COLORS, _capitalize_words)
+
+
+def normalize_brand(value: Optional[str]) -> Optional[str]:
+    return _normalize(value, _BRANDS, _capitalize_words)
+
+
+NORMALIZERS = {
+    "wheel_drive": normalize_wheel_drive,
+    "fuel_type": normalize_fuel_type,
+    "color": normalize_color,
+    "brand": normalize_brand,
+}
+
+
+def normalize_field(field: str, value: Optional[str]) -> Optional[str]:
+    """Normalize `value` if `field` is a categorical column, else return it unchanged."""
+    normalizer = NORMALIZERS.get(field)
+    return normalizer(value) if normalizer else value
+
+
+def normalize_car_fields(data: dict) -> dict:
+    """Return a copy of a car's column values with categorical columns normalized."""
+    return {field: normalize_field(field, value) for field, value in data.items()}
+
+
+# Spellings of registration dates seen in seed data and scraped listings
+DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%Y%m%d", "%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%Y-%m", "%m/%Y"]
+
+
+def parse_registered_date(value: Optional[str]) -> Optional[date]:
+    """
+    Parse a free-form registration date, e.g. "2023-03-15", "15.03.2023" or
+    "2023-03".  Month precision dates give the first of the month.
+    Returns None when the value is missing or not a recognizable date.
+    """
+    if not value:
+        return None
+    # Drop a time part: "2023-03-15T10:00:00", "2023-03-15 10:00"
+    text = re.split(r"[T\s]", value.strip(), maxsplit=1)[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,181 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from components.cars.models import Car
+
+
+class SortOrder:
+    """
+    A list ordering made of an optional sort column plus an `id` tie-breaker.
+
+    NULL sort values always come last, whatever the direction.
+    """
+
+    def __init__(self, column=None, descending: bool = False):
+        self.column = column
+        self.descending = descending
+
+    def order_by(self) -> list:
+        id_order = Car.id.desc() if self.descending else Car.id.asc()
+        if self.column is None:
+            return [id_order]
+        column_order = self.column.desc() if self.descending else self.column.asc()
+        return [column_order.nulls_last(), id_order]
+
+    def key_of(self, row) -> Any:
+        return getattr(row, self.column.key) if self.column is not None else None
+
+    def parse_key(self, value: Any) -> Any:
+        if value is None or self.column is None:
+            return None
+        return self.column.type.python_type(value)
+
+
+SORT_ORDERS = {
+    "price": SortOrder(Car.price),
+    "price_desc": SortOrder(Car.price, descending=True),
+    "registered_year": SortOrder(Car.registered_year),
+    "registered_year_desc": SortOrder(Car.registered_year, descending=True),
+}
+DEFAULT_SORT_ORDER = SortOrder()
+
+
+def get_sort_order(order_by: Optional[str]) -> SortOrder:
+    """Resolve an `order_by` query value, falling back to id ordering."""
+    return SORT_ORDERS.get(order_by, DEFAULT_SORT_ORDER)
+
+
+def encode_cursor(order_by: Optional[str], key: Any, car_id: int) -> str:
+    """Encode the position after a row as an opaque, URL-safe cursor."""
+    payload = {"o": order_by or "", "k": str(key) if key is not None else None, "id": car_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Optional[str], sort: SortOrder) -> tuple[Any, int]:
+    """Decode a cursor into its `(sort key, id)` position."""
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor",
+    )
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        key = sort.parse_key(payload["k"])
+        car_id = int(payload["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError, ArithmeticError):
+        raise invalid_cursor
+
+    if payload.get("o") != (order_by or ""):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested order_by",
+        )
+    return key, car_id
+
+
+def _seek(db: Session, stmt: Select, sort: SortOrder, key: Any, car_id: int, limit: int) -> list:
+    """
+    Fetch up to `limit` rows strictly after `(key, car_id)`.
+
+    Rows with a non-NULL sort key are read with a row-value comparison so the
+    database can range-scan a `(sort_key, id)` index. Once those run out the
+    NULL tail is read by id, which keeps each page a bounded index scan
+    instead of an OR predicate that forces a sort of the remaining rows.
+    """
+    after_id = Car.id < car_id if sort.descending else Car.id > car_id
+    id_order = Car.id.desc() if sort.descending else Car.id.asc()
+
+    if sort.column is None:
+        return db.execute(stmt.where(after_id).order_by(id_order).limit(limit)).all()
+
+    if key is None:
+        return db.execute(stmt.where(sort.column.is_(None), after_id).order_by(id_order).limit(limit)).all()
+
+    position = tuple_(sort.column, Car.id)
+    after_position = position < (key, car_id) if sort.descending else position > (key, car_id)
+    rows = db.execute(stmt.where(after_position).order_by(*sort.order_by()).limit(limit)).all()
+    if len(rows) < limit:
+        null_tail = stmt.where(sort.column.is_(None)).order_by(id_order).limit(limit - len(rows))
+        rows += db.execute(null_tail).all()
+    return rows
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    order_by: Optional[str],
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    sort: Optional[SortOrder] = None,
+) -> tuple[list, Optional[str]]:
+    """
+    Fetch one page of the rows selected by `stmt` and the cursor for the page
+    after it. `stmt` must select the `id` column and the sort column.
+    `sort` overrides the sort order named by `order_by`, e.g. for a computed
+    sort key; `order_by` still names it in cursors.
+
+    With a `cursor` the page is located by seeking past the encoded row, so
+    its cost does not depend on how deep the page is. Without one the legacy
+    `offset` is applied. One extra row is read to know whether a next page
+    exists; `next_cursor` is None on the last page.
+    """
+    sort = sort or get_sort_order(order_by)
+
+    if cursor is not None:
+        key, car_id = decode_cursor(cursor, order_by, sort)
+        rows = _seek(db, stmt, sort, key, car_id, limit + 1)
+    else:
+        rows = db.execute(stmt.order_by(*sort.order_by()).offset(offset).limit(limit + 1)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(order_by, sort.key_of(last), last.id)
+
+
+def count(db: Session, stmt: Select) -> int:
+    """Count the rows selected by `stmt`."""
+    return db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar_one()
+
+
+def paginate_counted(
+    db: Session,
+    stmt: Select,
+    order_by: Optional[str],
+    limit: int,
+    offset: int = 0,
+    sort: Optional[SortOrder] = None,
+) -> tuple[list, Optional[str], int]:
+    """
+    Like `paginate` with an offset, but also return the total number of rows
+    selected by `stmt`, computed in the same statement with `COUNT(*) OVER ()`.
+
+    The window count is evaluated before LIMIT/OFFSET, so every returned row
+    carries the full total. Only a page past the end has no row to carry it,
+    in which case a separate count is run.
+    """
+    sort = sort or get_sort_order(order_by)
+    counted = stmt.add_columns(func.count().over().label("total"))
+    rows = db.execute(counted.order_by(*sort.order_by()).offset(offset).limit(limit + 1)).all()
+
+    if rows:
+        total = rows[0].total
+    else:
+        total = count(db, stmt) if offset else 0
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(order_by, sort.key_of(last), last.id)
+    return rows, next_cursor, total
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Literal, Optional, Union
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+
+from components.cars.normalization import NORMALIZERS, normalize_field
 
 
 class CarCreate(BaseModel):
@@ -23,6 +25,11 @@ class CarCreate(BaseModel):
     external_link: Optional[str] = None
     display_image_url: Optional[str] = None
 
+    @field_validator(*NORMALIZERS)
+    @classmethod
+    def normalize_categorical(cls, value: Optional[str], info) -> Optional[str]:
+        return normalize_field(info.field_name, value)
+
 
 class CarUpdate(BaseModel):
     name: Optional[str] = None
@@ -43,6 +50,11 @@ class CarUpdate(BaseModel):
     external_link: Optional[str] = None
     display_image_url: Optional[str] = None
 
+    @field_validator(*NORMALIZERS)
+    @classmethod
+    def normalize_categorical(cls, value: Optional[str], info) -> Optional[str]:
+        return normalize_field(info.field_name, value)
+
 
 class CarResponse(BaseModel):
     id: int
@@ -63,6 +75,7 @@ class CarResponse(BaseModel):
     source: Optional[str] = None
     external_link: Optional[str] = None
     display_image_url: Optional[str] = None
+    version: int
 
     class Config:
         from_attributes = True
@@ -89,13 +102,74 @@ class CarPublicResponse(BaseModel):
 
 class PaginatedResponse(BaseModel):
     items: list[CarResponse]
-    total: int
+    total: Optional[int] = None
+    total_type: Optional[Literal["exact", "estimated"]] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class PaginatedPublicResponse(BaseModel):
     items: list[CarPublicResponse]
-    total: int
+    total: Optional[int] = None
+    total_type: Optional[Literal["exact", "estimated"]] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+
+
+class CarBatchResponse(BaseModel):
+    items: list[CarPublicResponse]
+    missing: list[int]
+
+
+class CarBulkCreate(BaseModel):
+    items: list[CarCreate]
+
+
+class CarBulkResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CarBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    items: list[CarBulkResult]
+
+
+class CarBulkUpsertResponse(BaseModel):
+    saved: int
+    failed: int
+    items: list[CarBulkResult]
+
+
+class FacetCount(BaseModel):
+    value: Union[int, str, None]
+    count: int
+
+
+class CarFacets(BaseModel):
+    brand: list[FacetCount]
+    fuel_type: list[FacetCount]
+    wheel_drive: list[FacetCount]
+    year: list[FacetCount]
+    price: list[FacetCount]
+
+
+class CarFacetsResponse(BaseModel):
+    total: int
+    facets: CarFacets
+
+
+def dump_trusted(model: type[BaseModel], row) -> dict:
+    """
+    The `model` fields of `row`, an ORM object or a Core row, as a plain dict
+    without validation. Only for rows read straight from the database, whose
+    values already have the column types the response models declare.
+    """
+    if hasattr(row, "_asdict"):
+        values = row._asdict()  # far cheaper than attribute access on a Row
+        return {field: values[field] for field in model.model_fields}
+    return {field: getattr(row, field) for field in model.model_fields}
@@ -0,0 +1,63 @@
+"""
+Ranked full-text search over car name and variant.
+
+The text is indexed by the database (see `SEARCH_DDL` in
+`components.cars.models`):
+
+- PostgreSQL matches the generated `search_vector` column through its GIN
+  index and ranks with `ts_rank`. With `SEARCH_TRIGRAM` enabled, names within
+  pg_trgm similarity of the query also match, ranked by that similarity.
+- SQLite matches the FTS5 table `cars_fts` and ranks with `bm25`.
+
+Queries are split into words; a car matches when it contains every word,
+each as a prefix, so "tes mod" finds "Tesla Model 3".
+"""
+import re
+
+from sqlalchemy import Float, Select, column, func, literal_column, or_, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from configs.settings import settings
+from components.cars.models import SEARCH_CONFIG, Car
+from components.cars.pagination import SortOrder
+
+RELEVANCE = "relevance"
+
+search_vector = literal_column("cars.search_vector", TSVECTOR)
+cars_fts = table("cars_fts", column("rowid"))
+
+
+def search_terms(q: str) -> list[str]:
+    """The words of a search query, lower-cased, without punctuation or operators."""
+    return re.findall(r"\w+", q.casefold())
+
+
+def _postgresql(stmt: Select, terms: list[str]) -> tuple[Select, object]:
+    query = func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+    matches = search_vector.op("@@")(query)
+    rank = func.ts_rank(search_vector, query, type_=Float)
+
+    if settings.SEARCH_TRIGRAM:
+        text = " ".join(terms)
+        matches = or_(matches, Car.name.op("%")(text))
+        rank = func.greatest(rank, func.similarity(Car.name, text), type_=Float)
+    return stmt.where(matches), rank
+
+
+def _sqlite(stmt: Select, terms: list[str]) -> tuple[Select, object]:
+    fts = literal_column("cars_fts")
+    stmt = stmt.join(cars_fts, cars_fts.c.rowid == Car.id)
+    # bm25 is lower for better matches; negate it so higher ranks first, as on PostgreSQL
+    rank = -func.bm25(fts, type_=Float)
+    return stmt.where(fts.op("MATCH")(" ".join(f'"{term}"*' for term in terms))), rank
+
+
+def apply_search(stmt: Select, terms: list[str], dialect: str) -> tuple[Select, SortOrder]:
+    """
+    Narrow `stmt` to the cars matching every search term and add their
+    relevance as a `rank` column. Returns the statement and the sort order
+    that lists the best matches first.
+    """
+    stmt, rank = _postgresql(stmt, terms) if dialect == "postgresql" else _sqlite(stmt, terms)
+    rank = rank.label("rank")
+    return stmt.add_columns(rank), SortOrder(rank, descending=True)
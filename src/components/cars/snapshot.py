@@ -0,0 +1,506 @@
+"""
+In-memory columnar snapshot of the car inventory: the `memory` engine of
+GET /v1/cars/public (PUBLIC_LIST_ENGINE=memory).
+
+Each worker keeps every car in NumPy arrays, one per public column: prices in
+cents, years, mileage and registration days as int64 with a null mask;
+brand, fuel_type and wheel_drive dictionary-encoded as int32 codes; the other
+strings as fixed-width (start, length) references into one UTF-8 string
+heap. A query is a handful of vectorized comparisons building a row mask, a
+precomputed sort permutation (nulls last, id tie-breaker, as in SQL) narrowed
+by that mask, and a slice - no database round trip beyond the version lookup
+the endpoint already does. Only the cars on the returned page are decoded.
+
+The snapshot is labelled with the shared inventory version it reflects and
+only answers queries at that version; otherwise the endpoint falls back to
+the database. It is kept current by:
+
+- car writes committed by this worker (`inventory.on_commit`), re-read by id
+  on the next query and patched into the arrays;
+- writes by other workers, found by their `inventory_version` being newer
+  than the snapshot's and patched in the same way;
+- a full reload every SNAPSHOT_RECONCILE_SECONDS, which also catches writes
+  that bypassed the version.
+
+With SNAPSHOT_FILE set, the snapshot is memory-mapped from a file written by
+`write_file` (see write_snapshot.py) instead of being read from the database,
+then caught up from the version the file was written at. Every worker maps
+the same file, so they share its pages and serve from memory right away.
+Patched cars are kept beside the mapped arrays. Reloads map the file again,
+so rewrite it periodically.
+
+Full-text search (`q`) always uses the database.
+"""
+import json
+import math
+import mmap
+import operator
+import os
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from configs.settings import settings
+from components.cars import inventory
+from components.cars.fieldsets import select_columns
+from components.cars.filters import CarFilters
+from components.cars.models import Car
+from components.cars.pagination import decode_cursor, encode_cursor, get_sort_order
+from components.cars.schemas import CarPublicResponse
+from utils.logger import setup_logger
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+logger = setup_logger(__name__)
+
+NUMBERS = ("price", "year", "registered_year", "mileage", "registered_on")
+CATEGORIES = ("brand", "fuel_type", "wheel_drive")
+STRINGS = ("name", "model", "make", "color", "external_link", "display_image_url")
+FIELDS = tuple(CarPublicResponse.model_fields)
+
+# File layout: magic, little-endian uint64 header length, JSON header, then
+# each array at the 8-byte aligned offset the header gives for it
+FILE_MAGIC = b"CARSNAP1"
+_ALIGNMENT = 8
+
+
+def _number(name: str, value):
+    """The int64 representation of a column value: cents for prices, day ordinals for dates."""
+    if name == "price":
+        return int(value * 100)
+    if name == "registered_on":
+        return value.toordinal()
+    return value
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+class Heap:
+    """
+    UTF-8 strings stored back to back, addressed by (start, length): a base
+    buffer, e.g. the mapped file, and the strings of cars patched in since.
+    """
+
+    def __init__(self, base=b"", extra: bytes = b""):
+        self.base = base
+        self.extra = extra
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.extra)
+
+    def get(self, start: int, length: int) -> Optional[str]:
+        if length < 0:
+            return None
+        buffer = self.base
+        if start >= len(self.base):
+            buffer, start = self.extra, start - len(self.base)
+        return str(buffer[start:start + length], "utf-8")
+
+    def extended(self, data: bytes) -> "Heap":
+        return Heap(self.base, self.extra + data)
+
+
+class Columns:
+    """An immutable columnar copy of the cars; changes build a new one."""
+
+    def __init__(self, ids, numbers: dict, nulls: dict, codes: dict, categories: dict, strings: dict, heap: Heap):
+        self.ids = ids
+        self.numbers = numbers
+        self.nulls = nulls
+        self.codes = codes
+        self.categories = categories
+        self.strings = strings
+        self.heap = heap
+        self._category_codes = {name: {value: code for code, value in enumerate(values)} for name, values in categories.items()}
+        self._orders = {}
+        self._orders_lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, rows: list, categories: Optional[dict] = None) -> "Columns":
+        """Encode `rows`, extending a copy of the existing `categories` with new values."""
+        size = len(rows)
+        categories = {name: list(values) for name, values in (categories or {name: [] for name in CATEGORIES}).items()}
+        numbers, nulls, codes, strings = {}, {}, {}, {}
+        for name in NUMBERS:
+            values = [getattr(row, name) for row in rows]
+            nulls[name] = np.fromiter((value is None for value in values), dtype=bool, count=size)
+            numbers[name] = np.fromiter((0 if value is None else _number(name, value) for value in values), dtype=np.int64, count=size)
+        for name in CATEGORIES:
+            index = {value: code for code, value in enumerate(categories[name])}
+            encoded = np.empty(size, dtype=np.int32)
+            for i, row in enumerate(rows):
+                value = getattr(row, name)
+                if value is None:
+                    encoded[i] = -1
+                    continue
+                code = index.get(value)
+                if code is None:
+                    code = index[value] = len(categories[name])
+                    categories[name].append(value)
+                encoded[i] = code
+            codes[name] = encoded
+
+        heap = bytearray()
+        for name in STRINGS:
+            starts = np.empty(size, dtype=np.int64)
+            lengths = np.empty(size, dtype=np.int32)
+            for i, row in enumerate(rows):
+                value = getattr(row, name)
+                starts[i] = len(heap)
+                if value is None:
+                    lengths[i] = -1
+                    continue
+                encoded = value.encode()
+                lengths[i] = len(encoded)
+                heap += encoded
+            strings[name] = (starts, lengths)
+
+        ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=size)
+        return cls(ids, numbers, nulls, codes, categories, strings, Heap(bytes(heap)))
+
+    def patched(self, rows: list, car_ids: Iterable[int]) -> "Columns":
+        """A copy with the cars `car_ids` replaced by `rows`; ids without a row are removed."""
+        changed = Columns.from_rows(rows, self.categories)
+        keep = ~np.isin(self.ids, np.fromiter(car_ids, dtype=np.int64))
+        # The changed cars' strings go after the heap, whose base stays shared
+        return Columns(
+            np.concatenate([self.ids[keep], changed.ids]),
+            {name: np.concatenate([self.numbers[name][keep], changed.numbers[name]]) for name in NUMBERS},
+            {name: np.concatenate([self.nulls[name][keep], changed.nulls[name]]) for name in NUMBERS},
+            {name: np.concatenate([self.codes[name][keep], changed.codes[name]]) for name in CATEGORIES},
+            changed.categories,
+            {
+                name: (
+                    np.concatenate([self.strings[name][0][keep], changed.strings[name][0] + len(self.heap)]),
+                    np.concatenate([self.strings[name][1][keep], changed.strings[name][1]]),
+                )
+                for name in STRINGS
+            },
+            self.heap.extended(changed.heap.base),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _arrays(self) -> dict:
+        arrays = {"ids": self.ids}
+        for name in NUMBERS:
+            arrays[f"numbers.{name}"] = self.numbers[name]
+            arrays[f"nulls.{name}"] = self.nulls[name]
+        for name in CATEGORIES:
+            arrays[f"codes.{name}"] = self.codes[name]
+        for name in STRINGS:
+            arrays[f"starts.{name}"], arrays[f"lengths.{name}"] = self.strings[name]
+        return arrays
+
+    def save(self, path: str, version: int) -> None:
+        """Write the snapshot at inventory `version` to `path`, replacing any previous file atomically."""
+        arrays = self._arrays()
+        heap = bytes(self.heap.base) + self.heap.extra
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            layout[name] = {"offset": offset, "dtype": array.dtype.str, "count": len(array)}
+            offset += _aligned(array.nbytes)
+        header = json.dumps({
+            "version": version,
+            "categories": self.categories,
+            "arrays": layout,
+            "heap": {"offset": offset, "length": len(heap)},
+        }).encode()
+        data_start = _aligned(len(FILE_MAGIC) + 8 + len(header))
+
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(FILE_MAGIC + len(header).to_bytes(8, "little") + header)
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name]["offset"])
+                file.write(np.ascontiguousarray(array).tobytes())
+            file.seek(data_start + offset)
+            file.write(heap)
+            file.flush()
+            os.fsync(file.fileno())
+        # Workers that mapped the previous file keep reading it until they reload
+        os.replace(temporary, path)
+
+    @classmethod
+    def open(cls, path: str) -> tuple["Columns", int]:
+        """Memory-map a file written by `save`; return its snapshot and inventory version."""
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(FILE_MAGIC)] != FILE_MAGIC:
+            raise ValueError(f"{path} is not a car snapshot file")
+        header_end = len(FILE_MAGIC) + 8 + int.from_bytes(buffer[len(FILE_MAGIC):len(FILE_MAGIC) + 8], "little")
+        header = json.loads(buffer[len(FILE_MAGIC) + 8:header_end])
+        data_start = _aligned(header_end)
+
+        arrays = {
+            name: np.frombuffer(buffer, dtype=layout["dtype"], count=layout["count"], offset=data_start + layout["offset"])
+            for name, layout in header["arrays"].items()
+        }
+        heap_start = data_start + header["heap"]["offset"]
+        columns = cls(
+            arrays["ids"],
+            {name: arrays[f"numbers.{name}"] for name in NUMBERS},
+            {name: arrays[f"nulls.{name}"] for name in NUMBERS},
+            {name: arrays[f"codes.{name}"] for name in CATEGORIES},
+            header["categories"],
+            {name: (arrays[f"starts.{name}"], arrays[f"lengths.{name}"]) for name in STRINGS},
+            Heap(memoryview(buffer)[heap_start:heap_start + header["heap"]["length"]]),
+        )
+        return columns, header["version"]
+
+    def records(self, rows) -> list[dict]:
+        """The public fields of the cars at positions `rows`, as `dump_trusted` gives them."""
+        values = {"id": self.ids[rows].tolist()}
+        for name in STRINGS:
+            starts, lengths = self.strings[name]
+            values[name] = [self.heap.get(start, length) for start, length in zip(starts[rows].tolist(), lengths[rows].tolist())]
+        for name in CATEGORIES:
+            categories = self.categories[name]
+            values[name] = [categories[code] if code >= 0 else None for code in self.codes[name][rows].tolist()]
+        for name in ("price", "registered_year", "mileage"):
+            numbers = zip(self.numbers[name][rows].tolist(), self.nulls[name][rows].tolist())
+            values[name] = [None if null else number for number, null in numbers]
+        values["price"] = [None if cents is None else Decimal(cents).scaleb(-2) for cents in values["price"]]
+        return [dict(zip(FIELDS, record)) for record in zip(*(values[field] for field in FIELDS))]
+
+    def _sort_keys(self, order_by: Optional[str]) -> tuple:
+        """(nulls, values, ids) of every row, each ascending in the sort order."""
+        sort = get_sort_order(order_by)
+        sign = -1 if sort.descending else 1
+        if sort.column is None:
+            return np.zeros(len(self), dtype=bool), np.zeros(len(self), dtype=np.int64), self.ids * sign
+        name = sort.column.key
+        return self.nulls[name], self.numbers[name] * sign, self.ids * sign
+
+    def order(self, order_by: Optional[str]):
+        """The row permutation listing the cars in `order_by` order, computed once per snapshot."""
+        order = self._orders.get(order_by)
+        if order is None:
+            with self._orders_lock:
+                nulls, values, ids = self._sort_keys(order_by)
+                # lexsort sorts by its last key first: nulls last, then the value, then the id
+                order = self._orders[order_by] = np.lexsort((ids, values, nulls))
+        return order
+
+    def _is_in(self, name: str, values: Iterable[str]):
+        wanted = [self._category_codes[name][value] for value in values if value in self._category_codes[name]]
+        return np.isin(self.codes[name], wanted)
+
+    def _compare(self, name: str, compare, bound):
+        return ~self.nulls[name] & compare(self.numbers[name], bound)
+
+    def mask(self, filters: CarFilters):
+        """The rows matching `filters`, or None when nothing is filtered."""
+        conditions = []
+        for name in ("brand", "fuel_type"):
+            if getattr(filters, name):
+                conditions.append(self._is_in(name, getattr(filters, name)))
+        if filters.wheel_drive is not None:
+            conditions.append(self._is_in("wheel_drive", (filters.wheel_drive,)))
+
+        ranges = [
+            ("year", operator.eq, filters.year),
+            ("year", operator.ge, filters.year_from),
+            ("year", operator.le, filters.year_to),
+            ("price", operator.ge, math.ceil(filters.min_price * 100) if filters.min_price is not None else None),
+            ("price", operator.le, math.floor(filters.max_price * 100) if filters.max_price is not None else None),
+            ("mileage", operator.ge, filters.min_mileage),
+            ("mileage", operator.le, filters.max_mileage),
+            ("registered_on", operator.ge, _ordinal(filters.registered_from)),
+            ("registered_on", operator.le, _ordinal(filters.registered_to)),
+        ]
+        conditions += [self._compare(name, compare, bound) for name, compare, bound in ranges if bound is not None]
+
+        if not conditions:
+            return None
+        mask = conditions[0]
+        for condition in conditions[1:]:
+            mask = mask & condition
+        return mask
+
+    def _start_after(self, selected, order_by: Optional[str], key, car_id: int) -> int:
+        """The index in `selected` of the first row sorting strictly after `(key, car_id)`."""
+        sort = get_sort_order(order_by)
+        sign = -1 if sort.descending else 1
+        nulls, values, ids = (keys[selected] for keys in self._sort_keys(order_by))
+        key_null = key is None and sort.column is not None
+        key_value = 0 if key is None else _number(sort.column.key, key) * sign
+        after = (nulls > key_null) | (
+            (nulls == key_null) & ((values > key_value) | ((values == key_value) & (ids > car_id * sign)))
+        )
+        # Rows are sorted by the same keys, so those after the position are a suffix
+        return int(after.argmax()) if after.any() else len(selected)
+
+    def query(
+        self,
+        filters: CarFilters,
+        order_by: Optional[str],
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str], int]:
+        """One page of the matching cars' public fields, the next page's cursor, and the total."""
+        sort = get_sort_order(order_by)
+        order = self.order(order_by)
+        mask = self.mask(filters)
+        selected = order if mask is None else order[mask[order]]
+
+        if cursor is not None:
+            key, car_id = decode_cursor(cursor, order_by, sort)
+            start = self._start_after(selected, order_by, key, car_id)
+        else:
+            start = offset
+        page = self.records(selected[start:start + limit + 1])
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            key = last[sort.column.key] if sort.column is not None else None
+            next_cursor = encode_cursor(order_by, key, last["id"])
+        return page, next_cursor, len(selected)
+
+
+def _ordinal(value: Optional[date]) -> Optional[int]:
+    return value.toordinal() if value is not None else None
+
+
+def _select():
+    return select(*select_columns(CarPublicResponse, "year", "registered_on"))
+
+
+def write_file(db: Session, path: str) -> tuple[int, int]:
+    """Write every car to a snapshot file at `path`; return its inventory version and number of cars."""
+    # Read the version first: cars written meanwhile are newer than it, and caught up again
+    version = inventory.read_version(db)
+    columns = Columns.from_rows(db.execute(_select()).all())
+    columns.save(path, version)
+    return version, len(columns)
+
+
+def _open_file(path: str) -> Optional[tuple[Columns, int]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        return Columns.open(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read car snapshot {path}: {e}")
+        return None
+
+
+class CarSnapshot:
+    """This worker's columnar snapshot and what it takes to keep it current."""
+
+    def __init__(self):
+        self.columns: Optional[Columns] = None
+        self.version: Optional[int] = None
+        self.loaded_at = 0.0
+        self.reloads = 0
+        self._pending_ids: set[int] = set()
+        self._lock = threading.Lock()
+
+    def on_commit(self, car_ids: set[int]) -> None:
+        """Record a car write committed by this worker, to patch in on the next query."""
+        with self._lock:
+            self._pending_ids |= car_ids
+            if not car_ids:
+                # A write that did not say which cars it changed: reload in full
+                self.columns = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self.columns = None
+            self.version = None
+            self._pending_ids = set()
+
+    def open_file(self, path: str) -> bool:
+        """Map the snapshot file at `path`, to be caught up on the next query. False without one."""
+        opened = _open_file(path) if np is not None else None
+        if opened is None:
+            return False
+        with self._lock:
+            self._loaded(*opened)
+        return True
+
+    def _loaded(self, columns: Columns, version: int) -> None:
+        self.columns = columns
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.reloads += 1
+
+    def _reload(self, db: Session, version: int) -> None:
+        opened = _open_file(settings.SNAPSHOT_FILE) if settings.SNAPSHOT_FILE else None
+        if opened is not None and opened[1] <= version:
+            # Pending writes of this worker are at most as old as the file: caught up below
+            self._loaded(*opened)
+        else:
+            self._loaded(Columns.from_rows(db.execute(_select()).all()), version)
+            self._pending_ids = set()
+
+    def _catch_up(self, db: Session, version: int) -> None:
+        # This worker's writes, deletions included, and every car written since the snapshot
+        car_ids = self._pending_ids
+        changed = Car.inventory_version > self.version
+        if car_ids:
+            changed = or_(changed, Car.id.in_(car_ids))
+        rows = db.execute(_select().where(changed)).all()
+        self.columns = self.columns.patched(rows, car_ids | {row.id for row in rows})
+        self.version = version
+        self._pending_ids = set()
+
+    def current(self, db: Session, version: int) -> Optional[Columns]:
+        """The snapshot at `version`, brought there first if possible; None when it cannot be."""
+        columns = self.columns
+        if (
+            columns is not None
+            and self.version == version
+            and not self._pending_ids
+            and time.monotonic() - self.loaded_at < settings.SNAPSHOT_RECONCILE_SECONDS
+        ):
+            return columns
+
+        # One refresh at a time; meanwhile other requests use the database
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self.columns is None or time.monotonic() - self.loaded_at >= settings.SNAPSHOT_RECONCILE_SECONDS:
+                self._reload(db, version)
+            # A version older than the snapshot's comes from a lagging replica: leave it to the database
+            if version > self.version or (version == self.version and self._pending_ids):
+                self._catch_up(db, version)
+            return self.columns if self.version == version else None
+        finally:
+            self._lock.release()
+
+    def query(
+        self,
+        db: Session,
+        version: int,
+        filters: CarFilters,
+        order_by: Optional[str],
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Optional[tuple[list[dict], Optional[str], int]]:
+        """`Columns.query` at inventory `version`, or None when the database has to answer."""
+        if np is None:
+            return None
+        columns = self.current(db, version)
+        if columns is None:
+            return None
+        return columns.query(filters, order_by, limit, offset=offset, cursor=cursor)
+
+
+cars = CarSnapshot()
+inventory.on_commit(cars.on_commit)
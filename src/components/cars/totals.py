@@ -0,0 +1,98 @@
+import json
+from typing import Hashable, Optional
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import Session
+
+from components.cars import caches, inventory
+from components.cars.pagination import count
+from configs.settings import settings
+
+EXACT = "exact"
+ESTIMATED = "estimated"
+
+
+def _estimate_rows(db: Session, stmt: Select) -> int:
+    """Return the PostgreSQL planner's row estimate for `stmt` without running it."""
+    connection = db.connection()
+    compiled = stmt.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _compute_total(db: Session, stmt: Select) -> tuple[int, str]:
+    threshold = settings.COUNT_ESTIMATE_THRESHOLD
+    if threshold > 0 and db.get_bind().dialect.name == "postgresql":
+        estimate = _estimate_rows(db, stmt)
+        if estimate >= threshold:
+            return estimate, ESTIMATED
+    return count(db, stmt), EXACT
+
+
+def supports_window_count(dialect: Dialect) -> bool:
+    """Whether `COUNT(*) OVER ()` can be used on this database."""
+    if dialect.name == "postgresql":
+        return True
+    if dialect.name == "sqlite":
+        return dialect.dbapi.sqlite_version_info >= (3, 25, 0)
+    if dialect.name in ("mysql", "mariadb"):
+        return (dialect.server_version_info or (0,)) >= ((10, 2) if dialect.is_mariadb else (8, 0))
+    return False
+
+
+def use_window_count(db: Session) -> bool:
+    """Whether list pages should fetch their total in the same statement as the rows."""
+    return settings.LIST_COUNT_STRATEGY == "window" and supports_window_count(db.get_bind().dialect)
+
+
+def _cache_key(db: Session, filters: Hashable, version: Optional[int]) -> tuple:
+    if version is None:
+        version = inventory.current_version()
+    # Replicas lag the primary: keep the totals counted on each engine apart
+    return filters, version, db.get_bind()
+
+
+def is_cached(db: Session, filters: Hashable, version: Optional[int] = None) -> bool:
+    return _cache_key(db, filters, version) in caches.totals
+
+
+def store_total(db: Session, filters: Hashable, total: int, version: Optional[int] = None) -> tuple[int, str]:
+    """Cache an exact total computed by the caller and return `(total, total_type)`."""
+    result = (total, EXACT)
+    caches.totals.set(_cache_key(db, filters, version), result)
+    return result
+
+
+def get_total(
+    db: Session,
+    stmt: Select,
+    filters: Hashable,
+    include_total: bool = True,
+    version: Optional[int] = None,
+) -> tuple[Optional[int], Optional[str]]:
+    """
+    Return `(total, total_type)` for the rows selected by `stmt`.
+
+    `filters` identifies the filter combination of `stmt`; totals are cached
+    per combination and inventory version. Pass the shared version
+    (`inventory.read_version`) when the total ends up in a response keyed on
+    it; the process-local version, the default, misses other workers' writes
+    until its entries expire. On PostgreSQL, once the
+    planner expects at least COUNT_ESTIMATE_THRESHOLD rows, its estimate is
+    returned instead of an exact count. Nothing is queried when
+    `include_total` is False.
+    """
+    if not include_total:
+        return None, None
+
+    key = _cache_key(db, filters, version)
+    cached = caches.totals.get(key)
+    if cached is not None:
+        return cached
+
+    result = _compute_total(db, stmt)
+    caches.totals.set(key, result)
+    return result
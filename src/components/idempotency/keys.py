@@ -0,0 +1,228 @@
+"""
+Idempotency keys for POST /v1/cars.
+
+A client that may retry a request sends it with an `Idempotency-Key` header,
+a value unique to the operation such as a UUID. The endpoint records its
+response under the key in the same transaction as its write, so both or
+neither are committed. A retry with the key is answered with the recorded
+status, headers and body, plus `Idempotent-Replayed: true`, before the body
+is validated and without writing again. A retry that raced the first request
+fails on the key's primary key (or on what the first request wrote), is
+rolled back, and is answered with the first request's response.
+
+Keys belong to the user who sent them and expire after
+IDEMPOTENCY_KEY_TTL_SECONDS. Only successful responses are recorded: a
+request that failed can be retried with the same key. Reusing a key for a
+different request body is rejected with 422.
+
+Keys are looked up by primary key, in the endpoint's own session (its
+AsyncSession in DATABASE_ASYNC mode). After a response, each worker deletes
+expired keys at most every IDEMPOTENCY_PURGE_SECONDS, in transactions of
+IDEMPOTENCY_PURGE_BATCH_SIZE rows.
+"""
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from fastapi import BackgroundTasks, Depends, Header, HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from configs.database import get_async_db, get_db
+from configs.settings import settings
+from components.idempotency.models import IdempotencyKey
+from components.users.models import User
+from utils.async_routes import async_dependency
+from utils.auth import get_current_user, get_current_user_async
+
+# Describe the transfer rather than the response; recomputed on replay
+_TRANSFER_HEADERS = {"content-length"}
+_purge_lock = threading.Lock()
+_next_purge = 0.0
+
+
+class Replay(Exception):
+    """Raised to answer a request with the response recorded under its key."""
+
+    def __init__(self, record: IdempotencyKey):
+        self.response = Response(
+            content=record.body,
+            status_code=record.status_code,
+            headers={**record.headers, "Idempotent-Replayed": "true"},
+        )
+
+
+class IdempotentRoute(APIRoute):
+    """Route class of the endpoints that depend on `idempotency_key`."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def run(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except Replay as replay:
+                return replay.response
+
+        return run
+
+
+@dataclass(frozen=True)
+class PendingKey:
+    """An idempotency key whose request has not been answered yet."""
+    user_id: int
+    key: str
+    fingerprint: str
+
+
+async def request_fingerprint(request: Request) -> Optional[str]:
+    if "idempotency-key" not in request.headers:
+        return None
+    return hashlib.sha256(await request.body()).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _lookup(db: Session, pending: PendingKey) -> Optional[IdempotencyKey]:
+    return db.get(IdempotencyKey, (pending.user_id, pending.key))
+
+
+def _expired(record: IdempotencyKey) -> bool:
+    expires_at = record.expires_at
+    if expires_at.tzinfo is None:  # SQLite keeps no time zone
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= _now()
+
+
+def _replay(record: IdempotencyKey, pending: PendingKey) -> None:
+    if record.fingerprint != pending.fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key has already been used for a different request",
+        )
+    raise Replay(record)
+
+
+def _claim(db: Session, pending: PendingKey) -> PendingKey:
+    record = _lookup(db, pending)
+    if record is not None and not _expired(record):
+        _replay(record, pending)
+    if record is not None:
+        # Not purged yet, and in the way of the new record
+        db.delete(record)
+        db.flush()
+    return pending
+
+
+def idempotency_key(
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
+    fingerprint: Optional[str] = Depends(request_fingerprint),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Optional[PendingKey]:
+    """
+    The request's Idempotency-Key, for `save` to record the response under, or
+    None without one. Raises `Replay` if the key already has a response.
+    """
+    if idempotency_key is None:
+        return None
+    if _purge_due():
+        background_tasks.add_task(purge_expired, db.get_bind())
+    return _claim(db, PendingKey(current_user.id, idempotency_key, fingerprint))
+
+
+@async_dependency(idempotency_key)
+async def idempotency_key_async(
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
+    fingerprint: Optional[str] = Depends(request_fingerprint),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> Optional[PendingKey]:
+    """`idempotency_key`, on the async endpoints' AsyncSession."""
+    if idempotency_key is None:
+        return None
+    if _purge_due():
+        background_tasks.add_task(purge_expired_async, db.bind)
+    pending = PendingKey(current_user.id, idempotency_key, fingerprint)
+    return await db.run_sync(lambda session: _claim(session, pending))
+
+
+def save(db: Session, pending: Optional[PendingKey], response: Response) -> None:
+    """Record `response` under `pending`, if any, when the session commits."""
+    if pending is None:
+        return
+    db.add(IdempotencyKey(
+        user_id=pending.user_id,
+        key=pending.key,
+        fingerprint=pending.fingerprint,
+        status_code=response.status_code,
+        headers={name: value for name, value in response.headers.items() if name not in _TRANSFER_HEADERS},
+        body=response.body,
+        expires_at=_now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+    ))
+
+
+def replay_if_saved(db: Session, pending: Optional[PendingKey]) -> None:
+    """
+    After a failed write, raise `Replay` if a concurrent request with the same
+    key has recorded its response meanwhile. The session must be rolled back.
+    """
+    if pending is None:
+        return
+    record = _lookup(db, pending)
+    if record is not None and not _expired(record):
+        _replay(record, pending)
+
+
+def _purge(db: Session) -> int:
+    batch_size = settings.IDEMPOTENCY_PURGE_BATCH_SIZE
+    deleted = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= _now())
+            .order_by(IdempotencyKey.expires_at)
+            .limit(batch_size)
+        )
+        count = db.execute(
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def purge_expired(engine: Engine) -> int:
+    """Delete expired keys, IDEMPOTENCY_PURGE_BATCH_SIZE per transaction; return how many."""
+    with Session(bind=engine) as db:
+        return _purge(db)
+
+
+async def purge_expired_async(engine: AsyncEngine) -> int:
+    """`purge_expired` on an async engine."""
+    async with AsyncSession(bind=engine) as db:
+        return await db.run_sync(_purge)
+
+
+def _purge_due() -> bool:
+    """Whether this worker should purge expired keys now; at most every IDEMPOTENCY_PURGE_SECONDS."""
+    global _next_purge
+    with _purge_lock:
+        now = time.monotonic()
+        if now < _next_purge:
+            return False
+        _next_purge = now + settings.IDEMPOTENCY_PURGE_SECONDS
+        return True
@@ -0,0 +1,23 @@
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, LargeBinary, SmallInteger, String
+
+from configs.database import Base
+
+
+class IdempotencyKey(Base):
+    """The response to a request sent with an Idempotency-Key, replayed to its retries."""
+    __tablename__ = "idempotency_keys"
+
+    # Keys are chosen by clients, so each user has their own
+    user_id = Column(Integer, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # SHA-256 of the request body: a key reused for another request is an error
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(SmallInteger, nullable=False)
+    headers = Column(JSON, nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Expired keys are deleted in batches, oldest first
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", expires_at),
+    )
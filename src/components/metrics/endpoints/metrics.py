@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from components.cars import caches
+from configs import pool
+from components.users.models import User
+from utils.auth import get_current_user
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get("/metrics", status_code=200)
+def get_metrics(
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get runtime statistics of this worker process. Requires authentication.
+
+    - caches: size, limits, hits and misses of each car read cache
+    - pools: connections in use, checkouts, wait time, overflow and
+      invalidations of each database connection pool
+    """
+    return {
+        "caches": caches.stats(),
+        "pools": pool.stats(),
+    }
@@ -1,9 +1,14 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from configs.database import get_db
+from components.users.models import User
 from components.users.schemas import LoginRequest, LoginResponse
-from utils.auth import authenticate_user, create_access_token
+from utils.async_routes import async_variant
+from utils.auth import authenticate_user, authenticate_user_async, create_access_token
 
 router = APIRouter(prefix="/v1")
 
@@ -17,6 +22,16 @@ def login(
     Authenticate user and return a bearer token.
     """
     user = authenticate_user(db, login_data.email, login_data.password)
+    return _login_response(user)
+
+
+@async_variant(login)
+async def login_async(login_data: LoginRequest, db: AsyncSession):
+    user = await authenticate_user_async(db, login_data.email, login_data.password)
+    return _login_response(user)
+
+
+def _login_response(user: Optional[User]) -> LoginResponse:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,15 +1,60 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import URL
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 
+from configs.pool import instrument, pool_options
+from configs.replicas import ReplicaSet, RoutingSession, reads_primary
 from configs.settings import settings
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# The asyncio driver used for each database in DATABASE_ASYNC mode
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> URL:
+    """`url` with its driver swapped for the asyncio one, e.g. postgresql:// -> postgresql+asyncpg://."""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
 try:
-    engine = create_engine(settings.DATABASE_URL)
+    engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL))
+    instrument(engine, "primary")
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    replicas = None
+    if replica_urls:
+        replicas = ReplicaSet([create_engine(url, **pool_options(url)) for url in replica_urls])
+        for number, replica in enumerate(replicas.engines, start=1):
+            instrument(replica, f"replica_{number}")
+    ReadSessionLocal = sessionmaker(class_=RoutingSession, autoflush=False, bind=engine, info={"replicas": replicas})
+
+    # Only created in async mode, so the asyncio drivers stay optional otherwise
+    async_engine = None
+    async_replicas = None
+    if settings.DATABASE_ASYNC:
+        async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL), **pool_options(settings.DATABASE_URL, is_async=True)
+        )
+        instrument(async_engine.sync_engine, "primary_async")
+        if replica_urls:
+            async_replicas = ReplicaSet([
+                create_async_engine(async_database_url(url), **pool_options(url, is_async=True)).sync_engine
+                for url in replica_urls
+            ])
+            for number, replica in enumerate(async_replicas.engines, start=1):
+                instrument(replica, f"replica_{number}_async")
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, sync_session_class=RoutingSession, info={"replicas": async_replicas}
+    )
     Base = declarative_base()
 except SQLAlchemyError as e:
     logger.error(f"Error connecting to the database: {e}")
@@ -24,4 +69,39 @@ def get_db() -> Session:
         logger.error(f"Database error: {e}")
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db(request: Request) -> Session:
+    """A session for read-only endpoints: it reads from a replica when there is one (see configs.replicas)."""
+    db = ReadSessionLocal(info={"primary": reads_primary(request)})
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {e}")
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncSession:
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {e}")
+        raise
+    finally:
+        await db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncSession:
+    """`get_read_db` on the async engines."""
+    db = AsyncReadSessionLocal(info={"primary": reads_primary(request)})
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {e}")
+        raise
+    finally:
+        await db.close()
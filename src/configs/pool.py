@@ -0,0 +1,164 @@
+"""
+Connection pool configuration and statistics.
+
+`pool_options` turns the DATABASE_POOL_* settings into `create_engine`
+arguments; `instrument` then follows an engine's pool through SQLAlchemy pool
+events, and `stats()` reports every instrumented pool for GET /v1/metrics:
+
+- size, checked_out, overflow: connections held by the pool, lent out, and
+  opened beyond `size` right now; overflow_peak is the most ever in use
+- checkouts, connects: connections lent out, and new ones opened, since start
+- waits: checkouts that took over a millisecond, waiting for a connection to
+  be returned or a new one to open; wait_ms_total / wait_ms_max the time
+  all checkouts spent, and timeouts those that gave up after
+  DATABASE_POOL_TIMEOUT_SECONDS
+- invalidations: connections discarded as broken or stale
+
+A steadily climbing wait time or any timeouts mean the pool is exhausted:
+raise DATABASE_POOL_SIZE / DATABASE_MAX_OVERFLOW, within the database's
+max_connections divided by the number of workers.
+"""
+import time
+from threading import Lock
+
+from sqlalchemy import Engine, event, exc, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from configs.settings import settings
+
+# Checkouts faster than this found an idle connection in the pool
+WAIT_THRESHOLD_SECONDS = 0.001
+
+
+class PoolStats:
+    """Counters of one engine's pool, updated by its pool events."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._lock = Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_peak = 0
+
+    def on_checkout(self, *args) -> None:
+        pool = self.engine.pool
+        with self._lock:
+            self.checkouts += 1
+            if isinstance(pool, QueuePool):
+                self.overflow_peak = max(self.overflow_peak, pool.overflow())
+
+    def on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            if seconds >= WAIT_THRESHOLD_SECONDS:
+                self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        queued = isinstance(pool, QueuePool)
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                "size": pool.size() if queued else None,
+                "checked_out": pool.checkedout() if queued else None,
+                "overflow": max(pool.overflow(), 0) if queued else None,
+                "overflow_peak": self.overflow_peak,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "waits": self.waits,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+            }
+
+
+class _TimedCheckout:
+    """Times `Pool.connect()`: how long each checkout waited for a connection."""
+
+    stats = None
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+_stats: dict[str, PoolStats] = {}
+
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    """
+    `create_engine` arguments for the DATABASE_POOL_* settings. In-memory
+    SQLite keeps SQLAlchemy's single-connection pool, which is not sized.
+    """
+    options = {
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    }
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+    )
+    return options
+
+
+def instrument(engine: Engine, name: str) -> PoolStats:
+    """Collect the pool statistics of `engine` (the sync engine of an AsyncEngine) under `name`."""
+    stats = PoolStats(engine)
+    # Pool events registered on the engine also follow the pools that replace it on dispose()
+    event.listen(engine, "checkout", stats.on_checkout)
+    event.listen(engine, "connect", stats.on_connect)
+    event.listen(engine, "invalidate", stats.on_invalidate)
+    event.listen(engine, "soft_invalidate", stats.on_invalidate)
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.stats = stats
+    _stats[name] = stats
+    return stats
+
+
+def stats() -> dict:
+    """Statistics of every instrumented pool, by name."""
+    return {name: pool_stats.snapshot() for name, pool_stats in _stats.items()}
@@ -0,0 +1,159 @@
+"""
+Read replicas.
+
+With DATABASE_REPLICA_URLS set, the read-only endpoints take their session
+from `get_read_db` (see `configs.database`): a `RoutingSession` that runs its
+queries on one replica, picked round-robin among the healthy ones, while
+flushes and INSERT/UPDATE/DELETE statements still go to the primary. The write
+endpoints, the scraper and scripts keep using the primary through `get_db` and
+`SessionLocal`.
+
+A replica is checked with `SELECT 1` when it is picked and its last check is
+older than REPLICA_HEALTH_CHECK_SECONDS. One that fails the check or drops a
+connection is skipped for REPLICA_RETRY_SECONDS. Without a healthy replica,
+reads go to the primary.
+
+Replicas lag the primary, so a client could miss its own write on the next
+read. `ReadYourWritesMiddleware` therefore sets a cookie on every successful
+write request. While the cookie is valid (READ_YOUR_WRITES_SECONDS), that
+client's reads go to the primary. The cookie is signed with SECRET_KEY, and
+a deadline further away than READ_YOUR_WRITES_SECONDS is not honoured, so
+clients cannot pin their reads to the primary.
+"""
+import hashlib
+import hmac
+import time
+from http.cookies import SimpleCookie
+from threading import Lock
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import Engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.datastructures import MutableHeaders
+
+from configs.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReplicaSet:
+    """Round-robin choice among the healthy engines of a set of replicas."""
+
+    def __init__(self, engines: list[Engine]):
+        self.engines = engines
+        self._lock = Lock()
+        self._next = 0
+        self._checked_at: dict[Engine, float] = {}
+        self._down_until: dict[Engine, float] = {}
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def choose(self) -> Optional[Engine]:
+        """The next healthy replica, or None when none is."""
+        with self._lock:
+            start = self._next
+            self._next = (start + 1) % len(self.engines)
+        for offset in range(len(self.engines)):
+            engine = self.engines[(start + offset) % len(self.engines)]
+            if self.is_healthy(engine):
+                return engine
+        return None
+
+    def is_healthy(self, engine: Engine) -> bool:
+        now = time.monotonic()
+        if self._down_until.get(engine, 0) > now:
+            return False
+        if now - self._checked_at.get(engine, float("-inf")) < settings.REPLICA_HEALTH_CHECK_SECONDS:
+            return True
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except SQLAlchemyError as e:
+            if self._down_until.get(engine, 0) <= time.monotonic():  # not already marked by _on_error
+                self.mark_down(engine, e)
+            return False
+        self._checked_at[engine] = now
+        return True
+
+    def mark_down(self, engine: Engine, error: Exception) -> None:
+        logger.warning(f"Replica {engine.url!r} unavailable, retrying in {settings.REPLICA_RETRY_SECONDS}s: {error}")
+        self._down_until[engine] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        self._checked_at.pop(engine, None)
+
+    def _on_error(self, context) -> None:
+        # A lost connection, or none at all, means the replica itself is unavailable
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine, context.original_exception)
+
+
+class RoutingSession(Session):
+    """
+    A session that reads from the replica set in `info["replicas"]`, unless
+    `info["primary"]` is set. Once it writes, it stays on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replicas = self.info.get("replicas")
+        if replicas is not None and not self.info.get("primary"):
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info["primary"] = True
+            else:
+                # One replica per session, so its reads see a single snapshot
+                if "replica" not in self.info:
+                    self.info["replica"] = replicas.choose()
+                if self.info["replica"] is not None:
+                    return self.info["replica"]
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def _signature(deadline: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), deadline.encode(), hashlib.sha256).hexdigest()
+
+
+def read_primary_cookie(deadline: float) -> str:
+    """The read-your-writes cookie value for a window ending at `deadline`."""
+    value = f"{deadline:.3f}"
+    return f"{value}:{_signature(value)}"
+
+
+def reads_primary(request: Request) -> bool:
+    """Whether `request` comes from a client within its read-your-writes window."""
+    value, _, signature = request.cookies.get(READ_PRIMARY_COOKIE, "").partition(":")
+    if not hmac.compare_digest(signature, _signature(value)):
+        return False
+    try:
+        deadline = float(value)
+    except ValueError:
+        return False
+    now = time.time()
+    return now < deadline <= now + settings.READ_YOUR_WRITES_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """Set the read-your-writes cookie on successful responses to write requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[READ_PRIMARY_COOKIE] = read_primary_cookie(time.time() + settings.READ_YOUR_WRITES_SECONDS)
+                cookie[READ_PRIMARY_COOKIE].update(
+                    {"max-age": str(int(settings.READ_YOUR_WRITES_SECONDS) + 1), "path": "/", "httponly": True, "samesite": "Lax"}
+                )
+                MutableHeaders(scope=message).append("set-cookie", cookie.output(header="").strip())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
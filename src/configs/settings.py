@@ -1,11 +1,44 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = Field("postgresql://localhost/snorlax")
+    DATABASE_ASYNC: bool = Field(False, description="Serve database endpoints from async handlers on an asyncio engine (asyncpg on PostgreSQL, aiosqlite on SQLite)")
+    DATABASE_REPLICA_URLS: str = Field("", description="Comma-separated URLs of read replicas for the read-only endpoints. Empty reads from DATABASE_URL")
+    REPLICA_HEALTH_CHECK_SECONDS: float = Field(5, description="How often a replica in use is checked with SELECT 1")
+    REPLICA_RETRY_SECONDS: float = Field(30, description="How long an unavailable replica is skipped before it is checked again")
+    READ_YOUR_WRITES_SECONDS: float = Field(5, description="How long a client's reads go to the primary after a write, covering replication lag")
+    DATABASE_POOL_SIZE: int = Field(5, description="Connections each worker keeps open to the database")
+    DATABASE_MAX_OVERFLOW: int = Field(10, description="Connections opened beyond DATABASE_POOL_SIZE under load, closed when returned")
+    DATABASE_POOL_TIMEOUT_SECONDS: float = Field(30, description="How long a request waits for a free connection before failing")
+    DATABASE_POOL_RECYCLE_SECONDS: int = Field(-1, description="Replace connections older than this, e.g. below a proxy's idle timeout. -1 never recycles")
+    DATABASE_POOL_PRE_PING: bool = Field(False, description="Test each connection with a ping on checkout, replacing it if it was dropped")
     SECRET_KEY: str = Field("your-secret-key-change-this-in-production", description="Secret key for JWT token signing")
     CORS_ORIGINS: str = Field("*", description="Comma-separated list of allowed origins for CORS")
+    TOTAL_CACHE_SIZE: int = Field(1024, description="Maximum number of cached list totals, one per filter combination")
+    TOTAL_CACHE_TTL_SECONDS: float = Field(60, description="Lifetime of a cached list total, bounding staleness across workers. 0 disables the cache")
+    PUBLIC_CACHE_SIZE: int = Field(512, description="Maximum number of cached GET /v1/cars/public responses. 0 disables the cache")
+    PUBLIC_CACHE_TTL_SECONDS: float = Field(30, description="Lifetime of a cached GET /v1/cars/public or /v1/cars/public/facets response. 0 disables the caches")
+    FACETS_CACHE_SIZE: int = Field(256, description="Maximum number of cached GET /v1/cars/public/facets responses. 0 disables the cache")
+    CAR_CACHE_SIZE: int = Field(4096, description="Maximum number of cars cached by id for the detail and batch endpoints. 0 disables the cache")
+    CAR_CACHE_TTL_SECONDS: float = Field(60, description="Lifetime of a cached car, bounding staleness after writes made by other workers. 0 disables the cache")
+    CAR_BATCH_MAX_IDS: int = Field(300, description="Maximum number of ids accepted by GET /v1/cars/public/batch")
+    CAR_BULK_MAX_ITEMS: int = Field(5000, description="Maximum number of cars accepted by POST /v1/cars/bulk")
+    CAR_BULK_CHUNK_SIZE: int = Field(500, description="Cars inserted and committed together by POST /v1/cars/bulk")
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = Field(86400, description="How long the response to a POST /v1/cars with an Idempotency-Key is replayed to retries")
+    IDEMPOTENCY_PURGE_SECONDS: float = Field(60, description="How often each worker deletes expired idempotency keys, after answering a request with a key")
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = Field(1000, description="Expired idempotency keys deleted per statement and transaction")
+    PUBLIC_CACHE_CONTROL: str = Field("public, max-age=10, stale-while-revalidate=60", description="Cache-Control header sent with public car responses")
+    PUBLIC_LIST_ENGINE: str = Field("database", description="What answers GET /v1/cars/public without q: 'database', or 'memory' for a columnar in-memory snapshot per worker (requires numpy)")
+    SNAPSHOT_RECONCILE_SECONDS: float = Field(300, description="How often the in-memory snapshot is fully reloaded, from SNAPSHOT_FILE if set, else from the database")
+    SNAPSHOT_FILE: str = Field("", description="Snapshot file written by write_snapshot.py that workers memory-map instead of loading the in-memory snapshot from the database")
+    LIST_COUNT_STRATEGY: Literal["query", "window"] = Field("query", description="How the public listing computes an uncached total: 'query' runs a separate count, 'window' uses COUNT(*) OVER () in the page query")
+    SEARCH_TRIGRAM: bool = Field(False, description="On PostgreSQL, let q also match car names by pg_trgm similarity, for typos. Requires the pg_trgm extension")
+    EXPORT_BATCH_SIZE: int = Field(1000, description="Rows fetched from the database cursor at a time by GET /v1/cars/export")
+    COUNT_ESTIMATE_THRESHOLD: int = Field(0, description="On PostgreSQL, return the planner's row estimate as total when it is at least this large. 0 disables estimates")
 
     model_config = SettingsConfigDict(
         env_file=".env",
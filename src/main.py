@@ -2,19 +2,35 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from configs.database import Base, engine
+from configs.database import Base, engine, replica_urls
+from configs.replicas import ReadYourWritesMiddleware
 from configs.settings import settings
+from components.cars import snapshot
+from components.cars.endpoints.batch_public import router as cars_batch_public_router
+from components.cars.endpoints.bulk_create import router as cars_bulk_create_router
 from components.cars.endpoints.create import router as cars_create_router
+from components.cars.endpoints.detail import router as cars_detail_router
+from components.cars.endpoints.detail_public import router as cars_detail_public_router
+from components.cars.endpoints.export import router as cars_export_router
+from components.cars.endpoints.facets import router as cars_facets_router
 from components.cars.endpoints.list import router as cars_list_router
 from components.cars.endpoints.list_public import router as cars_public_router
 from components.cars.endpoints.update import router as cars_update_router
+from components.cars.endpoints.upsert import router as cars_upsert_router
 from components.cars.models import Car  # Import to register the model
+from components.idempotency.models import IdempotencyKey  # Import to register the model
+from components.metrics.endpoints.metrics import router as metrics_router
 from components.users.endpoints.auth import router as auth_router
 from components.users.models import User  # Import to register the model
+from utils.async_routes import async_router
 
 # create tickets db
 Base.metadata.create_all(bind=engine)
 
+if settings.PUBLIC_LIST_ENGINE == "memory" and settings.SNAPSHOT_FILE:
+    # Start warm: map the snapshot file shared by all workers, caught up on the first request
+    snapshot.cars.open_file(settings.SNAPSHOT_FILE)
+
 app = FastAPI(title="ticket system api",
               description="Rest api for create, query and process tickets.",
               version="0.1.0",
@@ -31,12 +47,31 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allows all headers
 )
+if replica_urls:
+    # After a write, send the client's reads to the primary until replicas caught up
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Routers of the endpoints that use the database
+database_routers = [
+    cars_list_router,
+    cars_public_router,
+    cars_facets_router,
+    cars_batch_public_router,
+    cars_detail_public_router,
+    cars_detail_router,
+    cars_create_router,
+    cars_bulk_create_router,
+    cars_export_router,
+    cars_upsert_router,  # before cars_update_router, whose /cars/{car_id} also matches its paths
+    cars_update_router,
+    auth_router,
+]
+if settings.DATABASE_ASYNC:
+    database_routers = [async_router(router) for router in database_routers]
 
-app.include_router(cars_list_router)
-app.include_router(cars_public_router)
-app.include_router(cars_create_router)
-app.include_router(cars_update_router)
-app.include_router(auth_router)
+for router in database_routers:
+    app.include_router(router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
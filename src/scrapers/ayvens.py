@@ -11,7 +11,9 @@ import nest_asyncio
 sys.path.append(str(Path(__file__).parent.parent))
 
 from configs.database import SessionLocal
+from components.cars.bulk import upsert_car
 from components.cars.models import Car
+from components.cars.schemas import CarCreate
 
 nest_asyncio.apply()
 
@@ -31,8 +33,7 @@ class AyvensScraper:
         self.browser = pw.chromium.launch(headless=False)
         self.page = self.browser.new_page()
         self.db = SessionLocal()
-        self.created_count = 0
-        self.updated_count = 0
+        self.saved_count = 0
         self.skipped_count = 0
 
     def scrape(self):
@@ -53,8 +54,7 @@ class AyvensScraper:
             print("\n" + "=" * 50)
             print("Scraping Summary")
             print("=" * 50)
-            print(f"✓ Cars created: {self.created_count}")
-            print(f"🔄 Cars updated: {self.updated_count}")
+            print(f"✓ Cars created or updated: {self.saved_count}")
             print(f"⊘ Cars skipped: {self.skipped_count}")
             print(f"Total processed: {len(links)}")
             print("=" * 50)
@@ -120,61 +120,28 @@ class AyvensScraper:
         price = Decimal(price_str) if price_str else None
         mileage = self.__parse_mileage(mileage_str)
 
-        # Check if car already exists by registration number
-        existing_car = self.db.query(Car).filter(Car.registration_number == license_plate).first()
-
-        if existing_car:
-            # Update existing car with latest data
-            existing_car.name = name
-            existing_car.brand = self.__to_english(make)
-            existing_car.model = self.__to_english(model)
-            existing_car.make = make
-            existing_car.fuel_type = self.__to_english(fuel_type)
-            existing_car.color = self.__to_english(color)
-            existing_car.year = year or 2024
-            existing_car.price = price
-            existing_car.registered_date = registered_date
-            existing_car.registered_year = year
-            existing_car.mileage = mileage
-            existing_car.wheel_drive = self.__to_english(wheel_drive)
-            existing_car.variant = description
-            existing_car.source = "ayvens"
-            existing_car.external_link = car_url
-            existing_car.display_image_url = display_image_url
-
-            self.db.commit()
-            self.db.refresh(existing_car)
-
-            print(f"  🔄 Updated: {name} ({license_plate})")
-            self.updated_count += 1
-        else:
-            # Create new car in database
-            car = Car(
-                name=name,
-                brand=self.__to_english(make),
-                model=self.__to_english(model),
-                make=make,  # Using brand as make
-                fuel_type=self.__to_english(fuel_type),
-                color=self.__to_english(color),
-                year=year or 2024,  # Default to current year if not found
-                price=price,
-                registered_date=registered_date,
-                registered_year=year,
-                mileage=mileage,
-                wheel_drive=self.__to_english(wheel_drive),
-                registration_number=license_plate,
-                variant=description,
-                source="ayvens",
-                external_link=car_url,
-                display_image_url=display_image_url
-            )
-
-            self.db.add(car)
-            self.db.commit()
-            self.db.refresh(car)
-
-            print(f"  ✓ Created: {name} ({license_plate})")
-            self.created_count += 1
+        # Create the car, or update it with the latest data, in one statement
+        upsert_car(self.db, license_plate, CarCreate(
+            name=name,
+            brand=make,
+            model=model,
+            make=make,  # Using brand as make
+            fuel_type=fuel_type,
+            color=color,
+            year=year or 2024,  # Default to current year if not found
+            price=price,
+            registered_date=registered_date,
+            registered_year=year,
+            mileage=mileage,
+            wheel_drive=wheel_drive,
+            variant=description,
+            source="ayvens",
+            external_link=car_url,
+            display_image_url=display_image_url,
+        ))
+
+        print(f"  ✓ Saved: {name} ({license_plate})")
+        self.saved_count += 1
 
     def __extract_year(self, date_string):
         """Extract year from date string."""
@@ -193,28 +160,6 @@ class AyvensScraper:
         except ValueError:
             return None
 
-    def __to_english(self, text):
-        mapping = {
-            'elektrisk': 'electric',
-            'diesel': 'diesel',
-            'bensin': 'petrol',
-            'hybrid': 'hybrid',
-            'petrol': 'petrol',
-            'bensin': 'bensin',
-            'vit': 'white',
-            'svart': 'black',
-            'grå': 'grey',
-            'röd': 'red',
-            'blå': 'blue',
-            'gul': 'yellow',
-            'grön': 'green',
-            'brun': 'brown',
-            'orange': 'orange',
-            'bakhjulsdrift': 'rear wheel drive',
-        }
-
-        return mapping.get(text, text)
-
 
 if __name__ == "__main__":
     scraper = AyvensScraper()
@@ -0,0 +1,112 @@
+"""
+Async versions of the database endpoints, served in DATABASE_ASYNC mode.
+
+Endpoints are written once, against a sync `Session`. `async_router` copies a
+router with each endpoint replaced by a coroutine that runs it through
+`AsyncSession.run_sync`: SQLAlchemy drives the unchanged sync code in a
+greenlet and suspends it at every database round trip, so a request waiting
+on the database no longer holds one of the threadpool's worker threads and
+the event loop serves other requests meanwhile.
+
+Endpoints that must not run that way (blocking CPU work such as password
+hashing, or a response streamed after the session is gone) register a
+hand-written async version with `async_variant`. Dependencies that use the
+database register theirs with `async_dependency`, so that they share the
+endpoint's AsyncSession instead of opening a sync one.
+"""
+import functools
+import inspect
+from typing import Callable
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.database import get_async_db, get_async_read_db, get_db, get_read_db
+from utils.auth import get_current_user, get_current_user_async
+
+# Dependencies of the sync endpoints and their async counterparts
+ASYNC_DEPENDENCIES: dict[Callable, Callable] = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+    get_current_user: get_current_user_async,
+}
+
+_variants: dict[Callable, Callable] = {}
+
+
+def async_variant(endpoint: Callable) -> Callable:
+    """
+    Register the decorated coroutine as the async version of `endpoint`. It is
+    called with the endpoint's arguments, `db` being an AsyncSession.
+    """
+    def register(variant: Callable) -> Callable:
+        _variants[endpoint] = variant
+        return variant
+    return register
+
+
+def async_dependency(dependency: Callable) -> Callable:
+    """
+    Register the decorated coroutine as the async version of the dependency
+    `dependency`, used in its place by the async endpoints.
+    """
+    def register(variant: Callable) -> Callable:
+        ASYNC_DEPENDENCIES[dependency] = variant
+        return variant
+    return register
+
+
+def _run_sync(endpoint: Callable) -> Callable:
+    async def run(db: AsyncSession, **kwargs):
+        return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+    return run
+
+
+def async_endpoint(endpoint: Callable) -> Callable:
+    """An async endpoint taking the same parameters as the sync `endpoint`."""
+    variant = _variants.get(endpoint) or _run_sync(endpoint)
+
+    @functools.wraps(endpoint)
+    async def run(**kwargs):
+        return await variant(**kwargs)
+
+    # FastAPI reads the parameters from the signature: the sync endpoint's, with async dependencies
+    signature = inspect.signature(endpoint)
+    parameters = []
+    for parameter in signature.parameters.values():
+        dependency = getattr(parameter.default, "dependency", None)
+        if dependency in ASYNC_DEPENDENCIES:
+            parameter = parameter.replace(default=Depends(ASYNC_DEPENDENCIES[dependency]))
+        parameters.append(parameter)
+    run.__signature__ = signature.replace(parameters=parameters)
+    return run
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """A copy of `router` whose endpoints are the async versions of its endpoints."""
+    converted = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            converted.routes.append(route)
+            continue
+        converted.add_api_route(
+            route.path,
+            async_endpoint(route.endpoint),
+            methods=route.methods,
+            status_code=route.status_code,
+            response_model=route.response_model,
+            response_class=route.response_class,
+            responses=route.responses,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            tags=route.tags,
+            deprecated=route.deprecated,
+            operation_id=route.operation_id,
+            include_in_schema=route.include_in_schema,
+            name=route.name,
+            route_class_override=type(route),
+        )
+    return converted
@@ -2,13 +2,16 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from components.users.models import User
-from configs.database import get_db
+from configs.database import get_async_read_db, get_read_db
 from configs.settings import settings
 
 # Password hashing context
@@ -42,6 +45,19 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Authenticate a user by email and password, hashing off the event loop."""
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if not user:
+        return None
+    # bcrypt is deliberately slow: verifying on the loop would stall every other request
+    if not await run_in_threadpool(verify_password, password, user.password):
+        return None
+    if not user.is_active:
+        return None
+    return user
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -58,29 +74,30 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get the current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _token_email(credentials: HTTPAuthorizationCredentials) -> str:
+    """The email the bearer token was issued to."""
     try:
         token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return email
 
-    user = db.query(User).filter(User.email == email).first()
+
+def _check_user(user: Optional[User]) -> User:
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
         raise HTTPException(
@@ -90,3 +107,22 @@ def get_current_user(
 
     return user
 
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_read_db),
+) -> User:
+    """Get the current authenticated user from JWT token."""
+    email = _token_email(credentials)
+    user = db.query(User).filter(User.email == email).first()
+    return _check_user(user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> User:
+    """Get the current authenticated user from JWT token, on the async session."""
+    email = _token_email(credentials)
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    return _check_user(user)
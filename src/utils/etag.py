@@ -0,0 +1,43 @@
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from values that fully determine a response body."""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def version_etag(version: int) -> str:
+    """Build a strong ETag for a resource whose every change bumps `version`."""
+    return f'"{version}"'
+
+
+def if_match_versions(header: Optional[str]) -> Optional[set[int]]:
+    """
+    The versions an If-Match header value accepts, given ETags from
+    `version_etag`; None if it accepts any (absent, or `*`). Weak and foreign
+    ETags never match.
+    """
+    if not header:
+        return None
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return None
+    return {
+        int(candidate[1:-1]) for candidate in candidates
+        if len(candidate) > 2 and candidate[0] == candidate[-1] == '"' and candidate[1:-1].isdigit()
+    }
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    Whether an If-None-Match (weak comparison) or If-Match (`weak=False`)
+    header value matches `etag`.
+    """
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates or etag in candidates:
+        return True
+    return weak and f"W/{etag}" in candidates
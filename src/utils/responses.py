@@ -0,0 +1,37 @@
+import json
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Pydantic serializes Decimal as a string; keep responses byte-identical
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize plain JSON data to compact UTF-8 bytes, as pydantic's
+    `model_dump_json` would. Uses orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for content that is already plain data, e.g. rows read
+    from the database. Skips `jsonable_encoder` and renders with `dumps`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -4,20 +4,32 @@ from pathlib import Path
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Add src directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from configs.database import Base, get_db
+from configs.database import Base, async_database_url, get_async_db, get_async_read_db, get_db, get_read_db
+from components.cars import caches, inventory, snapshot
+from components.cars.endpoints.batch_public import router as cars_batch_public_router
+from components.cars.endpoints.bulk_create import router as cars_bulk_create_router
 from components.cars.endpoints.create import router as cars_create_router
+from components.cars.endpoints.detail import router as cars_detail_router
+from components.cars.endpoints.detail_public import router as cars_detail_public_router
+from components.cars.endpoints.export import router as cars_export_router
+from components.cars.endpoints.facets import router as cars_facets_router
 from components.cars.endpoints.list import router as cars_list_router
 from components.cars.endpoints.list_public import router as cars_list_public_router
 from components.cars.endpoints.update import router as cars_update_router
+from components.cars.endpoints.upsert import router as cars_upsert_router
 from components.cars.models import Car
+from components.metrics.endpoints.metrics import router as metrics_router
 from components.users.endpoints.auth import router as auth_router
 from components.users.models import User
+from utils.async_routes import async_router
 from utils.auth import create_access_token, get_password_hash
 
 # Create an in-memory SQLite database for testing
@@ -27,16 +39,44 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The same database through aiosqlite, for DATABASE_ASYNC mode. No pooling:
+# each TestClient runs its own event loop, which a pooled connection would outlive.
+async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+
+DATABASE_ROUTERS = [
+    cars_list_router,
+    cars_list_public_router,
+    cars_facets_router,
+    cars_batch_public_router,
+    cars_detail_public_router,
+    cars_detail_router,
+    cars_create_router,
+    cars_bulk_create_router,
+    cars_export_router,
+    cars_upsert_router,  # before cars_update_router, whose /cars/{car_id} also matches its paths
+    cars_update_router,
+    auth_router,
+]
+
 
 @pytest.fixture(scope="function")
 def app():
     """Create FastAPI app for testing."""
     app = FastAPI()
-    app.include_router(cars_list_router)
-    app.include_router(cars_list_public_router)
-    app.include_router(cars_create_router)
-    app.include_router(cars_update_router)
-    app.include_router(auth_router)
+    for router in DATABASE_ROUTERS:
+        app.include_router(router)
+    app.include_router(metrics_router)
+    return app
+
+
+@pytest.fixture(scope="function")
+def async_app():
+    """Create FastAPI app for testing, with the async endpoints of DATABASE_ASYNC mode."""
+    app = FastAPI()
+    for router in DATABASE_ROUTERS:
+        app.include_router(async_router(router))
+    app.include_router(metrics_router)
     return app
 
 
@@ -44,6 +84,10 @@ def app():
 def db_session():
     """Create a fresh database for each test."""
     Base.metadata.create_all(bind=engine)
+    # A new database is a new inventory: drop anything cached for the previous one
+    inventory.bump_version()
+    caches.clear()
+    snapshot.cars.clear()
     db = TestingSessionLocal()
     try:
         yield db
@@ -62,11 +106,44 @@ def client(app, db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def async_client(async_app, db_session):
+    """Create a test client for the async app, its sessions on the aiosqlite engine."""
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    def override_get_db():
+        yield db_session
+
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.dependency_overrides[get_async_read_db] = override_get_async_db
+    async_app.dependency_overrides[get_db] = override_get_db
+    async_app.dependency_overrides[get_read_db] = override_get_db
+    with TestClient(async_app) as test_client:
+        yield test_client
+    async_app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def sql_statements():
+    """Record the SQL statements sent to the test database."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
 @pytest.fixture
 def sample_cars(db_session):
     """Create sample car data for testing."""
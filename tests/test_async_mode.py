@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+from fastapi import status
+from fastapi.routing import APIRoute
+
+from configs.database import async_database_url
+
+
+class TestAsyncDatabaseUrl:
+    """Test suite for the driver swap of DATABASE_ASYNC mode."""
+
+    def test_postgresql_uses_asyncpg(self):
+        """Test that PostgreSQL URLs, with or without a driver, switch to asyncpg."""
+        assert async_database_url("postgresql://user:secret@db/cars").render_as_string(hide_password=False) == (
+            "postgresql+asyncpg://user:secret@db/cars"
+        )
+        assert async_database_url("postgresql+psycopg2://db/cars").drivername == "postgresql+asyncpg"
+
+    def test_sqlite_uses_aiosqlite(self):
+        """Test that SQLite URLs switch to aiosqlite."""
+        assert str(async_database_url("sqlite:///./test.db")) == "sqlite+aiosqlite:///./test.db"
+
+
+class TestAsyncEndpoints:
+    """Test suite for the async endpoints served in DATABASE_ASYNC mode."""
+
+    def test_endpoints_are_coroutines(self, async_app):
+        """Test that every database endpoint of the async app is async."""
+        endpoints = [route.endpoint for route in async_app.routes if isinstance(route, APIRoute)]
+        database_endpoints = [endpoint for endpoint in endpoints if endpoint.__name__ != "get_metrics"]
+        assert database_endpoints
+        assert all(asyncio.iscoroutinefunction(endpoint) for endpoint in database_endpoints)
+
+    def test_openapi_matches_sync_app(self, app, async_app):
+        """Test that the async app documents exactly the same API."""
+        assert async_app.openapi() == app.openapi()
+
+    def test_public_list_matches_sync(self, client, async_client, sample_cars):
+        """Test that the public listing returns the same page in both modes."""
+        url = "/v1/cars/public?limit=5&min_price=25000&sort_by=price&sort_order=desc"
+        sync_response = client.get(url)
+        async_response = async_client.get(url)
+
+        assert async_response.status_code == status.HTTP_200_OK
+        assert async_response.json() == sync_response.json()
+
+    def test_list_requires_authentication(self, async_client):
+        """Test that the async listing still requires a valid token."""
+        assert async_client.get("/v1/cars").status_code == status.HTTP_403_FORBIDDEN
+        response = async_client.get("/v1/cars", headers={"Authorization": "Bearer invalid"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_inactive_user_is_rejected(self, async_client, inactive_user):
+        """Test that the async user lookup rejects inactive users."""
+        from utils.auth import create_access_token
+
+        token = create_access_token(data={"sub": inactive_user.email, "user_id": inactive_user.id})
+        response = async_client.get("/v1/cars", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "Inactive user"
+
+    def test_list(self, async_client, sample_cars, auth_token):
+        """Test the authenticated listing."""
+        response = async_client.get("/v1/cars?limit=3", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 20
+        assert len(data["items"]) == 3
+
+    def test_create_and_update_invalidate_public_list(self, async_client, sample_cars, auth_token):
+        """Test that writes through the async session bump the inventory version like sync ones."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        assert async_client.get("/v1/cars/public?limit=1").json()["total"] == 20
+
+        car = {
+            "name": "Async Car",
+            "brand": "Kia",
+            "model": "EV6",
+            "make": "Kia",
+            "fuel_type": "Electric",
+            "color": "White",
+            "year": 2024,
+        }
+        response = async_client.post("/v1/cars", json=car, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        car_id = response.json()["id"]
+        assert async_client.get("/v1/cars/public?limit=1").json()["total"] == 21
+
+        response = async_client.put(f"/v1/cars/{car_id}", json={"price": 12345}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["price"] == "12345.00"
+        assert async_client.get(f"/v1/cars/public/{car_id}").json()["price"] == "12345.00"
+
+    def test_update_missing_car(self, async_client, auth_token):
+        """Test that errors raised by the sync endpoint body reach the client."""
+        response = async_client.put(
+            "/v1/cars/99999", json={"price": 1}, headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_login(self, async_client, test_user):
+        """Test that the async login issues a token the async endpoints accept."""
+        response = async_client.post("/v1/login", json={"email": test_user.email, "password": "testpassword123"})
+
+        assert response.status_code == status.HTTP_200_OK
+        token = response.json()["access_token"]
+        assert async_client.get("/v1/cars", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    def test_login_wrong_password(self, async_client, test_user):
+        """Test that the async login rejects a wrong password."""
+        response = async_client.post("/v1/login", json={"email": test_user.email, "password": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_export_streams_from_async_engine(self, async_client, sample_cars, auth_token, monkeypatch):
+        """Test that the export streams every car in batches from the async engine."""
+        from configs.settings import settings
+
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 7)
+        response = async_client.get("/v1/cars/export", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        cars = [json.loads(line) for line in response.text.splitlines()]
+        assert [car["id"] for car in cars] == sorted(car.id for car in sample_cars)
+
+        response = async_client.get("/v1/cars/export?format=csv", headers={"Authorization": f"Bearer {auth_token}"})
+        assert len(response.text.splitlines()) == 21
@@ -0,0 +1,48 @@
+import time
+
+from utils.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test suite for the LRU cache behind the car caches."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the entry used longest ago is evicted beyond maxsize."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert "b" not in cache
+        assert cache.get("c") == 3
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """Test that an entry is gone once its TTL has passed."""
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache = LRUCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 9.9)
+        assert cache.get("a") == 1
+        monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+        assert cache.get("a") is None
+
+    def test_zero_ttl_keeps_nothing(self):
+        """Test that a TTL of 0 expires entries at once rather than never."""
+        cache = LRUCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+
+        assert "a" not in cache
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_no_ttl_never_expires(self, monkeypatch):
+        """Test that entries without a TTL are kept until evicted."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+
+        assert cache.get("a") == 1
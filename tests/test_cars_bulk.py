@@ -0,0 +1,108 @@
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+
+from configs.settings import settings
+from components.cars import bulk, inventory
+from components.cars.models import Car
+
+
+def new_car(i: int, **values) -> dict:
+    return {
+        "name": f"Imported {i}", "brand": "volvo", "model": "XC40", "make": "Volvo",
+        "fuel_type": "el", "color": "Blue", "year": 2022, "price": 30000 + i,
+        "registered_date": "2022-05-01", "registration_number": f"IMP-{i:04d}", **values,
+    }
+
+
+@pytest.fixture
+def headers(auth_token):
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
+class TestCarsBulkCreateEndpoint:
+    """Test suite for the POST /v1/cars/bulk endpoint."""
+
+    def test_bulk_create(self, client, headers, db_session):
+        """Test that every car is created, normalized like single creates, and listed."""
+        response = client.post("/v1/cars/bulk", json={"items": [new_car(i) for i in range(3)]}, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["created"] == 3 and data["failed"] == 0
+        assert [item["index"] for item in data["items"]] == [0, 1, 2]
+        assert all(item["error"] is None for item in data["items"])
+
+        car = db_session.get(Car, data["items"][1]["id"])
+        assert car.name == "Imported 1"
+        assert (car.brand, car.fuel_type) == ("Volvo", "Electric")
+        assert car.registered_on.isoformat() == "2022-05-01"
+        assert client.get("/v1/cars/public").json()["total"] == 3
+
+    def test_duplicates_are_reported_per_item(self, client, headers, db_session):
+        """Test that taken registration numbers fail their item only."""
+        client.post("/v1/cars", json=new_car(1), headers=headers)
+        items = [new_car(0), new_car(1), new_car(2), new_car(3, registration_number="IMP-0002"), new_car(4, registration_number=None)]
+
+        data = client.post("/v1/cars/bulk", json={"items": items}, headers=headers).json()
+
+        assert data["created"] == 3 and data["failed"] == 2
+        errors = {item["index"]: item["error"] for item in data["items"] if item["error"]}
+        assert errors == {
+            1: "registration_number 'IMP-0001' already exists",
+            3: "registration_number 'IMP-0002' already exists",
+        }
+        assert db_session.scalar(select(func.count()).select_from(Car)) == 4
+
+    def test_chunks_commit_separately(self, client, headers, db_session, monkeypatch):
+        """Test that each chunk is its own transaction, bumping the inventory version."""
+        monkeypatch.setattr(settings, "CAR_BULK_CHUNK_SIZE", 2)
+        before = inventory.read_version(db_session)
+
+        data = client.post("/v1/cars/bulk", json={"items": [new_car(i) for i in range(5)]}, headers=headers).json()
+
+        assert data["created"] == 5
+        assert inventory.read_version(db_session) == before + 3
+        stamped = db_session.scalars(select(Car.inventory_version).order_by(Car.id)).all()
+        assert stamped == [before + 1, before + 1, before + 2, before + 2, before + 3]
+
+    def test_concurrent_conflict_retries_item_by_item(self, client, headers, db_session, monkeypatch):
+        """Test that a conflict the pre-check missed fails only the conflicting car."""
+        client.post("/v1/cars", json=new_car(1), headers=headers)
+        # As if IMP-0001 had been inserted by another request after the check
+        monkeypatch.setattr(bulk, "_taken_registration_numbers", lambda db, rows: set())
+
+        data = client.post("/v1/cars/bulk", json={"items": [new_car(i) for i in range(3)]}, headers=headers).json()
+
+        assert data["created"] == 2
+        assert [item["error"] is not None for item in data["items"]] == [False, True, False]
+        assert db_session.scalar(select(func.count()).select_from(Car)) == 3
+
+    def test_no_round_trips_per_car(self, client, headers, sql_statements):
+        """Test that a chunk is inserted by one executemany, without re-reading each car."""
+        client.post("/v1/cars/bulk", json={"items": [new_car(i) for i in range(50)]}, headers=headers)
+
+        inserts = {sql for sql in sql_statements if sql.startswith("INSERT INTO cars ")}
+        reads = [sql for sql in sql_statements if sql.startswith("SELECT") and "FROM cars " in sql]
+        assert len(inserts) == 1
+        assert len(reads) == 1  # the registration_number check
+
+    def test_too_many_items(self, client, headers, monkeypatch):
+        """Test that batches over CAR_BULK_MAX_ITEMS are rejected."""
+        monkeypatch.setattr(settings, "CAR_BULK_MAX_ITEMS", 2)
+
+        response = client.post("/v1/cars/bulk", json={"items": [new_car(i) for i in range(3)]}, headers=headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_item_rejects_request(self, client, headers):
+        """Test that a malformed car is a validation error, as for single creates."""
+        response = client.post("/v1/cars/bulk", json={"items": [new_car(0), {"name": "Incomplete"}]}, headers=headers)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_requires_authentication(self, client):
+        """Test that bulk creation requires authentication."""
+        response = client.post("/v1/cars/bulk", json={"items": [new_car(0)]})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -31,7 +31,7 @@ class TestCarsCreateEndpoint:
         assert data["brand"] == car_data["brand"]
         assert data["model"] == car_data["model"]
         assert data["make"] == car_data["make"]
-        assert data["fuel_type"] == car_data["fuel_type"]
+        assert data["fuel_type"] == "Petrol"  # Gasoline is stored under its canonical name
         assert data["color"] == car_data["color"]
         assert data["year"] == car_data["year"]
 
@@ -241,9 +241,15 @@ class TestCarsCreateEndpoint:
 
     def test_create_car_all_fuel_types(self, client, auth_token):
         """Test creating cars with different fuel types."""
-        fuel_types = ["Gasoline", "Diesel", "Electric", "Hybrid", "Plug-in Hybrid"]
+        fuel_types = {
+            "Gasoline": "Petrol",
+            "Diesel": "Diesel",
+            "Electric": "Electric",
+            "Hybrid": "Hybrid",
+            "Plug-in Hybrid": "Plug-in Hybrid",
+        }
 
-        for fuel_type in fuel_types:
+        for fuel_type, canonical_fuel_type in fuel_types.items():
             car_data = {
                 "name": f"Test Car {fuel_type}",
                 "brand": "Test Brand",
@@ -261,7 +267,7 @@ class TestCarsCreateEndpoint:
             )
 
             assert response.status_code == status.HTTP_201_CREATED
-            assert response.json()["fuel_type"] == fuel_type
+            assert response.json()["fuel_type"] == canonical_fuel_type
 
     def test_create_car_response_structure(self, client, auth_token):
         """Test that the response structure matches CarResponse schema."""
@@ -327,3 +333,29 @@ class TestCarsCreateEndpoint:
         )
         assert response.status_code == status.HTTP_201_CREATED
 
+    def test_create_car_normalizes_categoricals(self, client, auth_token):
+        """Test that categorical fields are stored under their canonical spelling."""
+        car_data = {
+            "name": "Tesla Model Y",
+            "brand": "tesla",
+            "model": "Model Y",
+            "make": "tesla",
+            "fuel_type": "elektrisk",
+            "color": " grå ",
+            "year": 2023,
+            "wheel_drive": "rear wheel drive",
+        }
+
+        response = client.post(
+            "/v1/cars",
+            json=car_data,
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["brand"] == "Tesla"
+        assert data["fuel_type"] == "Electric"
+        assert data["color"] == "Gray"
+        assert data["wheel_drive"] == "RWD"
+        assert data["make"] == "tesla"
@@ -0,0 +1,163 @@
+from fastapi import status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from components.cars import caches
+from components.cars.models import Car
+from components.cars.schemas import CarPublicResponse, CarResponse
+from configs.settings import settings
+
+
+def car_queries(sql_statements) -> list:
+    return [sql for sql in sql_statements if "FROM cars" in sql and "cars_version" not in sql]
+
+
+class TestCarDetailEndpoints:
+    """Test suite for GET /v1/cars/public/{car_id} and GET /v1/cars/{car_id}."""
+
+    def test_get_car_public(self, client, sample_cars):
+        """Test getting a car's public fields."""
+        car = sample_cars[4]
+        response = client.get(f"/v1/cars/public/{car.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert list(data) == list(CarPublicResponse.model_fields)
+        assert data["id"] == car.id
+        assert data["name"] == car.name
+        assert "registration_number" not in data
+
+    def test_get_car_requires_authentication(self, client, sample_cars):
+        """Test that the full detail endpoint requires authentication."""
+        response = client.get(f"/v1/cars/{sample_cars[0].id}")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_get_car(self, client, sample_cars, auth_token):
+        """Test getting all of a car's fields."""
+        car = sample_cars[0]
+        response = client.get(f"/v1/cars/{car.id}", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert list(data) == list(CarResponse.model_fields)
+        assert data["registration_number"] == "ABC-001"
+
+    def test_get_car_not_found(self, client, auth_token):
+        """Test getting a car that does not exist."""
+        assert client.get("/v1/cars/public/99999").status_code == status.HTTP_404_NOT_FOUND
+        response = client.get("/v1/cars/99999", headers={"Authorization": f"Bearer {auth_token}"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Car with id 99999 not found"
+
+    def test_detail_routes_do_not_capture_other_paths(self, client, sample_cars):
+        """Test that the listing routes under /v1/cars/public still resolve."""
+        assert client.get("/v1/cars/public").json()["total"] == 20
+        assert client.get("/v1/cars/public/facets").json()["total"] == 20
+
+    def test_repeated_views_served_from_cache(self, client, sample_cars, sql_statements):
+        """Test that a cached car is served without a query, and 304 with its ETag."""
+        car_id = sample_cars[0].id
+        sql_statements.clear()
+        first = client.get(f"/v1/cars/public/{car_id}")
+        second = client.get(f"/v1/cars/public/{car_id}")
+        not_modified = client.get(f"/v1/cars/public/{car_id}", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert len(car_queries(sql_statements)) == 1
+        assert second.content == first.content
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+
+    def test_update_evicts_cached_car(self, client, sample_cars, auth_token):
+        """Test that updating a car drops it from the cache and changes its ETag."""
+        car_id = sample_cars[0].id
+        before = client.get(f"/v1/cars/public/{car_id}")
+        assert car_id in caches.cars
+
+        client.put(f"/v1/cars/{car_id}", json={"name": "Renamed"}, headers={"Authorization": f"Bearer {auth_token}"})
+        assert car_id not in caches.cars
+
+        after = client.get(f"/v1/cars/public/{car_id}", headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == status.HTTP_200_OK
+        assert after.json()["name"] == "Renamed"
+
+    def test_other_writes_keep_cached_cars(self, client, sample_cars, auth_token):
+        """Test that writes to other cars leave a cached car in place."""
+        client.get(f"/v1/cars/public/{sample_cars[0].id}")
+        client.put(
+            f"/v1/cars/{sample_cars[1].id}", json={"name": "Renamed"}, headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert sample_cars[0].id in caches.cars
+
+    def test_get_car_sees_other_workers_writes(self, client, sample_cars, auth_token, db_session):
+        """Test that a cached car is not served after a write that did not evict it."""
+        car_id = sample_cars[0].id
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        before = client.get(f"/v1/cars/{car_id}", headers=headers)
+        assert car_id in caches.cars
+
+        # As another worker would: its commit does not reach this worker's cache
+        with Session(bind=db_session.get_bind()) as other:
+            other.execute(update(Car).where(Car.id == car_id).values(name="Renamed", version=Car.version + 1))
+            other.commit()
+        assert car_id in caches.cars
+
+        after = client.get(f"/v1/cars/{car_id}", headers=headers)
+        assert after.headers["ETag"] != before.headers["ETag"]
+        assert after.json()["name"] == "Renamed"
+        updated = client.put(
+            f"/v1/cars/{car_id}", json={"color": "Blue"}, headers={**headers, "If-Match": after.headers["ETag"]}
+        )
+        assert updated.status_code == status.HTTP_200_OK
+
+    def test_get_car_deleted_by_other_worker(self, client, sample_cars, auth_token, db_session):
+        """Test that a cached car deleted elsewhere is not found."""
+        car_id = sample_cars[0].id
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        client.get(f"/v1/cars/{car_id}", headers=headers)
+
+        with Session(bind=db_session.get_bind()) as other:
+            other.execute(Car.__table__.delete().where(Car.id == car_id))
+            other.commit()
+
+        assert client.get(f"/v1/cars/{car_id}", headers=headers).status_code == status.HTTP_404_NOT_FOUND
+        assert car_id not in caches.cars
+
+
+class TestCarsBatchEndpoint:
+    """Test suite for the GET /v1/cars/public/batch endpoint."""
+
+    def test_batch_in_requested_order(self, client, sample_cars):
+        """Test that cars come back in the requested order, with unknown ids listed as missing."""
+        ids = [sample_cars[5].id, 99999, sample_cars[0].id, sample_cars[5].id]
+        response = client.get(f"/v1/cars/public/batch?ids={','.join(map(str, ids))}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [car["id"] for car in data["items"]] == [sample_cars[5].id, sample_cars[0].id]
+        assert data["missing"] == [99999]
+        assert "ETag" in response.headers
+
+    def test_batch_single_query_for_misses(self, client, sample_cars, sql_statements):
+        """Test that uncached ids are resolved with one IN query and cached ids with none."""
+        ids = ",".join(str(car.id) for car in sample_cars)
+        sql_statements.clear()
+        client.get(f"/v1/cars/public/{sample_cars[0].id}")
+        client.get(f"/v1/cars/public/batch?ids={ids}")
+
+        queries = car_queries(sql_statements)
+        assert len(queries) == 2
+        assert "cars.id IN" in queries[1]
+
+        client.get(f"/v1/cars/public/batch?ids={ids}")
+        assert len(car_queries(sql_statements)) == 2
+
+    def test_batch_invalid_ids(self, client):
+        """Test that non-integer ids are rejected."""
+        response = client.get("/v1/cars/public/batch?ids=1,two")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_batch_too_many_ids(self, client, monkeypatch):
+        """Test that the number of ids is capped."""
+        monkeypatch.setattr(settings, "CAR_BATCH_MAX_IDS", 3)
+        response = client.get("/v1/cars/public/batch?ids=1,2,3,4")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
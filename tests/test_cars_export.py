@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from fastapi import status
+
+from components.cars.schemas import CarResponse
+from configs.settings import settings
+
+
+class TestCarsExportEndpoint:
+    """Test suite for the GET /v1/cars/export endpoint."""
+
+    def test_export_requires_authentication(self, client):
+        """Test that endpoint requires authentication."""
+        response = client.get("/v1/cars/export")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_export_ndjson(self, client, sample_cars, auth_token, monkeypatch):
+        """Test that every car is streamed as one JSON line, across several cursor batches."""
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 7)
+        response = client.get("/v1/cars/export", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="cars.ndjson"' in response.headers["content-disposition"]
+        cars = [json.loads(line) for line in response.text.splitlines()]
+        assert [car["id"] for car in cars] == sorted(car.id for car in sample_cars)
+        assert set(cars[0]) == set(CarResponse.model_fields)
+        CarResponse.model_validate(cars[0])
+
+    def test_export_csv(self, client, sample_cars, auth_token, monkeypatch):
+        """Test that the CSV export has a header row and one row per car."""
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 7)
+        response = client.get("/v1/cars/export?format=csv", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 20
+        assert list(rows[0]) == list(CarResponse.model_fields)
+        assert rows[0]["price"] == "21000.00"
+        assert rows[0]["display_image_url"] == ""
+
+    def test_export_csv_empty_database(self, client, auth_token):
+        """Test that an empty export still has its header row."""
+        response = client.get("/v1/cars/export?format=csv", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text.strip() == ",".join(CarResponse.model_fields)
+
+    def test_export_filters(self, client, sample_cars, auth_token):
+        """Test that the export takes the public listing's filters."""
+        response = client.get(
+            "/v1/cars/export?max_price=30000&wheel_drive=all wheel drive",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        cars = [json.loads(line) for line in response.text.splitlines()]
+        assert len(cars) == 5
+        assert all(car["wheel_drive"] == "AWD" and float(car["price"]) <= 30000 for car in cars)
+
+    def test_export_invalid_format(self, client, auth_token):
+        """Test that an unknown format is rejected."""
+        response = client.get("/v1/cars/export?format=xml", headers={"Authorization": f"Bearer {auth_token}"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,92 @@
+from fastapi import status
+
+from components.cars import caches
+
+
+class TestCarsFacetsEndpoint:
+    """Test suite for the GET /v1/cars/public/facets endpoint."""
+
+    def test_get_facets_empty_database(self, client):
+        """Test facets when database is empty."""
+        response = client.get("/v1/cars/public/facets")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 0
+        assert data["facets"] == {"brand": [], "fuel_type": [], "wheel_drive": [], "year": [], "price": []}
+
+    def test_get_facets_counts(self, client, sample_cars):
+        """Test that every facet counts all cars."""
+        response = client.get("/v1/cars/public/facets")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 20
+        facets = data["facets"]
+        assert facets["fuel_type"] == [{"value": "Gasoline", "count": 20}]
+        assert facets["wheel_drive"] == [{"value": "AWD", "count": 10}, {"value": "FWD", "count": 10}]
+        assert len(facets["brand"]) == 20
+        assert {facet["value"] for facet in facets["year"]} == set(range(2021, 2041))
+        # Prices run from 21000 to 40000
+        assert facets["price"] == [
+            {"value": "20000-30000", "count": 9},
+            {"value": "30000-50000", "count": 11},
+        ]
+        for values in facets.values():
+            assert sum(value["count"] for value in values) == 20
+
+    def test_get_facets_with_filters(self, client, sample_cars):
+        """Test that facets are counted within the public listing's filters."""
+        response = client.get("/v1/cars/public/facets?max_price=30000&wheel_drive=front wheel drive")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        listing = client.get("/v1/cars/public?max_price=30000&wheel_drive=FWD").json()
+        assert data["total"] == listing["total"] == 5
+        assert data["facets"]["wheel_drive"] == [{"value": "FWD", "count": 5}]
+
+    def test_get_facets_null_values(self, client, db_session, sample_cars):
+        """Test that cars without a price or wheel drive are counted under null."""
+        sample_cars[0].price = None
+        sample_cars[0].wheel_drive = None
+        db_session.commit()
+
+        facets = client.get("/v1/cars/public/facets").json()["facets"]
+        assert facets["price"][-1] == {"value": None, "count": 1}
+        assert facets["wheel_drive"][-1] == {"value": None, "count": 1}
+
+    def test_get_facets_single_statement(self, client, sample_cars, sql_statements):
+        """Test that all facets come from one aggregation query."""
+        caches.clear()
+        client.get("/v1/cars/public/facets")
+
+        queries = [sql for sql in sql_statements if "FROM cars" in sql and "cars_version" not in sql]
+        assert len(queries) == 1
+        assert "GROUP BY" in queries[0]
+
+    def test_get_facets_cached_until_write(self, client, sample_cars, auth_token):
+        """Test that facets are cached and invalidated by create and update."""
+        caches.clear()
+        first = client.get("/v1/cars/public/facets")
+        second = client.get("/v1/cars/public/facets")
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert client.get(
+            "/v1/cars/public/facets", headers={"If-None-Match": first.headers["ETag"]}
+        ).status_code == status.HTTP_304_NOT_MODIFIED
+
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        client.put(f"/v1/cars/{sample_cars[0].id}", json={"fuel_type": "Diesel"}, headers=headers)
+        updated = client.get("/v1/cars/public/facets")
+        assert updated.headers["X-Cache"] == "MISS"
+        assert {"value": "Diesel", "count": 1} in updated.json()["facets"]["fuel_type"]
+
+        client.post(
+            "/v1/cars",
+            json={"name": "Kia EV6", "brand": "Kia", "model": "EV6", "make": "Kia",
+                  "fuel_type": "Electric", "color": "Blue", "year": 2022},
+            headers=headers,
+        )
+        created = client.get("/v1/cars/public/facets")
+        assert created.headers["X-Cache"] == "MISS"
+        assert created.json()["total"] == 21
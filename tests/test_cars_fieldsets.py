@@ -0,0 +1,80 @@
+from fastapi import status
+
+from components.cars import caches
+from components.cars.fieldsets import fieldset_model, parse_fields
+from components.cars.schemas import CarPublicResponse
+
+MOBILE_FIELDS = "id,name,price,mileage,display_image_url"
+
+
+class TestSparseFieldsets:
+    """Test suite for the fields parameter of the car listings."""
+
+    def test_public_fields_limit_payload(self, client, sample_cars):
+        """Test that items only carry the requested fields."""
+        response = client.get(f"/v1/cars/public?fields={MOBILE_FIELDS}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 20
+        assert all(list(car) == MOBILE_FIELDS.split(",") for car in data["items"])
+
+    def test_public_fields_limit_select_list(self, client, sample_cars, sql_statements):
+        """Test that only the requested columns, the id and the sort key are selected."""
+        caches.clear()
+        client.get("/v1/cars/public?fields=name&order_by=price&include_total=false")
+
+        page = next(sql for sql in sql_statements if "FROM cars" in sql and "cars_version" not in sql)
+        selected = page.split("FROM")[0]
+        assert selected.replace("\n", "").strip() == "SELECT cars.name, cars.id, cars.price"
+
+    def test_public_fields_without_selected_sort_key(self, client, sample_cars):
+        """Test that cursors still work when the sort key is not a requested field."""
+        first = client.get("/v1/cars/public?fields=name&order_by=price_desc&limit=5").json()
+        assert list(first["items"][0]) == ["name"]
+
+        second = client.get(
+            f"/v1/cars/public?fields=name&order_by=price_desc&limit=5&cursor={first['next_cursor']}"
+        ).json()
+        full = client.get("/v1/cars/public?order_by=price_desc&limit=10").json()
+        assert [car["name"] for car in first["items"] + second["items"]] == [car["name"] for car in full["items"]]
+
+    def test_public_field_order_does_not_matter(self, client, sample_cars):
+        """Test that equivalent field sets share a cache entry and ETag."""
+        caches.clear()
+        first = client.get("/v1/cars/public?fields=price,id")
+        second = client.get("/v1/cars/public?fields=id, price")
+
+        assert second.headers["X-Cache"] == "HIT"
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert first.headers["ETag"] != client.get("/v1/cars/public").headers["ETag"]
+
+    def test_unknown_fields_rejected(self, client, auth_token):
+        """Test that fields outside the item model are rejected."""
+        response = client.get("/v1/cars/public?fields=id,registration_number")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "registration_number" in response.json()["detail"]
+
+        response = client.get("/v1/cars?fields=password", headers={"Authorization": f"Bearer {auth_token}"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_authenticated_list_fields(self, client, sample_cars, auth_token):
+        """Test that GET /v1/cars takes fields too, including private ones."""
+        response = client.get(
+            "/v1/cars?fields=registration_number,id&limit=3",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["items"][0] == {"id": sample_cars[0].id, "registration_number": "ABC-001"}
+
+    def test_fieldset_models_are_cached(self):
+        """Test that one model is created per field set and validates like the full model."""
+        fields = parse_fields("price,id", CarPublicResponse)
+        model = fieldset_model(CarPublicResponse, fields)
+
+        assert fields == ("id", "price")
+        assert model is fieldset_model(CarPublicResponse, ("id", "price"))
+        assert list(model.model_fields) == ["id", "price"]
+        assert model.model_validate({"id": 1, "price": "10.50"}).model_dump_json() == '{"id":1,"price":"10.50"}'
+        assert fieldset_model(CarPublicResponse, parse_fields(None, CarPublicResponse)) is CarPublicResponse
@@ -0,0 +1,113 @@
+from datetime import date
+
+import pytest
+from fastapi import status
+
+from components.cars import caches
+from components.cars.models import Car
+
+
+class TestCarsRangeFilters:
+    """Test suite for the filters shared by the public car endpoints."""
+
+    def test_price_range(self, client, sample_cars):
+        """Test filtering by min_price and max_price together."""
+        data = client.get("/v1/cars/public?min_price=25000&max_price=30000&limit=100").json()
+
+        assert data["total"] == 6
+        assert all(25000 <= float(car["price"]) <= 30000 for car in data["items"])
+
+    def test_mileage_range(self, client, sample_cars):
+        """Test filtering by min_mileage and max_mileage."""
+        data = client.get("/v1/cars/public?min_mileage=10000&max_mileage=20000&limit=100").json()
+
+        assert sorted(car["mileage"] for car in data["items"]) == [10000, 15000, 20000]
+
+    def test_year_range(self, client, sample_cars):
+        """Test filtering by year_from and year_to, bounds included."""
+        data = client.get("/v1/cars/public?year_from=2030&year_to=2032&limit=100").json()
+        assert data["total"] == 3
+
+    def test_registration_date_range(self, client, sample_cars):
+        """Test filtering by registration date on the parsed Date column."""
+        data = client.get("/v1/cars/public?registered_from=2020-03-01&registered_to=2020-05-31&limit=100").json()
+
+        assert sorted(car["registered_year"] for car in data["items"]) == [2023, 2024, 2025]
+
+    def test_multi_value_filters(self, client, sample_cars):
+        """Test IN filters given repeated or comma-separated, and normalized."""
+        repeated = client.get("/v1/cars/public?brand=Brand 1&brand=Brand 2&limit=100").json()
+        comma_separated = client.get("/v1/cars/public?brand=brand 2,brand 1&limit=100").json()
+
+        assert repeated["total"] == comma_separated["total"] == 2
+        assert {car["brand"] for car in repeated["items"]} == {"Brand 1", "Brand 2"}
+        assert client.get("/v1/cars/public?fuel_type=Diesel,Electric").json()["total"] == 0
+
+    @pytest.mark.parametrize("query", [
+        "min_price=30000&max_price=20000",
+        "min_mileage=10&max_mileage=5",
+        "year_from=2025&year_to=2020",
+        "registered_from=2021-01-01&registered_to=2020-01-01",
+    ])
+    def test_inverted_range(self, client, query):
+        """Test that a range with its bounds swapped is rejected."""
+        response = client.get(f"/v1/cars/public?{query}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_registration_date(self, client):
+        """Test that registration date bounds must be dates."""
+        response = client.get("/v1/cars/public?registered_from=15.03.2023")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_filters_compile_to_same_statement(self, client, sample_cars, sql_statements):
+        """Test that parameter order does not change the SQL statement."""
+        caches.clear()
+        client.get("/v1/cars/public?brand=Brand 2,Brand 1&min_price=1&year_from=2020&include_total=false")
+        # Equivalent queries share a cache entry
+        cached = client.get("/v1/cars/public?year_from=2020&min_price=1.0&brand=Brand 1&brand=Brand 2&include_total=false")
+        assert cached.headers["X-Cache"] == "HIT"
+        caches.clear()
+        client.get("/v1/cars/public?year_from=2020&min_price=1&brand=Brand 1&brand=Brand 2&include_total=false")
+
+        pages = [sql for sql in sql_statements if "FROM cars" in sql and "cars_version" not in sql]
+        assert len(pages) == 2
+        assert pages[0] == pages[1]
+        assert "cars.brand IN" in pages[0]
+        assert pages[0].index("cars.brand") < pages[0].index("cars.year") < pages[0].index("cars.price >=")
+
+    def test_facets_and_export_take_the_same_filters(self, client, sample_cars, auth_token):
+        """Test that facets and export accept the new filters."""
+        facets = client.get("/v1/cars/public/facets?min_price=35000&brand=brand 17,Brand 18").json()
+        assert facets["total"] == 2
+
+        export = client.get(
+            "/v1/cars/export?min_price=35000", headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert len(export.text.splitlines()) == 6
+
+
+class TestRegisteredOn:
+    """Test suite for the parsed registration date column."""
+
+    def test_registered_on_follows_registered_date(self, client, db_session, sample_cars, auth_token):
+        """Test that ORM writes keep registered_on in sync with registered_date."""
+        car = sample_cars[0]
+        assert car.registered_on == date(2020, 1, 15)
+
+        client.put(
+            f"/v1/cars/{car.id}",
+            json={"registered_date": "03.04.2022"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        db_session.expire_all()
+        assert db_session.get(Car, car.id).registered_on == date(2022, 4, 3)
+
+    def test_unparseable_registered_date(self, db_session):
+        """Test that a free-form date that cannot be parsed leaves registered_on empty."""
+        car = Car(name="N", brand="B", model="M", make="M", fuel_type="Petrol", color="Red", year=2020,
+                  registered_date="early 2020")
+        db_session.add(car)
+        db_session.commit()
+
+        assert car.registered_date == "early 2020"
+        assert car.registered_on is None
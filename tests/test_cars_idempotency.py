@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+
+from configs.settings import settings
+from components.cars.models import Car
+from components.idempotency import keys
+from components.idempotency.models import IdempotencyKey
+from components.users.models import User
+from utils.auth import create_access_token, get_password_hash
+
+CAR = {
+    "name": "Imported", "brand": "volvo", "model": "XC40", "make": "Volvo",
+    "fuel_type": "el", "color": "Blue", "year": 2022, "registration_number": "IMP-0001",
+}
+
+
+@pytest.fixture
+def headers(auth_token):
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
+def car_count(db_session) -> int:
+    return db_session.scalar(select(func.count()).select_from(Car))
+
+
+class TestCarsCreateIdempotency:
+    """Test suite for Idempotency-Key on the POST /v1/cars endpoint."""
+
+    def test_retry_replays_response(self, client, headers, db_session):
+        """Test that a retry with the same key gets the first response and creates nothing."""
+        first = client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+        retry = client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.content == first.content
+        assert retry.headers["etag"] == first.headers["etag"]
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+        assert car_count(db_session) == 1
+
+    def test_replay_skips_validation_and_insert(self, client, headers, sql_statements, monkeypatch):
+        """Test that a replay neither validates the body again nor writes."""
+        client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+        sql_statements.clear()
+        # Validation would now reject the car
+        monkeypatch.setattr("components.cars.schemas.normalize_field", lambda field, value: 1 / 0)
+
+        response = client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not [sql for sql in sql_statements if sql.startswith(("INSERT", "UPDATE", "DELETE"))]
+
+    def test_key_reused_for_other_request(self, client, headers, db_session):
+        """Test that a key cannot be reused with a different body."""
+        client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+
+        response = client.post(
+            "/v1/cars", json={**CAR, "registration_number": "IMP-0002"}, headers={**headers, "Idempotency-Key": "import-1"}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert car_count(db_session) == 1
+
+    def test_keys_belong_to_users(self, client, headers, db_session):
+        """Test that another user's identical key does not replay the first user's response."""
+        other = User(email="other@example.com", name="Other", password=get_password_hash("secret"), is_active=True)
+        db_session.add(other)
+        db_session.commit()
+        other_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': other.email})}"}
+
+        client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+        response = client.post(
+            "/v1/cars", json={**CAR, "registration_number": "IMP-0002"}, headers={**other_headers, "Idempotency-Key": "import-1"}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert "idempotent-replayed" not in response.headers
+        assert car_count(db_session) == 2
+
+    def test_expired_key_runs_again(self, client, headers, db_session, monkeypatch):
+        """Test that a key is forgotten after IDEMPOTENCY_KEY_TTL_SECONDS."""
+        monkeypatch.setattr(settings, "IDEMPOTENCY_KEY_TTL_SECONDS", 0)
+        car = {**CAR, "registration_number": None}
+
+        first = client.post("/v1/cars", json=car, headers={**headers, "Idempotency-Key": "import-1"})
+        second = client.post("/v1/cars", json=car, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert first.json()["id"] != second.json()["id"]
+        assert car_count(db_session) == 2
+        assert db_session.scalar(select(func.count()).select_from(IdempotencyKey)) == 1
+
+    def test_concurrent_retry_replays_winner(self, client, headers, db_session, monkeypatch):
+        """Test that a retry racing the first request is rolled back and gets its response."""
+        first = client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+        lookup = keys._lookup
+        calls = []
+
+        def lookup_too_early(db, pending):
+            # As if the retry had looked the key up before the first request committed
+            calls.append(pending.key)
+            return None if len(calls) == 1 else lookup(db, pending)
+
+        monkeypatch.setattr(keys, "_lookup", lookup_too_early)
+
+        retry = client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert len(calls) == 2
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.content == first.content
+        assert car_count(db_session) == 1
+
+    def test_without_key_nothing_is_recorded(self, client, headers, db_session):
+        """Test that requests without a key are not recorded."""
+        client.post("/v1/cars", json=CAR, headers=headers)
+
+        assert db_session.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+    def test_async_mode_replays(self, async_client, headers, db_session):
+        """Test that the async create endpoint replays as well."""
+        first = async_client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+        retry = async_client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert retry.content == first.content
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert car_count(db_session) == 1
+
+    def test_async_mode_uses_endpoint_session(self, async_client, headers, sql_statements):
+        """Test that async endpoints look keys up on their AsyncSession, not on a sync one."""
+        async_client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+        async_client.post("/v1/cars", json=CAR, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert not [sql for sql in sql_statements if "idempotency_keys" in sql]
+
+    def test_async_mode_expired_key_runs_again(self, async_client, headers, db_session, monkeypatch):
+        """Test that an expired, unpurged key is replaced in async mode, and purged afterwards."""
+        monkeypatch.setattr(settings, "IDEMPOTENCY_KEY_TTL_SECONDS", 0)
+        monkeypatch.setattr(settings, "IDEMPOTENCY_PURGE_SECONDS", 3600)
+        monkeypatch.setattr(keys, "_next_purge", float("inf"))
+        car = {**CAR, "registration_number": None}
+
+        first = async_client.post("/v1/cars", json=car, headers={**headers, "Idempotency-Key": "import-1"})
+        monkeypatch.setattr(keys, "_next_purge", 0.0)
+        second = async_client.post("/v1/cars", json=car, headers={**headers, "Idempotency-Key": "import-1"})
+
+        assert second.status_code == status.HTTP_201_CREATED
+        assert first.json()["id"] != second.json()["id"]
+        assert car_count(db_session) == 2
+        # Purged in the background after the second response
+        assert db_session.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+
+class TestPurgeExpiredKeys:
+    """Test suite for the batched deletion of expired idempotency keys."""
+
+    def test_deletes_expired_in_batches(self, db_session, sql_statements, monkeypatch):
+        """Test that expired keys are deleted IDEMPOTENCY_PURGE_BATCH_SIZE at a time, keeping live ones."""
+        monkeypatch.setattr(settings, "IDEMPOTENCY_PURGE_BATCH_SIZE", 2)
+        now = datetime.now(timezone.utc)
+        for i in range(6):
+            expires_at = now + timedelta(hours=1 if i == 5 else -1)
+            db_session.add(IdempotencyKey(
+                user_id=1, key=f"key-{i}", fingerprint="0" * 64, status_code=201, headers={}, body=b"{}",
+                expires_at=expires_at,
+            ))
+        db_session.commit()
+        sql_statements.clear()
+
+        assert keys.purge_expired(db_session.get_bind()) == 5
+
+        assert len([sql for sql in sql_statements if sql.startswith("DELETE FROM idempotency_keys")]) == 3
+        assert db_session.scalars(select(IdempotencyKey.key)).all() == ["key-5"]
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select, text
+
+from components.cars.filters import CarFilters
+from components.cars.models import Car
+from components.cars.pagination import SORT_ORDERS, get_sort_order
+
+
+def explain(db_session, query) -> str:
+    """Return SQLite's query plan for an ORM query as a single string."""
+    sql = str(query.statement.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True}))
+    rows = db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestCarsIndexes:
+    """Test that the public listing's access paths are served by indexes."""
+
+    @pytest.mark.parametrize("order_by", list(SORT_ORDERS))
+    def test_order_by_uses_index(self, db_session, sample_cars, order_by):
+        """Test that every supported order_by reads rows in index order."""
+        query = db_session.query(Car).order_by(*get_sort_order(order_by).order_by()).limit(11)
+        plan = explain(db_session, query)
+
+        assert "USING INDEX ix_cars_" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_default_order_uses_primary_key(self, db_session, sample_cars):
+        """Test that the default id ordering walks the table in primary key order."""
+        query = db_session.query(Car).order_by(*get_sort_order(None).order_by()).limit(11)
+        plan = explain(db_session, query)
+
+        assert plan == "SCAN cars"
+
+    @pytest.mark.parametrize("order_by", ["price", "price_desc"])
+    def test_year_filter_with_price_order_uses_index(self, db_session, sample_cars, order_by):
+        """Test that the year filter and price ordering share one index."""
+        query = (
+            db_session.query(Car)
+            .filter(Car.year == 2021)
+            .order_by(*get_sort_order(order_by).order_by())
+            .limit(11)
+        )
+        plan = explain(db_session, query)
+
+        assert "ix_cars_year_price_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_max_price_count_uses_covering_index(self, db_session, sample_cars):
+        """Test that counting by a price bound never touches the table."""
+        query = db_session.query(Car.id).filter(Car.price <= 30000)
+        plan = explain(db_session, query)
+
+        assert "USING COVERING INDEX" in plan
+
+    @pytest.mark.parametrize("column, filters", [
+        ("mileage", CarFilters(min_mileage=1000, max_mileage=20000)),
+        ("registered_on", CarFilters(registered_from=date(2020, 1, 1), registered_to=date(2020, 6, 30))),
+    ])
+    def test_range_filters_use_index(self, db_session, sample_cars, column, filters):
+        """Test that range filters are answered by an index range scan."""
+        query = db_session.query(Car.id).filter(filters.apply(select(Car.id)).whereclause)
+        plan = explain(db_session, query)
+
+        assert f"USING COVERING INDEX ix_cars_{column} ({column}>? AND {column}<?)" in plan
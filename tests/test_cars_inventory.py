@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+
+from components.cars import inventory
+from components.cars.models import Car, CarsVersion
+
+
+def make_car() -> Car:
+    return Car(name="Car", brand="Volvo", model="XC40", make="Volvo", fuel_type="Electric",
+               color="Blue", year=2022, price=Decimal(30000), source="test")
+
+
+class TestInventoryVersion:
+    """Test suite for the shared cars_version counter row."""
+
+    def test_created_with_the_table(self, db_session):
+        """Test that create_all seeds the counter row, as the migration does."""
+        assert db_session.scalars(select(CarsVersion.version)).all() == [1]
+
+    def test_write_bumps_counter(self, db_session):
+        """Test that a committed car write updates the existing row."""
+        db_session.add(make_car())
+        db_session.commit()
+
+        assert db_session.scalars(select(CarsVersion.version)).all() == [2]
+        assert db_session.scalar(select(Car.inventory_version)) == 2
+
+    def test_missing_row_is_inserted(self, db_session):
+        """Test that the first write inserts the row if it is missing."""
+        db_session.execute(delete(CarsVersion))
+        db_session.commit()
+
+        db_session.add(make_car())
+        db_session.commit()
+
+        assert db_session.scalars(select(CarsVersion.version)).all() == [1]
+        assert db_session.scalar(select(Car.inventory_version)) == 1
+
+    def test_insert_races_another_first_writer(self, db_session):
+        """Test that inserting a row another writer inserted meanwhile bumps it instead of failing."""
+        assert inventory._insert_counter(db_session) == 2
+        assert db_session.scalar(select(func.count()).select_from(CarsVersion)) == 1
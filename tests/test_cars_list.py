@@ -213,3 +213,15 @@ class TestCarsListEndpoint:
         assert len(all_ids) == len(set(all_ids))  # All unique
         assert len(all_ids) == 20  # All cars covered
 
+    def test_get_cars_cursor_pagination(self, client, sample_cars, auth_token):
+        """Test paging through all cars with next_cursor."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        page1 = client.get("/v1/cars?limit=15", headers=headers).json()
+        page2 = client.get(f"/v1/cars?limit=15&cursor={page1['next_cursor']}", headers=headers).json()
+
+        assert len(page1["items"]) == 15
+        assert len(page2["items"]) == 5
+        assert page2["next_cursor"] is None
+        ids = [car["id"] for car in page1["items"] + page2["items"]]
+        assert ids == sorted(set(ids))
+        assert len(ids) == 20
@@ -1,5 +1,8 @@
 import pytest
 from fastapi import status
+from sqlalchemy import text
+
+from configs.settings import settings
 
 
 class TestCarsListPublicEndpoint:
@@ -127,3 +130,239 @@ class TestCarsListPublicEndpoint:
         # Verify prices are sorted
         prices = [float(car["price"]) for car in data["items"]]
         assert prices == sorted(prices)
+
+    def _walk_cursor(self, client, url):
+        """Follow next_cursor from the first page to the last one."""
+        pages = [client.get(url).json()]
+        while pages[-1]["next_cursor"]:
+            pages.append(client.get(f"{url}&cursor={pages[-1]['next_cursor']}").json())
+        return pages
+
+    def test_get_cars_public_cursor_pagination(self, client, sample_cars):
+        """Test walking every page with the cursor returned by the previous one."""
+        pages = self._walk_cursor(client, "/v1/cars/public?limit=6")
+
+        assert [len(page["items"]) for page in pages] == [6, 6, 6, 2]
+        ids = [car["id"] for page in pages for car in page["items"]]
+        assert ids == sorted(car.id for car in sample_cars)
+        assert all(page["total"] == 20 for page in pages)
+        assert pages[-1]["next_cursor"] is None
+
+    def test_get_cars_public_cursor_matches_offset(self, client, sample_cars):
+        """Test that cursor pages match offset pages for the same ordering."""
+        first = client.get("/v1/cars/public?order_by=price_desc&limit=5").json()
+        by_cursor = client.get(
+            f"/v1/cars/public?order_by=price_desc&limit=5&cursor={first['next_cursor']}"
+        ).json()
+        by_offset = client.get("/v1/cars/public?order_by=price_desc&limit=5&offset=5").json()
+
+        assert [car["id"] for car in by_cursor["items"]] == [car["id"] for car in by_offset["items"]]
+
+    def test_get_cars_public_cursor_with_null_sort_keys(self, client, db_session, sample_cars):
+        """Test that cars without a price are paged after priced ones."""
+        for car in sample_cars[:3]:
+            car.price = None
+        db_session.commit()
+
+        for order_by in ("price", "price_desc"):
+            pages = self._walk_cursor(client, f"/v1/cars/public?order_by={order_by}&limit=4")
+            items = [car for page in pages for car in page["items"]]
+
+            assert len(items) == 20
+            assert len({car["id"] for car in items}) == 20
+            prices = [float(car["price"]) for car in items[:17]]
+            assert prices == sorted(prices, reverse=order_by == "price_desc")
+            assert all(car["price"] is None for car in items[17:])
+
+    def test_get_cars_public_cursor_for_other_order_by(self, client, sample_cars):
+        """Test that a cursor cannot be reused with a different order_by."""
+        first = client.get("/v1/cars/public?order_by=price&limit=5").json()
+        response = client.get(
+            f"/v1/cars/public?order_by=registered_year&cursor={first['next_cursor']}"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_cars_public_invalid_cursor(self, client, sample_cars):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/v1/cars/public?cursor=not-a-cursor")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_cars_public_without_total(self, client, sample_cars):
+        """Test that include_total=false skips the total."""
+        response = client.get("/v1/cars/public?include_total=false&limit=5")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        assert data["total_type"] is None
+        assert len(data["items"]) == 5
+
+    def test_get_cars_public_total_is_exact(self, client, sample_cars):
+        """Test that totals are reported as exact counts on SQLite."""
+        data = client.get("/v1/cars/public?wheel_drive=FWD").json()
+
+        assert data["total"] == 10
+        assert data["total_type"] == "exact"
+
+    def test_get_cars_public_total_cached_until_write(self, client, db_session, sample_cars, auth_token):
+        """Test that cached totals are invalidated by creating a car."""
+        assert client.get("/v1/cars/public?year=2021").json()["total"] == 1
+
+        # Raw SQL bypasses the ORM, so the cached total is still served
+        db_session.execute(text("DELETE FROM cars WHERE year = 2021"))
+        db_session.commit()
+        assert client.get("/v1/cars/public?year=2021").json()["total"] == 1
+
+        response = client.post(
+            "/v1/cars",
+            json={
+                "name": "New Car",
+                "brand": "Brand",
+                "model": "Model",
+                "make": "Make",
+                "fuel_type": "Petrol",
+                "color": "Red",
+                "year": 2022,
+            },
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert client.get("/v1/cars/public?year=2021").json()["total"] == 0
+        assert client.get("/v1/cars/public?year=2022").json()["total"] == 2
+
+    def test_get_cars_public_window_count_saves_round_trip(
+        self, client, sample_cars, sql_statements, monkeypatch
+    ):
+        """Test that the window count strategy fetches page and total in one statement."""
+        from components.cars import caches
+        from configs.settings import settings
+
+        monkeypatch.setattr(settings, "LIST_COUNT_STRATEGY", "query")
+        separate = client.get("/v1/cars/public?order_by=price&limit=5&offset=5").json()
+        separate_statements = list(sql_statements)
+
+        caches.clear()
+        sql_statements.clear()
+        monkeypatch.setattr(settings, "LIST_COUNT_STRATEGY", "window")
+        windowed = client.get("/v1/cars/public?order_by=price&limit=5&offset=5").json()
+        windowed_statements = list(sql_statements)
+
+        # Each also reads the inventory version that backs ETags and the cache
+        assert len(separate_statements) == 3
+        assert len(windowed_statements) == 2
+        car_queries = [sql for sql in windowed_statements if "FROM cars" in sql and "cars_version" not in sql]
+        assert len(car_queries) == 1
+        assert "count(*) OVER ()" in car_queries[0]
+        assert windowed["total_type"] == "exact"
+        assert windowed["items"] == separate["items"]
+        assert windowed["total"] == separate["total"] == 20
+        assert windowed["next_cursor"] == separate["next_cursor"]
+
+    def test_get_cars_public_window_count_past_last_page(self, client, sample_cars, monkeypatch):
+        """Test that the window count strategy still reports a total past the last page."""
+        from configs.settings import settings
+
+        monkeypatch.setattr(settings, "LIST_COUNT_STRATEGY", "window")
+        data = client.get("/v1/cars/public?year=2025&offset=50").json()
+
+        assert data["items"] == []
+        assert data["total"] == 1
+
+    @pytest.mark.parametrize("wheel_drive", ["FWD", "fwd", "front wheel drive"])
+    def test_get_cars_public_filter_wheel_drive(self, client, sample_cars, wheel_drive):
+        """Test that any spelling of a wheel drive type matches its canonical value."""
+        data = client.get(f"/v1/cars/public?wheel_drive={wheel_drive}&limit=100").json()
+
+        assert data["total"] == 10
+        assert all(car["wheel_drive"] == "FWD" for car in data["items"])
+
+    def test_get_cars_public_filter_wheel_drive_is_exact(self, client, sample_cars):
+        """Test that the wheel drive filter no longer matches substrings."""
+        data = client.get("/v1/cars/public?wheel_drive=WD").json()
+
+        assert data["total"] == 0
+
+    def test_get_cars_public_response_cache(self, client, sample_cars, auth_token):
+        """Test that repeated queries are served from the cache until a car is written."""
+        url = "/v1/cars/public?order_by=price&limit=5"
+        first = client.get(url)
+        second = client.get(url)
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+        response = client.put(
+            f"/v1/cars/{sample_cars[0].id}",
+            json={"price": 1000},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        third = client.get(url)
+        assert third.headers["X-Cache"] == "MISS"
+        assert third.json()["items"][0]["price"] == "1000.00"
+
+    def test_get_cars_public_cache_key_is_normalized(self, client, sample_cars):
+        """Test that equivalent queries share a cache entry."""
+        client.get("/v1/cars/public?wheel_drive=AWD&order_by=unknown")
+        response = client.get("/v1/cars/public?wheel_drive=all%20wheel%20drive")
+
+        assert response.headers["X-Cache"] == "HIT"
+
+    def test_get_cars_public_etag_not_modified(self, client, sample_cars, sql_statements):
+        """Test that a matching If-None-Match is answered with 304 without loading cars."""
+        first = client.get("/v1/cars/public?limit=5")
+        etag = first.headers["ETag"]
+
+        sql_statements.clear()
+        response = client.get("/v1/cars/public?limit=5", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert "stale-while-revalidate" in response.headers["Cache-Control"]
+        assert response.content == b""
+        # Only the inventory version was read
+        assert sql_statements and all("FROM cars_version" in sql for sql in sql_statements)
+
+    def test_get_cars_public_etag_depends_on_query(self, client, sample_cars):
+        """Test that different queries get different ETags."""
+        first = client.get("/v1/cars/public?limit=5")
+        second = client.get("/v1/cars/public?limit=6")
+
+        assert first.headers["ETag"] != second.headers["ETag"]
+        response = client.get("/v1/cars/public?limit=6", headers={"If-None-Match": first.headers["ETag"]})
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("strategy", ["query", "window"])
+    def test_get_cars_public_total_follows_other_workers_writes(self, client, sample_cars, db_session, monkeypatch, strategy):
+        """Test that a write by another worker, seen only through the shared version, updates the total too."""
+        monkeypatch.setattr(settings, "LIST_COUNT_STRATEGY", strategy)
+        year = sample_cars[0].year
+        first = client.get(f"/v1/cars/public?year={year}").json()
+        assert first["total"] == len(first["items"]) == 1
+
+        # Another worker deletes the car: this worker's process-local version stays put
+        db_session.execute(text("DELETE FROM cars WHERE id = :id"), {"id": sample_cars[0].id})
+        db_session.execute(text("UPDATE cars_version SET version = version + 1"))
+        db_session.commit()
+        response = client.get(f"/v1/cars/public?year={year}")
+
+        assert response.json()["items"] == []
+        assert response.json()["total"] == 0
+
+    def test_get_cars_public_etag_changes_after_write(self, client, sample_cars, auth_token):
+        """Test that writing a car changes the ETag of every query."""
+        etag = client.get("/v1/cars/public?limit=5").headers["ETag"]
+
+        client.put(
+            f"/v1/cars/{sample_cars[-1].id}",
+            json={"color": "Black"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        response = client.get("/v1/cars/public?limit=5", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
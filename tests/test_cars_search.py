@@ -0,0 +1,108 @@
+import pytest
+from fastapi import status
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from components.cars.models import Car
+from components.cars.search import apply_search, search_terms
+from configs.settings import settings
+
+
+@pytest.fixture
+def searchable_cars(db_session):
+    """Create cars with distinctive names and variants."""
+    cars = [
+        Car(name="Tesla Model 3", brand="Tesla", model="Model 3", make="Tesla", fuel_type="Electric",
+            color="White", year=2022, price=40000, variant="Long Range AWD, heat pump"),
+        Car(name="Tesla Model Y", brand="Tesla", model="Model Y", make="Tesla", fuel_type="Electric",
+            color="Black", year=2023, price=45000, variant="Performance"),
+        Car(name="Volvo XC40", brand="Volvo", model="XC40", make="Volvo", fuel_type="Electric",
+            color="Gray", year=2021, price=35000, variant="Recharge Twin, long range battery, Tesla-level range"),
+        Car(name="Toyota Corolla", brand="Toyota", model="Corolla", make="Toyota", fuel_type="Hybrid",
+            color="Red", year=2020, price=22000, variant="Hybrid Kombi Active"),
+    ]
+    db_session.add_all(cars)
+    db_session.commit()
+    return cars
+
+
+class TestCarsSearch:
+    """Test suite for the q parameter of GET /v1/cars/public."""
+
+    def test_search_terms(self):
+        """Test that queries are reduced to lower-cased words."""
+        assert search_terms('  Tesla "Model 3" OR (awd)* ') == ["tesla", "model", "3", "or", "awd"]
+        assert search_terms("!!!") == []
+
+    def test_search_by_name(self, client, searchable_cars):
+        """Test matching words in the name."""
+        response = client.get("/v1/cars/public?q=model y")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["name"] == "Tesla Model Y"
+
+    def test_search_by_variant_prefix(self, client, searchable_cars):
+        """Test matching word prefixes in the variant, ignoring case and punctuation."""
+        response = client.get("/v1/cars/public?q=RECHARG")
+
+        data = response.json()
+        assert [car["name"] for car in data["items"]] == ["Volvo XC40"]
+
+    def test_search_requires_every_word(self, client, searchable_cars):
+        """Test that every word must match."""
+        data = client.get("/v1/cars/public?q=tesla corolla").json()
+        assert data["total"] == 0
+        assert data["items"] == []
+
+    def test_search_ranks_best_matches_first(self, client, searchable_cars):
+        """Test that results are ordered by relevance without an order_by."""
+        data = client.get("/v1/cars/public?q=long range").json()
+
+        assert data["total"] == 2
+        # "range" appears twice in the Volvo's variant
+        assert [car["name"] for car in data["items"]] == ["Volvo XC40", "Tesla Model 3"]
+
+    def test_search_with_order_by_and_filters(self, client, searchable_cars):
+        """Test that search combines with filters and explicit ordering."""
+        data = client.get("/v1/cars/public?q=tesla&order_by=price_desc&max_price=44000").json()
+        assert [car["name"] for car in data["items"]] == ["Tesla Model 3", "Volvo XC40"]
+
+    def test_search_cursor_pagination(self, client, searchable_cars):
+        """Test walking ranked results with cursors."""
+        first = client.get("/v1/cars/public?q=tesla&limit=2").json()
+        assert first["next_cursor"] is not None
+        second = client.get(f"/v1/cars/public?q=tesla&limit=2&cursor={first['next_cursor']}").json()
+        assert second["next_cursor"] is None
+
+        all_results = client.get("/v1/cars/public?q=tesla&limit=10").json()["items"]
+        assert first["items"] + second["items"] == all_results
+        assert len(all_results) == 3
+
+    def test_search_follows_updates(self, client, db_session, searchable_cars, auth_token):
+        """Test that the text index follows updates of name and variant."""
+        client.put(
+            f"/v1/cars/{searchable_cars[3].id}",
+            json={"variant": "Hybrid GR Sport"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert client.get("/v1/cars/public?q=kombi").json()["total"] == 0
+        assert client.get("/v1/cars/public?q=sport").json()["items"][0]["name"] == "Toyota Corolla"
+
+    def test_search_ignores_empty_query(self, client, searchable_cars):
+        """Test that a query without words does not filter."""
+        assert client.get("/v1/cars/public?q=***").json()["total"] == 4
+
+    @pytest.mark.parametrize("trigram", [False, True])
+    def test_postgresql_search_uses_text_index(self, monkeypatch, trigram):
+        """Test that PostgreSQL matches the indexed tsvector column."""
+        monkeypatch.setattr(settings, "SEARCH_TRIGRAM", trigram)
+        stmt, sort = apply_search(select(Car.id), ["tes", "mod"], "postgresql")
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "cars.search_vector @@ to_tsquery('simple'::regconfig" in sql
+        assert "ts_rank(cars.search_vector" in sql
+        assert ("similarity(cars.name" in sql) == trigram
+        assert sort.descending
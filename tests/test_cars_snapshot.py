@@ -0,0 +1,245 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+from sqlalchemy import text
+
+from configs.settings import settings
+from components.cars import caches, snapshot
+from components.cars.filters import CarFilters
+from components.cars.models import Car
+
+
+@pytest.fixture
+def engines(client, monkeypatch):
+    """Query GET /v1/cars/public through either engine, without the response cache."""
+    monkeypatch.setattr(caches.public_lists, "maxsize", 0)
+
+    def get(engine: str, params: dict) -> dict:
+        monkeypatch.setattr(settings, "PUBLIC_LIST_ENGINE", engine)
+        response = client.get("/v1/cars/public", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    return get
+
+
+@pytest.fixture
+def varied_cars(db_session):
+    """Cars with ties and missing prices, years, mileage, wheel drive and registration dates."""
+    cars = [
+        Car(
+            name=f"Car {i}",
+            brand=["Volvo", "Tesla", "BMW"][i % 3],
+            model=f"Model {i}",
+            make="Make",
+            fuel_type=["Electric", "Petrol"][i % 2],
+            color="Red",
+            year=2015 + i % 6,
+            price=Decimal(20000 + (i % 7) * 1500) + Decimal("0.50") if i % 5 else None,
+            registered_year=2015 + i % 4 if i % 6 else None,
+            registered_date=f"20{15 + i % 6}-0{1 + i % 9}-1{i % 10}" if i % 4 else None,
+            mileage=(i % 8) * 10000 if i % 9 else None,
+            wheel_drive=["FWD", "AWD", None][i % 3],
+            source="test",
+        )
+        for i in range(1, 41)
+    ]
+    db_session.add_all(cars)
+    db_session.commit()
+    return cars
+
+
+QUERIES = [
+    {},
+    {"brand": "Volvo,Tesla"},
+    {"brand": "Unknown"},
+    {"fuel_type": "Electric", "wheel_drive": "AWD"},
+    {"year": 2017},
+    {"year_from": 2016, "year_to": 2018},
+    {"min_price": 21500.5, "max_price": 26000},
+    {"min_mileage": 20000, "max_mileage": 50000},
+    {"registered_from": "2016-03-01", "registered_to": "2019-12-31"},
+]
+ORDERS = [None, "price", "price_desc", "registered_year", "registered_year_desc"]
+
+
+class TestSnapshotEngine:
+    """Test suite for answering GET /v1/cars/public from the in-memory snapshot."""
+
+    @pytest.mark.parametrize("order_by", ORDERS)
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_database(self, engines, varied_cars, query, order_by):
+        """Test that filters, orders (nulls last) and offsets give the database's pages and totals."""
+        for offset in (0, 7, 35):
+            params = {**query, "limit": 6, "offset": offset}
+            if order_by:
+                params["order_by"] = order_by
+            assert engines("memory", params) == engines("database", params)
+        assert len(snapshot.cars.columns) == len(varied_cars)
+
+    @pytest.mark.parametrize("order_by", ORDERS)
+    def test_cursor_walk_matches_database(self, engines, varied_cars, order_by):
+        """Test that walking every page by cursor visits the same cars, across engines."""
+        params = {"limit": 7, "include_total": "false"}
+        if order_by:
+            params["order_by"] = order_by
+
+        pages = 0
+        cursor = None
+        while True:
+            page = engines("memory", {**params, "cursor": cursor} if cursor else params)
+            assert page == engines("database", {**params, "cursor": cursor} if cursor else params)
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert pages == 6
+
+    def test_field_selection(self, engines, varied_cars):
+        """Test that sparse fieldsets are applied to snapshot records."""
+        params = {"fields": "id,price,mileage", "order_by": "price"}
+        data = engines("memory", params)
+
+        assert set(data["items"][0]) == {"id", "price", "mileage"}
+        assert data == engines("database", params)
+
+    def test_search_uses_database(self, engines, varied_cars):
+        """Test that full-text search never loads the snapshot."""
+        engines("memory", {"q": "car"})
+
+        assert snapshot.cars.columns is None
+
+
+class TestSnapshotRefresh:
+    """Test suite for keeping the snapshot current with car writes."""
+
+    def test_own_writes_are_patched_in(self, engines, client, auth_token, varied_cars, db_session):
+        """Test that created and updated cars are patched into the snapshot without a reload."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        engines("memory", {})
+        reloads = snapshot.cars.reloads
+
+        response = client.post("/v1/cars", headers=headers, json={
+            "name": "Cheapest", "brand": "Kia", "model": "EV6", "make": "Kia",
+            "fuel_type": "Electric", "color": "White", "year": 2024, "price": 100,
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        car_id = response.json()["id"]
+        client.put(f"/v1/cars/{varied_cars[0].id}", headers=headers, json={"mileage": 1})
+
+        params = {"order_by": "price", "brand": "Kia,Volvo", "limit": 3}
+        data = engines("memory", params)
+        assert data["items"][0]["id"] == car_id
+        assert data == engines("database", params)
+        assert engines("memory", {"max_mileage": 1}) == engines("database", {"max_mileage": 1})
+        assert snapshot.cars.reloads == reloads
+        assert snapshot.cars.version == data_version(db_session)
+
+    def test_foreign_writes_are_caught_up(self, engines, varied_cars, db_session):
+        """Test that cars written by another worker are found by their inventory version."""
+        engines("memory", {})
+        reloads = snapshot.cars.reloads
+
+        # What another worker's write looks like from here: a car and the shared version, stamped together
+        foreign_write(db_session, varied_cars[5].id)
+
+        data = engines("memory", {"order_by": "price", "limit": 1})
+        assert data["items"][0]["id"] == varied_cars[5].id
+        assert data == engines("database", {"order_by": "price", "limit": 1})
+        assert snapshot.cars.reloads == reloads
+        assert snapshot.cars.version == data_version(db_session)
+
+    def test_reconcile_reloads(self, engines, varied_cars, db_session, monkeypatch):
+        """Test that the periodic reload picks up writes that bypassed the inventory version."""
+        engines("memory", {})
+        db_session.execute(text("UPDATE cars SET price = 1 WHERE id = :id"), {"id": varied_cars[5].id})
+        db_session.commit()
+
+        assert engines("memory", {"order_by": "price", "limit": 1})["items"][0]["id"] != varied_cars[5].id
+        monkeypatch.setattr(settings, "SNAPSHOT_RECONCILE_SECONDS", 0)
+        assert engines("memory", {"order_by": "price", "limit": 1})["items"][0]["id"] == varied_cars[5].id
+
+
+class TestSnapshotFile:
+    """Test suite for the memory-mapped snapshot file."""
+
+    @pytest.fixture
+    def snapshot_file(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "cars.snapshot")
+        monkeypatch.setattr(settings, "SNAPSHOT_FILE", path)
+        return path
+
+    def test_round_trip(self, varied_cars, db_session, snapshot_file):
+        """Test that a mapped file answers like the snapshot it was written from, nulls and all."""
+        varied_cars[0].name = "Škoda Enyaq – “iV”"
+        varied_cars[0].display_image_url = None
+        db_session.commit()
+
+        version, count = snapshot.write_file(db_session, snapshot_file)
+        columns, file_version = snapshot.Columns.open(snapshot_file)
+        loaded = snapshot.Columns.from_rows(db_session.execute(snapshot._select()).all())
+
+        assert (file_version, count) == (version, len(varied_cars))
+        assert columns.records(columns.order("price")) == loaded.records(loaded.order("price"))
+        filters = CarFilters(brand=("Volvo",), min_price=Decimal(21000))
+        assert columns.query(filters, "registered_year_desc", 5, offset=2) == loaded.query(filters, "registered_year_desc", 5, offset=2)
+
+    def test_worker_starts_from_file(self, engines, client, auth_token, varied_cars, db_session, snapshot_file):
+        """Test that a worker maps the file, catches up on later writes, and keeps the mapping."""
+        snapshot.write_file(db_session, snapshot_file)
+        foreign_write(db_session, varied_cars[5].id)
+        response = client.put(f"/v1/cars/{varied_cars[6].id}", json={"price": 2},
+                              headers={"Authorization": f"Bearer {auth_token}"})
+        assert response.status_code == status.HTTP_200_OK
+
+        # A new worker: nothing in memory, nothing pending
+        snapshot.cars.clear()
+        assert snapshot.cars.open_file(snapshot_file)
+        mapped = snapshot.cars.columns.heap.base
+
+        params = {"order_by": "price", "limit": 3}
+        data = engines("memory", params)
+        assert [item["id"] for item in data["items"][:2]] == [varied_cars[5].id, varied_cars[6].id]
+        assert data == engines("database", params)
+        assert snapshot.cars.columns.heap.base is mapped
+
+    def test_reload_maps_file(self, engines, varied_cars, db_session, snapshot_file, monkeypatch):
+        """Test that reloads map the newest file instead of reading every car."""
+        engines("memory", {})
+        snapshot.write_file(db_session, snapshot_file)
+        monkeypatch.setattr(settings, "SNAPSHOT_RECONCILE_SECONDS", 0)
+
+        assert engines("memory", {"limit": 5}) == engines("database", {"limit": 5})
+        assert isinstance(snapshot.cars.columns.heap.base, memoryview)
+
+    def test_missing_file(self, engines, varied_cars, snapshot_file):
+        """Test that without the file the snapshot is loaded from the database."""
+        assert not snapshot.cars.open_file(snapshot_file)
+        assert engines("memory", {"limit": 5}) == engines("database", {"limit": 5})
+
+
+class TestInventoryVersionStamp:
+    """Test suite for stamping written cars with the inventory version."""
+
+    def test_written_cars_are_stamped(self, varied_cars, db_session):
+        """Test that created and updated cars carry the version of their last write."""
+        created = data_version(db_session)
+        varied_cars[3].mileage = 5
+        db_session.commit()
+
+        assert varied_cars[3].inventory_version == data_version(db_session) == created + 1
+        assert varied_cars[4].inventory_version == created
+
+
+def foreign_write(db_session, car_id: int) -> None:
+    db_session.execute(text("UPDATE cars_version SET version = version + 1"))
+    db_session.execute(
+        text("UPDATE cars SET price = 1, inventory_version = (SELECT version FROM cars_version) WHERE id = :id"),
+        {"id": car_id},
+    )
+    db_session.commit()
+
+
+def data_version(db_session) -> int:
+    return db_session.execute(text("SELECT version FROM cars_version")).scalar()
@@ -1,4 +1,10 @@
+import pytest
 from fastapi import status
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from components.cars import inventory
+from components.cars.models import Car
 
 
 class TestCarsUpdateEndpoint:
@@ -355,3 +361,155 @@ class TestCarsUpdateEndpoint:
         data = response.json()
         assert data["name"] == test_car.name
 
+    def test_update_car_normalizes_categoricals(self, client, auth_token, test_car):
+        """Test that updated categorical fields are stored under their canonical spelling."""
+        response = client.put(
+            f"/v1/cars/{test_car.id}",
+            json={"wheel_drive": "fyrhjulsdrift", "fuel_type": "PHEV", "brand": "vw"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["wheel_drive"] == "4WD"
+        assert data["fuel_type"] == "Plug-in Hybrid"
+        assert data["brand"] == "Volkswagen"
+
+    def test_update_car_single_statement(self, client, auth_token, test_car, sql_statements):
+        """Test that an update is one UPDATE ... RETURNING, without loading or refreshing the car."""
+        response = client.put(
+            f"/v1/cars/{test_car.id}",
+            json={"price": 19999, "registered_date": "2021-03-04"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert float(response.json()["price"]) == 19999
+        updates = [sql for sql in sql_statements if sql.startswith("UPDATE cars SET") and "RETURNING" in sql]
+        assert len(updates) == 1
+        assert not [sql for sql in sql_statements if sql.startswith("SELECT") and "FROM cars " in sql]
+
+    def test_update_car_sets_registered_on(self, client, auth_token, test_car, db_session):
+        """Test that registered_on follows registered_date, as on ORM writes."""
+        client.put(
+            f"/v1/cars/{test_car.id}",
+            json={"registered_date": "2021-03-04"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        db_session.expire_all()
+        assert db_session.get(Car, test_car.id).registered_on.isoformat() == "2021-03-04"
+
+    def test_update_car_stamps_inventory(self, client, auth_token, test_car, db_session):
+        """Test that a changing update bumps the inventory version."""
+        before = inventory.read_version(db_session)
+
+        client.put(
+            f"/v1/cars/{test_car.id}",
+            json={"color": "Green"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        db_session.expire_all()
+        assert inventory.read_version(db_session) == before + 1
+        assert db_session.get(Car, test_car.id).inventory_version == before + 1
+
+    def test_update_car_unchanged_skips_write(self, client, auth_token, test_car, db_session, sql_statements):
+        """Test that submitting the stored values writes nothing and keeps the inventory version."""
+        before = inventory.read_version(db_session)
+
+        response = client.put(
+            f"/v1/cars/{test_car.id}",
+            json={"name": test_car.name, "color": test_car.color, "mileage": None},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == test_car.name
+        assert inventory.read_version(db_session) == before
+        assert not [sql for sql in sql_statements if sql.startswith("UPDATE cars_version")]
+
+    def test_update_car_to_null(self, client, auth_token, test_car):
+        """Test that setting a field to null is a change, not a no-op."""
+        response = client.put(
+            f"/v1/cars/{test_car.id}",
+            json={"source": None},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.json()["source"] is None
+
+
+class TestCarsUpdateIfMatch:
+    """Test suite for optimistic concurrency control on PUT /v1/cars/{car_id}."""
+
+    @pytest.fixture
+    def headers(self, auth_token):
+        return {"Authorization": f"Bearer {auth_token}"}
+
+    def test_responses_carry_version_etag(self, client, headers, test_car):
+        """Test that updates bump the version, which is the response's ETag."""
+        version = test_car.version
+
+        response = client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers=headers)
+
+        assert response.json()["version"] == version + 1
+        assert response.headers["etag"] == f'"{version + 1}"'
+
+    def test_matching_if_match_updates(self, client, headers, test_car):
+        """Test that the ETag of a GET can be sent back as If-Match."""
+        etag = client.get(f"/v1/cars/{test_car.id}", headers=headers).headers["etag"]
+
+        response = client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers={**headers, "If-Match": etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["color"] == "Green"
+
+    def test_stale_if_match_is_rejected(self, client, headers, test_car, db_session):
+        """Test that a write based on an outdated read fails with 412 instead of overwriting."""
+        etag = client.get(f"/v1/cars/{test_car.id}", headers=headers).headers["etag"]
+        client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers={**headers, "If-Match": etag})
+
+        response = client.put(f"/v1/cars/{test_car.id}", json={"color": "Black"}, headers={**headers, "If-Match": etag})
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        db_session.expire_all()
+        assert db_session.get(Car, test_car.id).color == "Green"
+
+    def test_stale_if_match_without_changes_is_rejected(self, client, headers, test_car):
+        """Test that an outdated If-Match fails even when the submitted fields are already stored."""
+        etag = f'"{test_car.version}"'
+        client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers=headers)
+
+        response = client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers={**headers, "If-Match": etag})
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    @pytest.mark.parametrize("if_match", ["*", '"999", *'])
+    def test_wildcard_matches_any_version(self, client, headers, test_car, if_match):
+        """Test that If-Match: * only requires the car to exist."""
+        response = client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers={**headers, "If-Match": if_match})
+
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("if_match", ['W/"1"', "1", '"abc"'])
+    def test_weak_or_foreign_etag_never_matches(self, client, headers, test_car, if_match):
+        """Test that If-Match uses strong comparison against version ETags."""
+        response = client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers={**headers, "If-Match": if_match})
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    def test_if_match_on_missing_car(self, client, headers):
+        """Test that an unknown car is still 404 with If-Match."""
+        response = client.put("/v1/cars/99999", json={"color": "Green"}, headers={**headers, "If-Match": '"1"'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_orm_writes_check_version(self, client, headers, test_car, db_session):
+        """Test that ORM flushes of a car changed since it was loaded fail instead of overwriting."""
+        with Session(bind=db_session.get_bind()) as other:
+            car = other.get(Car, test_car.id)
+            client.put(f"/v1/cars/{test_car.id}", json={"color": "Green"}, headers=headers)
+
+            car.color = "Black"
+            with pytest.raises(StaleDataError):
+                other.commit()
@@ -0,0 +1,183 @@
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+
+from configs.settings import settings
+from components.cars import inventory
+from components.cars.models import Car
+
+
+def new_car(i: int, **values) -> dict:
+    return {
+        "name": f"Imported {i}", "brand": "volvo", "model": "XC40", "make": "Volvo",
+        "fuel_type": "el", "color": "Blue", "year": 2022, "price": 30000 + i,
+        "registered_date": "2022-05-01", "registration_number": f"IMP-{i:04d}", **values,
+    }
+
+
+@pytest.fixture
+def headers(auth_token):
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
+class TestCarUpsertEndpoint:
+    """Test suite for the PUT /v1/cars/by-registration/{registration_number} endpoint."""
+
+    def test_creates_missing_car(self, client, headers, db_session):
+        """Test that an unknown registration number creates the car."""
+        response = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1), headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["registration_number"] == "IMP-0001"
+        assert (data["brand"], data["fuel_type"]) == ("Volvo", "Electric")
+        car = db_session.get(Car, data["id"])
+        assert car.registered_on.isoformat() == "2022-05-01"
+
+    def test_updates_existing_car(self, client, headers, db_session):
+        """Test that a known registration number replaces that car's fields in place."""
+        created = client.post("/v1/cars", json=new_car(1), headers=headers).json()
+
+        response = client.put(
+            "/v1/cars/by-registration/IMP-0001",
+            json=new_car(1, price=25000, registered_date="2023-01-15", mileage=1200),
+            headers=headers,
+        )
+
+        data = response.json()
+        assert data["id"] == created["id"]
+        assert (float(data["price"]), data["mileage"]) == (25000, 1200)
+        assert db_session.scalar(select(func.count()).select_from(Car)) == 1
+        assert db_session.get(Car, created["id"]).registered_on.isoformat() == "2023-01-15"
+
+    def test_bumps_version(self, client, headers):
+        """Test that updating upserts bump the car's version, which is the response's ETag."""
+        created = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1), headers=headers)
+        updated = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1, price=1000), headers=headers)
+
+        assert (created.json()["version"], updated.json()["version"]) == (1, 2)
+        assert updated.headers["etag"] == '"2"'
+
+    def test_path_overrides_body(self, client, headers, db_session):
+        """Test that the registration number in the path is the one saved."""
+        data = client.put("/v1/cars/by-registration/ABC-123", json=new_car(1), headers=headers).json()
+
+        assert data["registration_number"] == "ABC-123"
+
+    def test_one_statement(self, client, headers, sql_statements):
+        """Test that the car is saved by a single INSERT ... ON CONFLICT, without a lookup."""
+        client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1), headers=headers)
+
+        inserts = [sql for sql in sql_statements if sql.startswith("INSERT INTO cars ")]
+        assert len(inserts) == 1
+        assert "ON CONFLICT (registration_number) DO UPDATE" in inserts[0]
+        assert not [sql for sql in sql_statements if sql.startswith("SELECT") and "FROM cars " in sql]
+
+    def test_stamps_inventory(self, client, headers, db_session):
+        """Test that upserts bump the inventory version, so listings are refreshed."""
+        before = inventory.read_version(db_session)
+
+        data = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1), headers=headers).json()
+
+        assert inventory.read_version(db_session) == before + 1
+        assert db_session.get(Car, data["id"]).inventory_version == before + 1
+        assert client.get("/v1/cars/public").json()["total"] == 1
+
+    def test_unchanged_car_skips_write(self, client, headers, db_session, sql_statements):
+        """Test that re-saving a car as it is leaves the row and the inventory version alone."""
+        saved = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1), headers=headers).json()
+        before = inventory.read_version(db_session)
+        sql_statements.clear()
+
+        response = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1), headers=headers)
+
+        assert response.json() == saved
+        assert inventory.read_version(db_session) == before
+        assert not [sql for sql in sql_statements if sql.startswith("UPDATE cars_version")]
+
+    def test_requires_authentication(self, client):
+        """Test that upserts require authentication."""
+        response = client.put("/v1/cars/by-registration/IMP-0001", json=new_car(1))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestCarsBulkUpsertEndpoint:
+    """Test suite for the PUT /v1/cars/by-registration endpoint."""
+
+    def test_creates_and_updates(self, client, headers, db_session):
+        """Test that new cars are created and known ones updated, in one response."""
+        existing = client.post("/v1/cars", json=new_car(1), headers=headers).json()
+
+        response = client.put(
+            "/v1/cars/by-registration",
+            json={"items": [new_car(0), new_car(1, price=1000), new_car(2)]},
+            headers=headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["saved"] == 3 and data["failed"] == 0
+        assert data["items"][1]["id"] == existing["id"]
+        assert float(db_session.get(Car, existing["id"]).price) == 1000
+        assert db_session.scalar(select(func.count()).select_from(Car)) == 3
+
+    def test_last_duplicate_wins(self, client, headers, db_session):
+        """Test that a registration number given twice saves the later car, for both items."""
+        items = [new_car(1, price=1000), new_car(2), new_car(1, price=2000)]
+
+        data = client.put("/v1/cars/by-registration", json={"items": items}, headers=headers).json()
+
+        assert data["saved"] == 3
+        assert data["items"][0]["id"] == data["items"][2]["id"]
+        assert [item["index"] for item in data["items"]] == [0, 1, 2]
+        assert float(db_session.get(Car, data["items"][0]["id"]).price) == 2000
+
+    def test_unchanged_cars_keep_their_ids(self, client, headers, db_session):
+        """Test that unchanged cars are reported with their ids but not written."""
+        first = client.put("/v1/cars/by-registration", json={"items": [new_car(0), new_car(1)]}, headers=headers).json()
+        before = inventory.read_version(db_session)
+
+        data = client.put(
+            "/v1/cars/by-registration", json={"items": [new_car(0), new_car(1, price=1000)]}, headers=headers
+        ).json()
+
+        assert data["saved"] == 2
+        assert [item["id"] for item in data["items"]] == [item["id"] for item in first["items"]]
+        assert inventory.read_version(db_session) == before + 1
+        stamped = db_session.scalars(select(Car.inventory_version).order_by(Car.id)).all()
+        assert stamped == [before, before + 1]
+
+    def test_registration_number_required(self, client, headers, db_session):
+        """Test that cars without a registration number fail their item only."""
+        items = [new_car(0), new_car(1, registration_number=None)]
+
+        data = client.put("/v1/cars/by-registration", json={"items": items}, headers=headers).json()
+
+        assert data["saved"] == 1 and data["failed"] == 1
+        assert data["items"][1] == {"index": 1, "id": None, "error": "registration_number is required"}
+
+    def test_one_statement_per_chunk(self, client, headers, sql_statements, monkeypatch):
+        """Test that each chunk is saved by one executemany and committed on its own."""
+        monkeypatch.setattr(settings, "CAR_BULK_CHUNK_SIZE", 20)
+
+        client.put("/v1/cars/by-registration", json={"items": [new_car(i) for i in range(50)]}, headers=headers)
+
+        upserts = [sql for sql in sql_statements if sql.startswith("INSERT INTO cars ")]
+        assert len(upserts) == 3
+        assert all("ON CONFLICT (registration_number) DO UPDATE" in sql for sql in upserts)
+        assert not [sql for sql in sql_statements if sql.startswith("SELECT") and "FROM cars " in sql]
+
+    def test_too_many_items(self, client, headers, monkeypatch):
+        """Test that batches over CAR_BULK_MAX_ITEMS are rejected."""
+        monkeypatch.setattr(settings, "CAR_BULK_MAX_ITEMS", 2)
+
+        response = client.put("/v1/cars/by-registration", json={"items": [new_car(i) for i in range(3)]}, headers=headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, client):
+        """Test that bulk upserts require authentication."""
+        response = client.put("/v1/cars/by-registration", json={"items": [new_car(0)]})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,23 @@
+from fastapi import status
+
+
+class TestMetricsEndpoint:
+    """Test suite for the GET /v1/metrics endpoint."""
+
+    def test_get_metrics_requires_authentication(self, client):
+        """Test that endpoint requires authentication."""
+        response = client.get("/v1/metrics")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_get_metrics_cache_counters(self, client, sample_cars, auth_token):
+        """Test that cache hits and misses are reported."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        before = client.get("/v1/metrics", headers=headers).json()["caches"]["public_lists"]
+
+        client.get("/v1/cars/public?limit=3")
+        client.get("/v1/cars/public?limit=3")
+
+        after = client.get("/v1/metrics", headers=headers).json()["caches"]["public_lists"]
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+        assert after["maxsize"] > 0
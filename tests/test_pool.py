@@ -0,0 +1,108 @@
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, exc, text
+
+from configs import pool
+from configs.settings import settings
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    """A pool of one connection and no overflow, giving up after 50 ms."""
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DATABASE_POOL_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "DATABASE_POOL_PRE_PING", True)
+
+
+@pytest.fixture
+def instrumented_engine(tmp_path, pool_settings):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **pool.pool_options(url))
+    stats = pool.instrument(engine, "test")
+    yield engine, stats
+    engine.dispose()
+    pool._stats.pop("test")
+
+
+class TestPoolOptions:
+    """Test suite for the engine arguments built from the pool settings."""
+
+    def test_settings_are_applied(self, pool_settings):
+        """Test that a database server gets a sized, timed pool."""
+        options = pool.pool_options("postgresql://localhost/cars")
+        assert options["poolclass"] is pool.TimedQueuePool
+        assert options["pool_size"] == 1
+        assert options["max_overflow"] == 0
+        assert options["pool_timeout"] == 0.05
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == settings.DATABASE_POOL_RECYCLE_SECONDS
+
+    def test_async_pool(self):
+        """Test that async engines get the asyncio flavour of the timed pool."""
+        options = pool.pool_options("postgresql://localhost/cars", is_async=True)
+        assert options["poolclass"] is pool.TimedAsyncAdaptedQueuePool
+
+    def test_in_memory_sqlite_keeps_its_pool(self):
+        """Test that in-memory SQLite is not given pool sizes its pool cannot take."""
+        options = pool.pool_options("sqlite://")
+        assert "pool_size" not in options and "poolclass" not in options
+        create_engine("sqlite://", **options).dispose()
+
+
+class TestPoolStats:
+    """Test suite for the pool statistics collected through pool events."""
+
+    def test_checkouts_and_connects(self, instrumented_engine):
+        """Test that checkouts are counted and the connection is reused."""
+        engine, stats = instrumented_engine
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        snapshot = stats.snapshot()
+        assert snapshot["pool"] == "TimedQueuePool"
+        assert snapshot["checkouts"] == 3
+        assert snapshot["connects"] == 1
+        assert snapshot["size"] == 1
+        assert snapshot["checked_out"] == 0
+        assert snapshot["timeouts"] == 0
+
+    def test_exhausted_pool(self, instrumented_engine):
+        """Test that a checkout timing out on an exhausted pool is reported with its wait."""
+        engine, stats = instrumented_engine
+        with engine.connect():
+            assert stats.snapshot()["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        snapshot = stats.snapshot()
+        assert snapshot["timeouts"] == 1
+        assert snapshot["waits"] == 1
+        assert snapshot["wait_ms_max"] >= 50
+
+    def test_invalidations(self, instrumented_engine):
+        """Test that invalidated connections are counted, also after dispose() replaced the pool."""
+        engine, stats = instrumented_engine
+        with engine.connect() as connection:
+            connection.invalidate()
+        engine.dispose()
+        with engine.connect() as connection:
+            connection.invalidate()
+
+        snapshot = stats.snapshot()
+        assert snapshot["invalidations"] == 2
+        assert snapshot["checkouts"] == 2
+        assert engine.pool.stats is stats
+
+
+class TestPoolMetrics:
+    """Test suite for the pool statistics of GET /v1/metrics."""
+
+    def test_metrics_report_pools(self, client, auth_token):
+        """Test that the application's pool is reported by name."""
+        response = client.get("/v1/metrics", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        primary = response.json()["pools"]["primary"]
+        assert {"checked_out", "overflow", "checkouts", "wait_ms_total", "timeouts", "invalidations"} <= set(primary)
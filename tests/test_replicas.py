@@ -0,0 +1,204 @@
+import time
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from configs import database
+from configs.database import Base, get_db
+from configs.replicas import READ_PRIMARY_COOKIE, ReadYourWritesMiddleware, ReplicaSet, RoutingSession, read_primary_cookie
+from configs.settings import settings
+from components.cars import caches, inventory
+from components.cars.endpoints.create import router as cars_create_router
+from components.cars.endpoints.list import router as cars_list_router
+from components.cars.endpoints.list_public import router as cars_list_public_router
+from components.cars.models import Car
+from components.users.models import User
+from utils.auth import create_access_token, get_password_hash
+
+
+def make_car(i: int) -> Car:
+    return Car(name=f"Car {i}", brand="Volvo", model="XC40", make="Volvo", fuel_type="Electric",
+               color="Blue", year=2022, price=Decimal(30000 + i), source="test")
+
+
+def sqlite_engine(path):
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """
+    A primary and a replica in two SQLite files. The replica lags: it has the
+    user and the first car, the primary also has the two cars written since.
+    """
+    primary, replica = sqlite_engine(tmp_path / "primary.db"), sqlite_engine(tmp_path / "replica.db")
+    for engine in (primary, replica):
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(User(email="test@example.com", name="Test User",
+                        password=get_password_hash("testpassword123"), is_active=True))
+            db.add(make_car(1))
+            db.commit()
+    with sessionmaker(bind=primary)() as db:
+        db.add_all([make_car(2), make_car(3)])
+        db.commit()
+
+    inventory.bump_version()
+    caches.clear()
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def replicated_client(engines, monkeypatch):
+    """A client of an app whose read-only endpoints read from the replica."""
+    primary, replica = engines
+    PrimarySession = sessionmaker(autoflush=False, bind=primary)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(
+        class_=RoutingSession, autoflush=False, bind=primary, info={"replicas": ReplicaSet([replica])}
+    ))
+
+    def override_get_db():
+        with PrimarySession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cars_list_router)
+    app.include_router(cars_list_public_router)
+    app.include_router(cars_create_router)
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers():
+    token = create_access_token(data={"sub": "test@example.com"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+NEW_CAR = {"name": "New Car", "brand": "Kia", "model": "EV6", "make": "Kia",
+           "fuel_type": "Electric", "color": "White", "year": 2024}
+
+
+class TestReadRouting:
+    """Test suite for the routing of read-only endpoints to replicas."""
+
+    def test_public_list_reads_replica(self, replicated_client):
+        """Test that anonymous listings are served by the replica."""
+        response = replicated_client.get("/v1/cars/public")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 1
+
+    def test_current_user_is_looked_up_on_replica(self, engines, replicated_client, auth_headers):
+        """Test that the authenticated listing resolves the user and reads the cars on the replica."""
+        primary, _ = engines
+        with sessionmaker(bind=primary)() as db:
+            db.query(User).delete()
+            db.commit()
+
+        response = replicated_client.get("/v1/cars", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 1
+
+    def test_writes_go_to_primary(self, engines, replicated_client, auth_headers):
+        """Test that a created car is stored on the primary only."""
+        primary, replica = engines
+        response = replicated_client.post("/v1/cars", json=NEW_CAR, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        with primary.connect() as connection:
+            assert connection.scalar(select(func.count()).select_from(Car)) == 4
+        with replica.connect() as connection:
+            assert connection.scalar(select(func.count()).select_from(Car)) == 1
+
+
+class TestReadYourWrites:
+    """Test suite for the read-your-writes window after a write."""
+
+    def test_reads_after_write_go_to_primary(self, replicated_client, auth_headers):
+        """Test that the writing client sees its write, while other clients read the replica."""
+        assert replicated_client.get("/v1/cars/public").json()["total"] == 1
+
+        response = replicated_client.post("/v1/cars", json=NEW_CAR, headers=auth_headers)
+        assert READ_PRIMARY_COOKIE in response.cookies
+
+        assert replicated_client.get("/v1/cars/public").json()["total"] == 4
+        replicated_client.cookies.clear()
+        assert replicated_client.get("/v1/cars/public").json()["total"] == 1
+
+    def test_window_expires(self, replicated_client, auth_headers, monkeypatch):
+        """Test that reads return to the replica once the window has passed."""
+        monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+        replicated_client.post("/v1/cars", json=NEW_CAR, headers=auth_headers)
+
+        assert replicated_client.get("/v1/cars/public").json()["total"] == 1
+
+    def test_failed_write_opens_no_window(self, replicated_client, auth_headers):
+        """Test that a rejected write sets no cookie."""
+        response = replicated_client.post("/v1/cars", json={"name": "Incomplete"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert READ_PRIMARY_COOKIE not in response.cookies
+
+    @pytest.mark.parametrize("forge", [
+        lambda now: f"{now + 10 ** 9:.3f}",  # unsigned
+        lambda now: f"{now + 10 ** 9:.3f}:" + "0" * 64,  # badly signed
+        lambda now: read_primary_cookie(now + 3600),  # signed, but beyond READ_YOUR_WRITES_SECONDS
+    ])
+    def test_forged_cookie_reads_replica(self, replicated_client, forge):
+        """Test that clients cannot pin their reads to the primary with a cookie of their own."""
+        replicated_client.cookies.set(READ_PRIMARY_COOKIE, forge(time.time()))
+
+        assert replicated_client.get("/v1/cars/public").json()["total"] == 1
+
+    def test_reads_set_no_cookie(self, replicated_client):
+        """Test that reads do not open a window."""
+        assert READ_PRIMARY_COOKIE not in replicated_client.get("/v1/cars/public").cookies
+
+
+class TestReplicaSet:
+    """Test suite for round-robin and health-based replica selection."""
+
+    def test_round_robin(self, tmp_path):
+        """Test that healthy replicas are picked in turn."""
+        first, second = sqlite_engine(tmp_path / "a.db"), sqlite_engine(tmp_path / "b.db")
+        replicas = ReplicaSet([first, second])
+
+        assert [replicas.choose() for _ in range(4)] == [first, second, first, second]
+
+    def test_unreachable_replica_is_skipped(self, tmp_path):
+        """Test that a replica failing its health check is skipped until retried."""
+        broken = sqlite_engine(tmp_path / "missing" / "replica.db")
+        healthy = sqlite_engine(tmp_path / "replica.db")
+        replicas = ReplicaSet([broken, healthy])
+
+        assert [replicas.choose() for _ in range(3)] == [healthy, healthy, healthy]
+        assert not replicas.is_healthy(broken)
+
+    def test_no_healthy_replica_reads_primary(self, engines, tmp_path):
+        """Test that sessions fall back to the primary when every replica is down."""
+        primary, _ = engines
+        replicas = ReplicaSet([sqlite_engine(tmp_path / "missing" / "replica.db")])
+
+        with RoutingSession(bind=primary, info={"replicas": replicas}) as db:
+            assert db.scalar(select(func.count()).select_from(Car)) == 3
+            assert db.get_bind() is primary
+
+    def test_session_stays_on_primary_after_writing(self, engines):
+        """Test that a routing session reads its own writes."""
+        primary, replica = engines
+        with RoutingSession(bind=primary, info={"replicas": ReplicaSet([replica])}) as db:
+            assert db.scalar(select(func.count()).select_from(Car)) == 1
+            db.add(make_car(4))
+            db.flush()
+            assert db.scalar(select(func.count()).select_from(Car)) == 4
+            db.rollback()
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from components.cars.schemas import CarResponse, PaginatedPublicResponse, PaginatedResponse
+from utils import responses
+
+
+class TestFastJSONResponses:
+    """Test suite for the validation-free car responses."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_matches_pydantic(self, monkeypatch, use_orjson):
+        """Test that dumps renders the same bytes as model_dump_json, with or without orjson."""
+        if not use_orjson:
+            monkeypatch.setattr(responses, "orjson", None)
+        elif responses.orjson is None:
+            pytest.skip("orjson is not installed")
+
+        page = {
+            "items": [{
+                "id": 1, "name": "Škoda Octavia", "brand": "Skoda", "model": "Octavia", "make": "Skoda",
+                "fuel_type": "Petrol", "color": "Gray", "year": 2020, "price": Decimal("25000.50"),
+                "registered_date": None, "registered_year": 2020, "mileage": None, "wheel_drive": "FWD",
+                "registration_number": None, "variant": None, "source": None, "external_link": None,
+                "display_image_url": None, "version": 1,
+            }],
+            "total": 1,
+            "total_type": "exact",
+            "limit": 10,
+            "offset": 0,
+            "next_cursor": None,
+        }
+        assert responses.dumps(page) == PaginatedResponse(**page).model_dump_json().encode()
+
+    def test_list_responses_validate_against_models(self, client, sample_cars, auth_token):
+        """Test that trusted list responses are exactly what the response models would produce."""
+        response = client.get("/v1/cars?limit=5", headers={"Authorization": f"Bearer {auth_token}"})
+        assert response.content == PaginatedResponse.model_validate_json(response.content).model_dump_json().encode()
+
+        response = client.get("/v1/cars/public?limit=5&order_by=price")
+        assert response.content == PaginatedPublicResponse.model_validate_json(response.content).model_dump_json().encode()
+
+    def test_create_response_validates_against_model(self, client, auth_token):
+        """Test that the trusted create response is exactly what CarResponse would produce."""
+        response = client.post(
+            "/v1/cars",
+            json={"name": "Volvo XC40", "brand": "Volvo", "model": "XC40", "make": "Volvo",
+                  "fuel_type": "Electric", "color": "White", "year": 2023, "price": "41000.00"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.content == CarResponse.model_validate_json(response.content).model_dump_json().encode()
+
+    @pytest.mark.parametrize("path, method, model", [
+        ("/v1/cars", "get", "PaginatedResponse"),
+        ("/v1/cars/public", "get", "PaginatedPublicResponse"),
+        ("/v1/cars", "post", "CarResponse"),
+        ("/v1/cars/{car_id}", "put", "CarResponse"),
+    ])
+    def test_openapi_schema_keeps_response_models(self, app, path, method, model):
+        """Test that the documented responses are still the pydantic response models."""
+        operation = app.openapi()["paths"][path][method]
+        success = next(code for code in operation["responses"] if code.startswith("2"))
+        schema = operation["responses"][success]["content"]["application/json"]["schema"]
+        assert schema == {"$ref": f"#/components/schemas/{model}"}
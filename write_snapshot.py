@@ -0,0 +1,39 @@
+"""
+Write the car snapshot file that workers memory-map at startup when
+PUBLIC_LIST_ENGINE=memory and SNAPSHOT_FILE are set.
+
+Run it before rolling out or scaling up, and periodically (e.g. from cron, at
+about SNAPSHOT_RECONCILE_SECONDS): workers catch up on the cars written since
+the file's version, and map the newest file each time they reload.
+
+    python write_snapshot.py [path]
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from configs.database import SessionLocal
+from configs.settings import settings
+from components.cars import snapshot
+
+
+def main():
+    """Write the snapshot to the given path, or SNAPSHOT_FILE."""
+    path = sys.argv[1] if len(sys.argv) > 1 else settings.SNAPSHOT_FILE
+    if not path:
+        sys.exit("Usage: python write_snapshot.py PATH (or set SNAPSHOT_FILE)")
+    if snapshot.np is None:
+        sys.exit("The car snapshot requires numpy")
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        version, count = snapshot.write_file(db, path)
+    print(f"✓ Wrote {count} cars at inventory version {version} to {path} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()